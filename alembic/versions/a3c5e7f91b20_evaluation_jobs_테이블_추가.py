@@ -0,0 +1,46 @@
+"""evaluation_jobs 테이블 추가
+
+Revision ID: a3c5e7f91b20
+Revises: 9e2a0d8b014e
+Create Date: 2026-10-18 10:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e7f91b20'
+down_revision: Union[str, Sequence[str], None] = '9e2a0d8b014e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """비동기 채점 작업 큐 테이블 생성."""
+    op.create_table('evaluation_jobs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('thread_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('run_after', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('thread_id'),
+        schema='taskfit'
+    )
+    op.create_index(
+        'ix_evaluation_jobs_status_run_after', 'evaluation_jobs', ['status', 'run_after'], schema='taskfit'
+    )
+
+
+def downgrade() -> None:
+    """evaluation_jobs 테이블 삭제."""
+    op.drop_index('ix_evaluation_jobs_status_run_after', table_name='evaluation_jobs', schema='taskfit')
+    op.drop_table('evaluation_jobs', schema='taskfit')
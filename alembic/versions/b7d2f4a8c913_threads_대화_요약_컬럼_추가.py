@@ -0,0 +1,34 @@
+"""threads 대화 요약 컬럼 추가
+
+Revision ID: b7d2f4a8c913
+Revises: a3c5e7f91b20
+Create Date: 2026-10-18 11:03:15.402871
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2f4a8c913'
+down_revision: Union[str, Sequence[str], None] = 'a3c5e7f91b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """누적 대화 요약 컬럼 추가."""
+    op.add_column('threads', sa.Column('history_summary', sa.Text(), nullable=True), schema='taskfit')
+    op.add_column(
+        'threads',
+        sa.Column('summarized_until', sa.Integer(), nullable=False, server_default='0'),
+        schema='taskfit',
+    )
+
+
+def downgrade() -> None:
+    """누적 대화 요약 컬럼 삭제."""
+    op.drop_column('threads', 'summarized_until', schema='taskfit')
+    op.drop_column('threads', 'history_summary', schema='taskfit')
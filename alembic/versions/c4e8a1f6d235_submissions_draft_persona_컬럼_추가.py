@@ -0,0 +1,39 @@
+"""submissions draft_persona 컬럼 추가
+
+Revision ID: c4e8a1f6d235
+Revises: b7d2f4a8c913
+Create Date: 2026-10-18 14:21:47.118305
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1f6d235'
+down_revision: Union[str, Sequence[str], None] = 'b7d2f4a8c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """draft 저장 시 미리 생성한 페르소나 컬럼 추가."""
+    op.add_column(
+        'submissions',
+        sa.Column('draft_persona', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        schema='taskfit',
+    )
+    op.add_column(
+        'submissions',
+        sa.Column('draft_persona_expires_at', sa.DateTime(timezone=True), nullable=True),
+        schema='taskfit',
+    )
+
+
+def downgrade() -> None:
+    """draft 페르소나 컬럼 삭제."""
+    op.drop_column('submissions', 'draft_persona_expires_at', schema='taskfit')
+    op.drop_column('submissions', 'draft_persona', schema='taskfit')
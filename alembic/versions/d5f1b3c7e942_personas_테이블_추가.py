@@ -0,0 +1,47 @@
+"""personas 테이블 추가
+
+Revision ID: d5f1b3c7e942
+Revises: c4e8a1f6d235
+Create Date: 2026-10-18 15:03:12.470913
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f1b3c7e942'
+down_revision: Union[str, Sequence[str], None] = 'c4e8a1f6d235'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """(기업, 직무, 과제 카테고리)별 면접관 페르소나 라이브러리 테이블 생성."""
+    op.create_table('personas',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('job_role_id', sa.Integer(), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('persona_name', sa.String(length=50), nullable=False),
+        sa.Column('persona_department', sa.String(length=50), nullable=False),
+        sa.Column('topic_tag', sa.String(length=50), nullable=False),
+        sa.Column('total_questions', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        schema='taskfit'
+    )
+    op.create_index(
+        'ix_personas_company_job_category',
+        'personas',
+        ['company_id', 'job_role_id', 'category'],
+        schema='taskfit',
+    )
+
+
+def downgrade() -> None:
+    """personas 테이블 삭제."""
+    op.drop_index('ix_personas_company_job_category', table_name='personas', schema='taskfit')
+    op.drop_table('personas', schema='taskfit')
@@ -0,0 +1,36 @@
+"""threads 컨텍스트 캐시 컬럼 추가
+
+Revision ID: e8a4c2d6f153
+Revises: d5f1b3c7e942
+Create Date: 2026-10-18 18:42:07.331582
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a4c2d6f153'
+down_revision: Union[str, Sequence[str], None] = 'd5f1b3c7e942'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """스레드 컨텍스트 캐시 이름/모델/만료 시각 컬럼 추가."""
+    op.add_column('threads', sa.Column('context_cache_name', sa.String(length=200), nullable=True), schema='taskfit')
+    op.add_column('threads', sa.Column('context_cache_model', sa.String(length=100), nullable=True), schema='taskfit')
+    op.add_column(
+        'threads',
+        sa.Column('context_cache_expires_at', sa.DateTime(timezone=True), nullable=True),
+        schema='taskfit',
+    )
+
+
+def downgrade() -> None:
+    """스레드 컨텍스트 캐시 컬럼 삭제."""
+    op.drop_column('threads', 'context_cache_expires_at', schema='taskfit')
+    op.drop_column('threads', 'context_cache_model', schema='taskfit')
+    op.drop_column('threads', 'context_cache_name', schema='taskfit')
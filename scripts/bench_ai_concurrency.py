@@ -0,0 +1,108 @@
+# ruff: noqa: E501
+"""LLM 호출 중 동시 처리량 벤치마크.
+
+Gemini 호출이 진행 중일 때 같은 프로세스가 다른 요청(/health)을 얼마나 처리하는지 측정한다.
+실제 Gemini 대신 로컬 대역(FakeBackend)을 주입하므로 쿼터를 소모하지 않는다.
+
+- blocking: 이전 구현처럼 동기 호출로 이벤트 루프를 막는 대역
+- async: 비동기 대역 (llm_backend=fake와 동일)
+
+실행: uv run python -m scripts.bench_ai_concurrency --llm-requests 20 --latency 2.0
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from collections import Counter
+
+import httpx
+
+os.environ.setdefault("USE_ENV_FILE", "true")
+
+from src.main import app  # noqa: E402
+from src.services import ai_service  # noqa: E402
+from src.services.llm_backend import FakeBackend, LlmResponse  # noqa: E402
+
+
+class _BlockingFakeBackend(FakeBackend):
+    """이전 구현처럼 동기 호출로 이벤트 루프를 막는 대역."""
+
+    async def generate(self, function, model, contents, config):
+        time.sleep(self.latency_seconds)
+        text = self._respond(function, contents)
+        return LlmResponse(text=text, usage_metadata=self._usage(contents, config, text))
+
+
+async def _run(mode: str, llm_requests: int, latency: float) -> dict:
+    backend_cls = _BlockingFakeBackend if mode == "blocking" else FakeBackend
+    ai_service._backend = backend_cls(latency_seconds=latency, tokens_per_second=0)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        done = asyncio.Event()
+        health_latencies: list[float] = []
+        llm_latencies: list[float] = []
+        # 200이 아닌 응답(대기열 초과 503 등)은 상태 코드별로 따로 세고 처리량/지연에서 뺀다
+        errors: Counter[str] = Counter()
+
+        async def llm_call():
+            start = time.perf_counter()
+            response = await client.post("/dev/ai/generate-persona", json={})
+            if response.status_code == 200:
+                llm_latencies.append(time.perf_counter() - start)
+            else:
+                errors[f"llm_{response.status_code}"] += 1
+
+        async def health_probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                response = await client.get("/health")
+                if response.status_code == 200:
+                    health_latencies.append(time.perf_counter() - start)
+                else:
+                    errors[f"health_{response.status_code}"] += 1
+                await asyncio.sleep(0)
+
+        start = time.perf_counter()
+        probe = asyncio.create_task(health_probe())
+        await asyncio.gather(*(llm_call() for _ in range(llm_requests)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe
+
+    ai_service._backend = None
+    health_latencies.sort()
+    llm_latencies.sort()
+    return {
+        "mode": mode,
+        "llm_requests": llm_requests,
+        "llm_ok": len(llm_latencies),
+        "errors": dict(errors),
+        "elapsed_s": round(elapsed, 2),
+        "llm_throughput_rps": round(len(llm_latencies) / elapsed, 2),
+        "llm_p50_ms": round(statistics.median(llm_latencies) * 1000, 2) if llm_latencies else None,
+        "llm_max_ms": round(llm_latencies[-1] * 1000, 2) if llm_latencies else None,
+        "health_served": len(health_latencies),
+        "health_p50_ms": round(statistics.median(health_latencies) * 1000, 2) if health_latencies else None,
+        "health_max_ms": round(health_latencies[-1] * 1000, 2) if health_latencies else None,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--llm-requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=1.0, help="스텁 LLM 응답 지연(초)")
+    parser.add_argument("--mode", choices=["blocking", "async", "both"], default="both")
+    args = parser.parse_args()
+
+    modes = ["blocking", "async"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        result = await _run(mode, args.llm_requests, args.latency)
+        print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
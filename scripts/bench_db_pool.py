@@ -0,0 +1,106 @@
+"""커넥션 풀 크기별 처리량 벤치마크.
+
+주요 조회 엔드포인트에 동시 요청을 보내면서 pool_size를 바꿔 처리량과 지연, 풀 대기 시간을 비교한다.
+풀 대기 시간이 지연의 대부분이면 풀이 병목이고, 풀을 늘려도 처리량이 그대로면 Postgres 쪽이 병목이다.
+설정된 DB(.env)를 그대로 쓰므로 데이터가 있는 개발 DB에서 실행한다.
+
+실행: uv run python -m scripts.bench_db_pool --pool-sizes 2,5,10,20 --concurrency 40 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+import httpx
+
+os.environ.setdefault("USE_ENV_FILE", "true")
+
+from src.core import database  # noqa: E402
+from src.core.auth import create_access_token  # noqa: E402
+from src.core.config import get_settings  # noqa: E402
+from src.main import app  # noqa: E402
+
+ENDPOINTS = ["/companies", "/job-roles", "/tasks", "/dashboard/summary"]
+
+
+def _percentile(values: list[float], p: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def _run(pool_size: int, max_overflow: int, concurrency: int, duration: float, token: str) -> list[dict]:
+    settings = get_settings()
+    settings.db_pool_size = pool_size
+    settings.db_max_overflow = max_overflow
+    await database.close_db()  # 다음 요청에서 새 설정으로 엔진을 다시 만든다
+
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for endpoint in ENDPOINTS:
+            await client.get(endpoint)  # 워밍업 (연결 생성 비용 제외)
+            wait_count = database._pool_checkout_wait_seconds.count(pool="primary")
+            wait_sum = database._pool_checkout_wait_seconds.sum(pool="primary")
+            latencies: list[float] = []
+            errors = 0
+            deadline = time.perf_counter() + duration
+
+            async def worker():
+                nonlocal errors
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    response = await client.get(endpoint)
+                    latencies.append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        errors += 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+
+            waits = database._pool_checkout_wait_seconds.count(pool="primary") - wait_count
+            wait_total = database._pool_checkout_wait_seconds.sum(pool="primary") - wait_sum
+            p50 = statistics.median(latencies) if latencies else None
+            p95 = _percentile(latencies, 0.95)
+            results.append(
+                {
+                    "pool_size": pool_size,
+                    "max_overflow": max_overflow,
+                    "endpoint": endpoint,
+                    "requests": len(latencies),
+                    "errors": errors,
+                    "throughput_rps": round(len(latencies) / elapsed, 1),
+                    "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                    "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                    "pool_wait_mean_ms": round(wait_total / waits * 1000, 2) if waits else 0.0,
+                }
+            )
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pool-sizes", default="2,5,10,20", help="쉼표로 구분한 pool_size 목록")
+    parser.add_argument("--max-overflow", type=int, default=0, help="풀 크기만 비교하도록 기본값은 overflow 없음")
+    parser.add_argument("--concurrency", type=int, default=40, help="동시 요청 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="엔드포인트당 측정 시간(초)")
+    parser.add_argument("--user-id", type=int, default=1, help="인증이 필요한 엔드포인트에 쓸 사용자 ID")
+    args = parser.parse_args()
+
+    token = create_access_token(args.user_id)
+    try:
+        for pool_size in (int(size) for size in args.pool_sizes.split(",")):
+            for result in await _run(pool_size, args.max_overflow, args.concurrency, args.duration, token):
+                print(json.dumps(result, ensure_ascii=False))
+    finally:
+        await database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""면접관 페르소나 라이브러리 일괄 생성.
+
+과제가 있는 (기업, 직무, 과제 카테고리) 조합마다 페르소나가 target개가 되도록 부족한 만큼 생성해 personas에 저장한다.
+이미 채워진 조합은 건너뛰므로 여러 번 실행해도 된다. 마지막에 커버리지를 출력한다.
+
+실행: uv run python -m scripts.build_persona_library --target 5
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import select
+
+from src.core.config import get_settings
+from src.core.database import close_db, open_session
+from src.models.database.company import Company
+from src.models.database.job_role import JobRole
+from src.models.database.task import Task
+from src.services import ai_service, persona_library_service
+
+logger = logging.getLogger(__name__)
+
+
+async def build(target: int, concurrency: int):
+    async with open_session() as db:
+        result = await db.execute(
+            select(Task.company_id, Company.name, Task.job_role_id, JobRole.name, Task.category)
+            .join(Company, Company.id == Task.company_id)
+            .join(JobRole, JobRole.id == Task.job_role_id)
+            .distinct()
+        )
+        combinations = result.all()
+        counts = await persona_library_service.count_personas(db)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fill(company_id: int, company_name: str, job_role_id: int, job_role_name: str, category: str):
+        missing = target - counts.get((company_id, job_role_id, category), 0)
+        if missing <= 0:
+            return
+        async with semaphore:
+            try:
+                personas = await ai_service.generate_personas(company_name, job_role_name, category, count=missing)
+            except Exception:
+                logger.exception("페르소나 생성 실패: %s / %s / %s", company_name, job_role_name, category)
+                return
+            async with open_session() as db:
+                persona_library_service.add_personas(
+                    db, company_id, job_role_id, category, personas[:missing], source="build"
+                )
+                await db.commit()
+            logger.info("%s / %s / %s: %d개 추가", company_name, job_role_name, category, len(personas[:missing]))
+
+    await asyncio.gather(*(fill(*combination) for combination in combinations))
+
+    async with open_session() as db:
+        counts = await persona_library_service.count_personas(db)
+    covered = sum(
+        1 for company_id, _, job_role_id, _, category in combinations if (company_id, job_role_id, category) in counts
+    )
+    print(f"커버리지: {covered}/{len(combinations)} 조합")
+
+
+async def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--target", type=int, default=get_settings().persona_library_target, help="조합당 목표 페르소나 수"
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 생성할 조합 수")
+    args = parser.parse_args()
+
+    ai_service.init_backend()
+    try:
+        await build(args.target, args.concurrency)
+    finally:
+        await ai_service.close_backend()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
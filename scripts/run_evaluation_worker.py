@@ -0,0 +1,36 @@
+"""채점 작업 전용 워커.
+
+API 프로세스와 분리해 evaluation_jobs를 처리한다. 여러 개를 띄워도 SKIP LOCKED로 작업이 겹치지 않는다.
+API 서버에서는 EVALUATION_WORKER_ENABLED=false로 앱 내 워커를 끌 수 있다.
+
+실행: uv run python -m scripts.run_evaluation_worker
+"""
+
+import asyncio
+import logging
+
+from src.core.config import get_settings
+from src.core.database import close_db
+from src.services import ai_service, evaluation_job_service
+
+
+async def main():
+    logging.basicConfig(level=logging.INFO)
+    settings = get_settings()
+    ai_service.init_backend()
+    workers = [
+        asyncio.create_task(evaluation_job_service.run_worker())
+        for _ in range(settings.evaluation_worker_concurrency)
+    ]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        await ai_service.close_backend()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
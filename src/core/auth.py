@@ -5,8 +5,10 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from src.core.config import get_settings
+from src.core.request_context import current_stats
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 def create_access_token(user_id: int) -> str:
@@ -41,4 +43,25 @@ async def get_current_user_id(
 ) -> int:
     """JWT에서 user_id를 추출하는 FastAPI dependency."""
     payload = decode_access_token(credentials.credentials)
-    return int(payload["sub"])
+    return _set_request_user(int(payload["sub"]))
+
+
+async def get_optional_user_id(
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
+) -> int | None:
+    """토큰이 있으면 user_id, 없거나 유효하지 않으면 None. 로그인 없이도 쓰는 조회 라우트용."""
+    if credentials is None:
+        return None
+    try:
+        payload = decode_access_token(credentials.credentials)
+    except HTTPException:
+        return None
+    return _set_request_user(int(payload["sub"]))
+
+
+def _set_request_user(user_id: int) -> int:
+    """요청 통계에 사용자를 남긴다 (쓰기 후 조회를 primary로 보내는 데 씀)."""
+    stats = current_stats()
+    if stats is not None:
+        stats.user_id = user_id
+    return user_id
@@ -1,14 +1,126 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import random
+import re
+import time
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 
+from fastapi import Depends
 from google.cloud.sql.connector import Connector, create_async_connector
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from src.core import metrics
+from src.core.auth import get_optional_user_id
 from src.core.config import get_settings
+from src.core.request_context import current_stats, statement_shape
+
+logger = logging.getLogger(__name__)
 
 # 지연 초기화: 이벤트 루프 내에서 생성해야 함
 _connector: Connector | None = None
 _engine = None
 _async_session = None
+# 읽기 복제본 (설정했을 때만)
+_replica_engine = None
+_replica_session = None
+_replica_lag: float | None = None  # 마지막으로 잰 복제 지연(초). 측정 전이거나 실패하면 None
+_last_write_at: dict[int, float] = {}  # user_id -> 마지막 쓰기 커밋 시각 (time.monotonic)
+# assert_max_queries 블록 안에서 실행한 SQL 목록
+_query_budget: ContextVar[list[str] | None] = ContextVar("query_budget", default=None)
+# 느린 SQL EXPLAIN: SQL 모양 -> 마지막 EXPLAIN 시각, 진행 중인 EXPLAIN 작업
+_explained_at: dict[str, float] = {}
+_explain_tasks: set[asyncio.Task] = set()
+_MAX_CONCURRENT_EXPLAINS = 2
+_SEQ_SCAN_PATTERN = re.compile(r"Seq Scan on (\w+)")
+
+_pool_checkout_wait_seconds = metrics.histogram(
+    "db_pool_checkout_wait_seconds",
+    "커넥션 풀에서 연결을 받기까지 걸린 시간 (빈 연결 대기 + 새 연결 생성)",
+    ("pool",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+_pool_timeouts_total = metrics.counter(
+    "db_pool_timeouts_total", "pool_timeout 안에 연결을 받지 못해 실패한 요청 수", ("pool",)
+)
+_pool_events_total = metrics.counter(
+    "db_pool_events_total",
+    "커넥션 풀 이벤트 수 (connect: 새 물리 연결, invalidate: pre-ping 실패 등으로 폐기, close: 연결 종료)",
+    ("pool", "event"),
+)
+_pool_connections = metrics.gauge(
+    "db_pool_connections",
+    "커넥션 풀 연결 수 (checked_out: 사용 중, idle: 풀에서 대기, overflow: pool_size를 넘어 연 연결)",
+    ("pool", "state"),
+)
+_pool_size = metrics.gauge("db_pool_size", "설정된 pool_size와 max_overflow", ("pool", "limit"))
+_read_routing_total = metrics.counter(
+    "db_read_routing_total",
+    "get_read_db 세션을 보낸 곳 (primary로 보낸 이유: sticky=최근 쓰기, lag=복제 지연, unavailable=지연 측정 실패)",
+    ("target", "reason"),
+)
+_slow_queries_total = metrics.counter(
+    "db_slow_queries_total", "db_slow_query_seconds를 넘긴 SQL 수", ("pool", "route")
+)
+_slow_query_seq_scans_total = metrics.counter(
+    "db_slow_query_seq_scans_total", "느린 SQL의 EXPLAIN 계획에 나온 테이블별 Seq Scan 수", ("table",)
+)
+_replica_lag_seconds = metrics.gauge("db_replica_lag_seconds", "읽기 복제본의 마지막 측정 복제 지연(초)")
+
+
+class _InstrumentedPool(AsyncAdaptedQueuePool):
+    """연결을 받기까지 기다린 시간을 기록하는 커넥션 풀.
+
+    SQLAlchemy 풀 이벤트에는 대기 시작 시점이 없으므로 _do_get을 감싸서 잰다.
+    풀은 dispose 때 같은 클래스로 다시 만들어지므로 지표 라벨은 클래스 속성으로 둔다.
+    """
+
+    label = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            _pool_timeouts_total.inc(pool=self.label)
+            raise
+        finally:
+            _pool_checkout_wait_seconds.observe(time.perf_counter() - start, pool=self.label)
+
+    def state(self) -> dict[str, int]:
+        overflow = max(0, self._overflow)
+        return {"checked_out": self.checkedout(), "idle": self.checkedin(), "overflow": overflow}
+
+
+class _ReplicaPool(_InstrumentedPool):
+    label = "replica"
+
+
+def _pools() -> list[_InstrumentedPool]:
+    return [engine.sync_engine.pool for engine in (_engine, _replica_engine) if engine is not None]
+
+
+def _pool_metrics() -> dict[tuple[str, ...], float]:
+    return {(pool.label, name): float(value) for pool in _pools() for name, value in pool.state().items()}
+
+
+def _pool_limits() -> dict[tuple[str, ...], float]:
+    limits = {}
+    for pool in _pools():
+        limits[(pool.label, "pool_size")] = float(pool.size())
+        limits[(pool.label, "max_overflow")] = float(pool._max_overflow)
+    return limits
+
+
+_pool_connections.set_function(_pool_metrics)
+_pool_size.set_function(_pool_limits)
+_replica_lag_seconds.set_function(lambda: {} if _replica_lag is None else {(): _replica_lag})
 
 
 async def _get_connector() -> Connector:
@@ -18,35 +130,271 @@ async def _get_connector() -> Connector:
     return _connector
 
 
-async def _get_connection():
-    """Cloud SQL Connector로 asyncpg 연결을 생성한다."""
+def _connect_args() -> dict:
+    """asyncpg.connect에 넘기는 연결 옵션."""
+    settings = get_settings()
+    return {
+        # taskfit 스키마를 기본 search_path로 설정 (연결 시작 파라미터로 보내 SET 왕복을 없앤다)
+        "server_settings": {"search_path": f"{settings.db_schema}, public"},
+        "statement_cache_size": settings.db_statement_cache_size,
+    }
+
+
+async def _get_connection(instance_connection_name: str | None = None):
+    """Cloud SQL Connector로 asyncpg 연결을 생성한다. 인스턴스를 주지 않으면 primary."""
     settings = get_settings()
     connector = await _get_connector()
-    conn = await connector.connect_async(
-        settings.db_instance_connection_name,
+    return await connector.connect_async(
+        instance_connection_name or settings.db_instance_connection_name,
         "asyncpg",
         user=settings.db_user,
         password=settings.db_password,
         db=settings.db_name,
+        **_connect_args(),
+    )
+
+
+def _connector_creator(instance_connection_name: str):
+    """Connector 연결을 드라이버 어댑터로 감싼다.
+
+    async_creator로는 드라이버의 prepared_statement_cache_size를 넘길 수 없어 어댑터의 connect를 직접 부른다.
+    """
+    return _get_engine().sync_engine.dialect.dbapi.connect(
+        async_creator_fn=functools.partial(_get_connection, instance_connection_name),
+        prepared_statement_cache_size=get_settings().db_statement_cache_size,
     )
-    # taskfit 스키마를 기본 search_path로 설정
-    await conn.execute(f"SET search_path TO {settings.db_schema}, public")
-    return conn
+
+
+def _listen_pool_events(engine: AsyncEngine, pool: str):
+    for name in ("connect", "invalidate", "close"):
+        event.listen(
+            engine.sync_engine, name, lambda *args, _name=name: _pool_events_total.inc(pool=pool, event=_name)
+        )
+
+
+def _listen_queries(engine: AsyncEngine):
+    """실행한 SQL과 걸린 시간을 현재 요청의 RequestStats(와 assert_max_queries 블록)에 기록한다."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def end_query(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_started"].pop()
+        record_query(statement, duration)
+        threshold = get_settings().db_slow_query_seconds
+        if 0 < threshold <= duration and not statement.startswith("EXPLAIN"):
+            _on_slow_query(engine, statement, parameters, executemany, duration)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def drop_query(context):
+        # 실패한 SQL은 after_cursor_execute가 불리지 않으므로 시작 시각만 버린다
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+def record_query(statement: str, duration: float):
+    """SQL 1회 실행을 현재 요청의 RequestStats와 assert_max_queries 블록에 기록한다.
+
+    엔진 이벤트가 호출하며, 테스트의 가짜 세션도 같은 경로로 기록해 쿼리 예산을 검사한다.
+    """
+    stats = current_stats()
+    if stats is not None:
+        stats.record_query(statement, duration)
+    budget = _query_budget.get()
+    if budget is not None:
+        budget.append(statement)
+
+
+def _format_params(parameters) -> str:
+    """로그용 파라미터 표시. 제출물 같은 긴 값은 앞부분만 남긴다."""
+    if isinstance(parameters, (list, tuple)):
+        parameters = [p[:50] + "…" if isinstance(p, str) and len(p) > 50 else p for p in parameters]
+    text = repr(parameters)
+    return text if len(text) <= 500 else text[:500] + "…"
+
+
+def _should_explain(statement: str, executemany: bool) -> bool:
+    """EXPLAIN ANALYZE는 SQL을 실제로 다시 실행하므로 잠금 없는 SELECT만, 같은 모양은 주기마다 한 번만 한다."""
+    settings = get_settings()
+    head = statement.lstrip()[:6].upper()
+    upper = statement.upper()
+    if executemany or head != "SELECT" or "FOR UPDATE" in upper or "FOR SHARE" in upper:
+        return False
+    if len(_explain_tasks) >= _MAX_CONCURRENT_EXPLAINS:
+        return False
+    if settings.environment == "production" and random.random() >= settings.db_slow_query_explain_sample_rate:
+        return False
+    shape = statement_shape(statement)
+    now = time.monotonic()
+    explained_at = _explained_at.get(shape)
+    if explained_at is not None and now - explained_at < settings.db_slow_query_explain_interval_seconds:
+        return False
+    _explained_at[shape] = now
+    return True
+
+
+def _on_slow_query(engine: AsyncEngine, statement: str, parameters, executemany: bool, duration: float):
+    stats = current_stats()
+    route = f"{stats.method} {stats.route}" if stats is not None else "background"
+    pool = engine.sync_engine.pool.label
+    _slow_queries_total.inc(pool=pool, route=route)
+    logger.warning(
+        "느린 SQL %.1fms [%s, %s]: %s params=%s", duration * 1000, route, pool, statement, _format_params(parameters)
+    )
+    if _should_explain(statement, executemany):
+        # 요청 통계에 섞이지 않도록 빈 컨텍스트에서, 요청이 쓰던 것과 다른 연결로 실행
+        task = asyncio.get_running_loop().create_task(
+            _explain(engine, statement, parameters, route), context=contextvars.Context()
+        )
+        _explain_tasks.add(task)
+        task.add_done_callback(_explain_tasks.discard)
+
+
+async def _explain(engine: AsyncEngine, statement: str, parameters, route: str):
+    """느린 SELECT를 EXPLAIN (ANALYZE, BUFFERS)로 다시 실행해 계획을 로그로 남긴다. 결과는 항상 롤백한다."""
+    timeout_ms = int(get_settings().db_slow_query_explain_timeout_seconds * 1000)
+    try:
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+            result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in result)
+            await conn.rollback()
+    except Exception as e:
+        logger.warning("느린 SQL EXPLAIN 실패 [%s]: %r", route, e)
+        return
+    for table in set(_SEQ_SCAN_PATTERN.findall(plan)):
+        _slow_query_seq_scans_total.inc(table=table)
+    logger.warning("느린 SQL 실행 계획 [%s]: %s\n%s", route, statement, plan)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """블록 안에서 실행한 SQL이 limit개를 넘으면 AssertionError. 테스트에서 엔드포인트별 쿼리 예산을 고정할 때 쓴다.
+
+    httpx.ASGITransport처럼 같은 태스크에서 앱을 호출해야 요청 안의 SQL까지 센다.
+    """
+    statements: list[str] = []
+    token = _query_budget.set(statements)
+    try:
+        yield statements
+    finally:
+        _query_budget.reset(token)
+    if len(statements) > limit:
+        listing = "\n".join(f"  {statement}" for statement in statements)
+        raise AssertionError(f"SQL {len(statements)}개 실행 (예산 {limit}개):\n{listing}")
+
+
+def _record_write():
+    """현재 요청 사용자의 쓰기 시각을 남긴다. 이후 db_read_your_writes_seconds 동안 그 사용자의 조회는 primary로."""
+    stats = current_stats()
+    window = get_settings().db_read_your_writes_seconds
+    if stats is None or stats.user_id is None or window <= 0:
+        return
+    now = time.monotonic()
+    _last_write_at[stats.user_id] = now
+    if len(_last_write_at) > 1024:
+        for user_id, written_at in list(_last_write_at.items()):
+            if now - written_at > window:
+                del _last_write_at[user_id]
+
+
+def _listen_writes(engine: AsyncEngine):
+    """INSERT/UPDATE/DELETE를 실행한 트랜잭션이 커밋되면 _record_write를 부른다."""
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def mark_write(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and (context.isinsert or context.isupdate or context.isdelete):
+            conn.info["wrote"] = True
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def on_commit(conn):
+        if conn.info.pop("wrote", False):
+            _record_write()
+
+    @event.listens_for(engine.sync_engine, "rollback")
+    def on_rollback(conn):
+        conn.info.pop("wrote", None)
+
+
+def _create_engine(poolclass: type[_InstrumentedPool], dsn: str, instance_connection_name: str) -> AsyncEngine:
+    settings = get_settings()
+    if settings.db_connection_mode == "dsn":
+        # Unix 소켓(Cloud SQL Auth Proxy)이나 로컬 Postgres에 Connector 없이 바로 연결.
+        # SQLAlchemy asyncpg 드라이버가 따로 두는 prepared statement 캐시도 같은 크기로 맞춘다
+        url = make_url(dsn).set(drivername="postgresql+asyncpg")
+        url = url.update_query_dict({"prepared_statement_cache_size": str(settings.db_statement_cache_size)})
+        connect = {"connect_args": _connect_args()}
+    else:
+        url = "postgresql+asyncpg://"
+        connect = {"creator": functools.partial(_connector_creator, instance_connection_name)}
+    engine = create_async_engine(
+        url,
+        **connect,
+        poolclass=poolclass,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_use_lifo=settings.db_pool_use_lifo,
+    )
+    _listen_pool_events(engine, poolclass.label)
+    _listen_queries(engine)
+    return engine
 
 
 def _get_engine():
     global _engine
     if _engine is None:
-        _engine = create_async_engine(
-            "postgresql+asyncpg://",
-            async_creator=_get_connection,
-            pool_size=5,
-            max_overflow=10,
-            pool_pre_ping=True,
-        )
+        settings = get_settings()
+        _engine = _create_engine(_InstrumentedPool, settings.db_dsn, settings.db_instance_connection_name)
+        _listen_writes(_engine)
     return _engine
 
 
+def replica_configured() -> bool:
+    settings = get_settings()
+    if settings.db_connection_mode == "dsn":
+        return bool(settings.db_replica_dsn)
+    return bool(settings.db_replica_instance_connection_name)
+
+
+def _get_replica_engine():
+    global _replica_engine
+    if _replica_engine is None:
+        settings = get_settings()
+        _replica_engine = _create_engine(
+            _ReplicaPool, settings.db_replica_dsn, settings.db_replica_instance_connection_name
+        )
+    return _replica_engine
+
+
+async def prewarm(count: int):
+    """엔진마다 연결 count개(최대 pool_size)를 미리 열어 풀에 넣어 둔다. 앱 시작 시 호출한다.
+
+    첫 요청들이 Connector 초기화, TLS 핸드셰이크, 풀 채우기 비용을 나눠 내지 않게 한다.
+    실패해도 앱은 뜨고, 연결은 기존처럼 요청 때 연다.
+    """
+    count = min(count, get_settings().db_pool_size)
+    if count <= 0:
+        return
+    engines = [_get_engine()] + ([_get_replica_engine()] if replica_configured() else [])
+    for engine in engines:
+        label = engine.sync_engine.pool.label
+        start = time.perf_counter()
+        results = await asyncio.gather(*(engine.connect() for _ in range(count)), return_exceptions=True)
+        connections = [r for r in results if not isinstance(r, BaseException)]
+        await asyncio.gather(*(conn.close() for conn in connections))
+        failures = [r for r in results if isinstance(r, BaseException)]
+        if failures:
+            logger.warning("DB(%s) 연결 미리 열기 실패 %d/%d: %r", label, len(failures), count, failures[0])
+        else:
+            logger.info("DB(%s) 연결 %d개 미리 열기 완료 (%.2fs)", label, count, time.perf_counter() - start)
+
+
 def _get_session_maker():
     global _async_session
     if _async_session is None:
@@ -56,6 +404,26 @@ def _get_session_maker():
     return _async_session
 
 
+def _get_replica_session_maker():
+    global _replica_session
+    if _replica_session is None:
+        _replica_session = async_sessionmaker(_get_replica_engine(), class_=AsyncSession, expire_on_commit=False)
+    return _replica_session
+
+
+def _read_route(user_id: int | None) -> str:
+    """조회를 보낼 곳의 이유. replica면 복제본, 나머지는 primary."""
+    settings = get_settings()
+    written_at = _last_write_at.get(user_id) if user_id is not None else None
+    if written_at is not None and time.monotonic() - written_at < settings.db_read_your_writes_seconds:
+        return "sticky"
+    if _replica_lag is None:
+        return "unavailable"
+    if _replica_lag > settings.db_replica_max_lag_seconds:
+        return "lag"
+    return "replica"
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI Depends()용 DB 세션 제공자."""
     session_maker = _get_session_maker()
@@ -63,12 +431,69 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_read_db(user_id: int | None = Depends(get_optional_user_id)) -> AsyncGenerator[AsyncSession, None]:
+    """조회 전용 라우트용 DB 세션 제공자. 읽기 복제본이 있으면 복제본 세션을 준다.
+
+    복제 지연이 db_replica_max_lag_seconds를 넘었거나 측정에 실패했으면, 또는 이 사용자가
+    db_read_your_writes_seconds 안에 쓰기를 했으면 방금 쓴 내용이 보이도록 primary 세션을 준다.
+    """
+    session_maker = _get_session_maker()
+    if replica_configured():
+        reason = _read_route(user_id)
+        _read_routing_total.inc(target="replica" if reason == "replica" else "primary", reason=reason)
+        if reason == "replica":
+            session_maker = _get_replica_session_maker()
+    async with session_maker() as session:
+        yield session
+
+
+async def run_replica_lag_monitor():
+    """읽기 복제본의 복제 지연을 주기적으로 잰다. 앱 시작 시 백그라운드 작업으로 띄운다."""
+    global _replica_lag
+    while True:
+        try:
+            async with _get_replica_session_maker()() as session:
+                result = await session.execute(text(_REPLICA_LAG_SQL))
+                _replica_lag = float(result.scalar_one())
+        except Exception as e:
+            _replica_lag = None
+            logger.warning("읽기 복제본 지연 측정 실패: %r", e)
+        await asyncio.sleep(get_settings().db_replica_lag_check_seconds)
+
+
+# 받은 WAL을 모두 재생했으면 0, 아니면 마지막으로 재생한 트랜잭션 이후 경과 시간 (복제본이 아니면 0)
+_REPLICA_LAG_SQL = """
+SELECT COALESCE(
+    CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END,
+    0)
+"""
+
+
+@asynccontextmanager
+async def open_session() -> AsyncGenerator[AsyncSession, None]:
+    """요청 스코프 밖(스트리밍 응답, 백그라운드 작업)에서 쓰는 독립 DB 세션."""
+    session_maker = _get_session_maker()
+    async with session_maker() as session:
+        yield session
+
+
 async def close_db():
     """앱 종료 시 커넥터/엔진 정리."""
-    global _connector, _engine
+    global _connector, _engine, _async_session, _replica_engine, _replica_session, _replica_lag
+    tasks = list(_explain_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if _replica_engine is not None:
+        await _replica_engine.dispose()
+        _replica_engine = None
+        _replica_session = None
+        _replica_lag = None
     if _engine is not None:
         await _engine.dispose()
         _engine = None
+        _async_session = None
     if _connector is not None:
         await _connector.close_async()
         _connector = None
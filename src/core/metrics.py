@@ -0,0 +1,177 @@
+"""프로세스 내 메트릭 레지스트리.
+
+외부 의존성 없이 Counter/Gauge/Histogram을 보관하고 Prometheus 텍스트 포맷으로 내보낸다.
+GET /metrics 에서 render() 결과를 그대로 반환한다.
+"""
+
+from collections.abc import Callable
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 {self.labelnames}가 필요합니다 (받은 값: {tuple(labels)})")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _format_labels(self, key: tuple[str, ...], extra: dict | None = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs += list(extra.items())
+        if not pairs:
+            return ""
+        body = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+        return "{" + body + "}"
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines += self._samples()
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        return [f"{self.name}{self._format_labels(k)} {_num(v)}" for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._callback: Callable[[], dict[tuple[str, ...], float]] | None = None
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def set_function(self, callback: Callable[[], dict[tuple[str, ...], float]]):
+        """render 시점에 값을 계산하는 콜백을 등록한다. {라벨값 튜플: 값}을 반환해야 한다."""
+        self._callback = callback
+
+    def _samples(self) -> list[str]:
+        values = dict(self._values)
+        if self._callback is not None:
+            values.update(self._callback())
+        return [f"{self.name}{self._format_labels(k)} {_num(v)}" for k, v in values.items()]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [버킷별 누적 카운트..., count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[i] += 1
+        state[-2] += 1
+        state[-1] += value
+
+    def count(self, **labels) -> float:
+        state = self._values.get(self._key(labels))
+        return state[-2] if state else 0.0
+
+    def sum(self, **labels) -> float:
+        state = self._values.get(self._key(labels))
+        return state[-1] if state else 0.0
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, state in self._values.items():
+            for bound, cnt in zip(self.buckets, state):
+                lines.append(f"{self.name}_bucket{self._format_labels(key, {'le': _num(bound)})} {_num(cnt)}")
+            lines.append(f"{self.name}_bucket{self._format_labels(key, {'le': '+Inf'})} {_num(state[-2])}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {_num(state[-2])}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_num(state[-1])}")
+        return lines
+
+
+_registry: dict[str, _Metric] = {}
+
+
+def _get_or_create(cls, name: str, *args, **kwargs):
+    metric = _registry.get(name)
+    if metric is None:
+        metric = _registry[name] = cls(name, *args, **kwargs)
+    elif not isinstance(metric, cls):
+        raise ValueError(f"{name}은 이미 다른 타입의 메트릭으로 등록되어 있습니다")
+    return metric
+
+
+def counter(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    return _get_or_create(Counter, name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+    return _get_or_create(Gauge, name, documentation, labelnames)
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: tuple[str, ...] = (),
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return _get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+
+def render() -> str:
+    """등록된 모든 메트릭을 Prometheus 텍스트 포맷으로 반환한다."""
+    return "\n".join(m.render() for m in _registry.values()) + "\n"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
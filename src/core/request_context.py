@@ -0,0 +1,248 @@
+"""요청 단위 실행 통계와 취소 신호.
+
+ASGI 미들웨어가 요청마다 RequestStats를 contextvar에 올려두고, 서비스 계층(ai_service 등)이
+current_stats()로 꺼내 기록한다. SQL 실행은 database 모듈의 엔진 이벤트가 기록한다.
+요청이 끝나면 요약을 한 줄 로그로 남기고, 응답에는 Server-Timing 헤더로 DB/LLM 시간을 붙인다.
+같은 모양의 SQL이 한 요청에서 반복되면(N+1) 경고 로그를 남긴다.
+
+ClientDisconnectMiddleware는 요청마다 RequestCancellation(연결 끊김 이벤트 + 요청 deadline)을 올려두고,
+ai_service는 current_cancellation()을 보고 진행 중인 LLM 호출을 중단한다.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import Context, ContextVar, copy_context
+from dataclasses import dataclass, field
+
+from src.core import metrics
+from src.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 바인드 파라미터 목록(IN 절 확장 등)을 하나로 접어 같은 모양의 SQL을 한 종류로 센다
+_PARAMS_PATTERN = re.compile(r"\$\d+(?:\s*,\s*\$\d+)*")
+
+
+def statement_shape(statement: str) -> str:
+    """바인드 파라미터 자리를 ?로 접은 SQL. 값만 다른 SQL을 같은 종류로 묶을 때 쓴다."""
+    return _PARAMS_PATTERN.sub("?", statement)
+
+
+_request_queries = metrics.histogram(
+    "db_request_queries",
+    "요청 하나가 실행한 SQL 수",
+    ("route",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+_repeated_queries_total = metrics.counter(
+    "db_repeated_queries_total",
+    "같은 모양의 SQL을 db_repeated_query_threshold번 이상 실행한(N+1 의심) 요청 수",
+    ("route",),
+)
+
+
+@dataclass
+class LlmCallRecord:
+    function: str
+    model: str
+    duration: float
+    prompt_tokens: int = 0
+    response_tokens: int = 0
+    outcome: str = "ok"
+
+
+@dataclass
+class RequestStats:
+    method: str
+    path: str
+    user_id: int | None = None  # 인증 dependency가 채움
+    scope: dict | None = field(default=None, repr=False)
+    llm_calls: list[LlmCallRecord] = field(default_factory=list)
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    db_statements: Counter = field(default_factory=Counter)  # SQL 모양 -> 실행 횟수
+    llm_shared: Counter = field(default_factory=Counter)  # 다른 요청의 호출 결과를 받은 함수 -> 횟수 (합류/결과 캐시)
+
+    @property
+    def route(self) -> str:
+        """매칭된 라우트 경로 템플릿 (라우팅 전이거나 매칭 실패면 실제 경로)."""
+        return getattr((self.scope or {}).get("route"), "path", self.path)
+
+    def record_query(self, statement: str, duration: float):
+        self.db_queries += 1
+        self.db_seconds += duration
+        self.db_statements[statement_shape(statement)] += 1
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """threshold번 이상 실행한 SQL 모양과 횟수 (많은 순)."""
+        if threshold <= 0:
+            return []
+        return [(statement, n) for statement, n in self.db_statements.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        llm_ms = sum(c.duration for c in self.llm_calls) * 1000
+        timing = f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries"'
+        if self.llm_calls:
+            timing += f', llm;dur={llm_ms:.1f};desc="{len(self.llm_calls)} calls"'
+        return timing
+
+    def summary(self) -> str:
+        db = f"db_queries={self.db_queries} db_ms={self.db_seconds * 1000:.1f}"
+        if self.llm_shared:
+            db += f" llm_shared={','.join(f'{function}:{n}' for function, n in self.llm_shared.items())}"
+        if not self.llm_calls:
+            return db
+        llm_ms = sum(c.duration for c in self.llm_calls) * 1000
+        prompt_tokens = sum(c.prompt_tokens for c in self.llm_calls)
+        response_tokens = sum(c.response_tokens for c in self.llm_calls)
+        errors = sum(1 for c in self.llm_calls if c.outcome != "ok")
+        functions = ",".join(c.function for c in self.llm_calls)
+        return (
+            f"{db} llm_calls={len(self.llm_calls)} llm_ms={llm_ms:.1f} prompt_tokens={prompt_tokens} "
+            f"response_tokens={response_tokens} llm_errors={errors} llm_functions={functions}"
+        )
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    """현재 요청의 통계 객체. 요청 밖(백그라운드 작업 등)에서는 None."""
+    return _current.get()
+
+
+class RequestStatsMiddleware:
+    """요청마다 RequestStats를 만들고 끝나면 요약을 로그로 남기는 ASGI 미들웨어.
+
+    Server-Timing 헤더에는 응답 시작 시점까지의 DB/LLM 시간이 들어간다 (스트리밍 응답은 시작 전까지만).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(method=scope["method"], path=scope["path"], scope=scope)
+        token = _current.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", None)
+            if route is not None:
+                _request_queries.observe(stats.db_queries, route=route)
+            if stats.llm_calls or stats.llm_shared or stats.db_queries:
+                logger.info(
+                    "%s %s status=%s duration_ms=%.1f %s",
+                    stats.method,
+                    stats.route,
+                    status_code,
+                    (time.perf_counter() - started) * 1000,
+                    stats.summary(),
+                )
+            repeated = stats.repeated_statements(get_settings().db_repeated_query_threshold)
+            if repeated:
+                _repeated_queries_total.inc(route=route or "unmatched")
+                statement, n = repeated[0]
+                logger.warning(
+                    "N+1 의심: %s %s 같은 SQL %d회 실행 (총 %d회): %s",
+                    stats.method,
+                    stats.route,
+                    n,
+                    stats.db_queries,
+                    statement[:300],
+                )
+
+
+class ClientDisconnectedError(Exception):
+    """클라이언트 연결이 끊겨 진행 중이던 작업을 중단함. 라우터는 부분 저장한 상태를 되돌린다."""
+
+
+@dataclass
+class RequestCancellation:
+    disconnected: asyncio.Event = field(default_factory=asyncio.Event)
+    deadline: float | None = None  # time.monotonic() 기준, None이면 제한 없음
+
+
+_cancellation: ContextVar[RequestCancellation | None] = ContextVar("request_cancellation", default=None)
+
+
+def current_cancellation() -> RequestCancellation | None:
+    """현재 요청의 취소 신호. 요청 밖(백그라운드 작업 등)에서는 None."""
+    return _cancellation.get()
+
+
+def detached_context(stats: RequestStats | None = None) -> Context:
+    """현재 컨텍스트에서 취소 신호와 요청 통계를 뺀 복사본. 여러 요청이 공유하는 작업을 띄울 때 쓴다.
+
+    공유 작업의 LLM/DB 기록은 띄운 요청이 아니라 stats(없으면 기록 안 함)에 쌓인다.
+    """
+    context = copy_context()
+    context.run(_cancellation.set, None)
+    context.run(_current.set, stats)
+    return context
+
+
+class ClientDisconnectMiddleware:
+    """요청 본문을 다 읽은 뒤 http.disconnect를 지켜보다가 연결이 끊기면 취소 신호를 켜는 ASGI 미들웨어.
+
+    본문 이후의 receive는 이 미들웨어만 읽고, 앱(StreamingResponse 등)에는 연결 끊김만 전달한다.
+    """
+
+    def __init__(self, app, deadline_seconds: float = 0.0):
+        self.app = app
+        self.deadline_seconds = deadline_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        deadline = time.monotonic() + self.deadline_seconds if self.deadline_seconds > 0 else None
+        cancellation = RequestCancellation(deadline=deadline)
+        watcher: asyncio.Task | None = None
+
+        async def watch():
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    cancellation.disconnected.set()
+                    return
+
+        async def receive_wrapper():
+            nonlocal watcher
+            if watcher is not None:
+                await cancellation.disconnected.wait()
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                cancellation.disconnected.set()
+            elif not message.get("more_body", False):
+                watcher = asyncio.create_task(watch())
+            return message
+
+        token = _cancellation.set(cancellation)
+        try:
+            await self.app(scope, receive_wrapper, send)
+        finally:
+            _cancellation.reset(token)
+            if watcher is not None:
+                watcher.cancel()
@@ -1,26 +1,62 @@
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from src.core.config import get_settings
-from src.core.database import close_db
+from src.core.database import close_db, prewarm, replica_configured, run_replica_lag_monitor
+from src.core.request_context import ClientDisconnectedError, ClientDisconnectMiddleware, RequestStatsMiddleware
 from src.routers import (
     auth,
     companies,
     dashboard,
     evaluations,
     job_roles,
+    metrics,
     profile,
     submissions,
     tasks,
     threads,
 )
+from src.services import (
+    ai_service,
+    evaluation_job_service,
+    history_service,
+    persona_prefetch_service,
+    task_pool_service,
+)
+from src.services.ai_limiter import AiOverloadedError
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    settings = get_settings()
+    # import 시점이 아니라 서버가 뜰 때 설정한다 (앱을 import만 하는 테스트/스크립트의 로깅 설정을 덮지 않게)
+    logging.basicConfig(level=settings.log_level)
+    ai_service.init_backend()
+
+    await prewarm(settings.db_pool_prewarm)
+    workers = []
+    if settings.evaluation_worker_enabled:
+        workers = [
+            asyncio.create_task(evaluation_job_service.run_worker())
+            for _ in range(settings.evaluation_worker_concurrency)
+        ]
+    if replica_configured():
+        workers.append(asyncio.create_task(run_replica_lag_monitor()))
+
     yield
+
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    await task_pool_service.shutdown()
+    await persona_prefetch_service.shutdown()
+    await history_service.shutdown()
+    await ai_service.close_backend()
     await close_db()
 
 
@@ -31,6 +67,8 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(RequestStatsMiddleware)
+app.add_middleware(ClientDisconnectMiddleware, deadline_seconds=get_settings().ai_request_deadline_seconds)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -39,6 +77,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(AiOverloadedError)
+async def ai_overloaded_handler(request: Request, exc: AiOverloadedError):
+    # Gemini 쿼터 초과는 429, 우리 쪽 대기열 포화/대기 시간 초과/호출 deadline 초과는 503
+    status_code = 429 if exc.reason == "upstream_quota" else 503
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "detail": {
+                "code": "AI_OVERLOADED",
+                "message": "AI 요청이 많아 잠시 후 다시 시도해주세요",
+            }
+        },
+        headers={"Retry-After": str(int(exc.retry_after))},
+    )
+
+
+@app.exception_handler(ClientDisconnectedError)
+async def client_disconnected_handler(request: Request, exc: ClientDisconnectedError):
+    # 받을 클라이언트가 없으므로 응답은 기록용 (nginx 관례의 499)
+    return JSONResponse(
+        status_code=499,
+        content={"detail": {"code": "CLIENT_DISCONNECTED", "message": "클라이언트 연결이 끊겼습니다"}},
+    )
+
+
 # 라우터 등록
 app.include_router(auth.router)
 app.include_router(companies.router)
@@ -49,6 +113,7 @@ app.include_router(threads.router)
 app.include_router(evaluations.router)
 app.include_router(dashboard.router)
 app.include_router(profile.router)
+app.include_router(metrics.router)
 
 # dev 라우터: production이 아닐 때만 포함
 settings = get_settings()
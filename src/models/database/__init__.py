@@ -1,8 +1,10 @@
 from src.models.database.base import Base
 from src.models.database.company import Company
 from src.models.database.evaluation import Evaluation
+from src.models.database.evaluation_job import EvaluationJob
 from src.models.database.job_role import JobRole
 from src.models.database.message import Message
+from src.models.database.persona import Persona
 from src.models.database.submission import Submission
 from src.models.database.task import Task
 from src.models.database.thread import Thread
@@ -20,6 +22,8 @@ __all__ = [
     "Thread",
     "Message",
     "Evaluation",
+    "EvaluationJob",
+    "Persona",
     "UserCompetency",
     "CrawlData",
 ]
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.database.base import Base
+
+
+class Persona(Base):
+    """(기업, 직무, 과제 카테고리)별로 미리 만들어 둔 면접관 페르소나."""
+
+    __tablename__ = "personas"
+    __table_args__ = (
+        Index("ix_personas_company_job_category", "company_id", "job_role_id", "category"),
+        {"schema": "taskfit"},
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    company_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    job_role_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    category: Mapped[str] = mapped_column(String(50), nullable=False)
+    persona_name: Mapped[str] = mapped_column(String(50), nullable=False)
+    persona_department: Mapped[str] = mapped_column(String(50), nullable=False)
+    topic_tag: Mapped[str] = mapped_column(String(50), nullable=False)
+    total_questions: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
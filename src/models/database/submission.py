@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 
 from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.models.database.base import Base
@@ -21,6 +22,9 @@ class Submission(Base):
     is_draft: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="draft")
     time_spent_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # draft 저장 시 미리 생성한 면접관 페르소나 (정식 제출 시 사용, 만료되면 무시)
+    draft_persona: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    draft_persona_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
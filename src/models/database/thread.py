@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Index, Integer, String
+from sqlalchemy import DateTime, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.models.database.base import Base
@@ -22,6 +22,13 @@ class Thread(Base):
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="questioning")
     total_questions: Mapped[int] = mapped_column(Integer, nullable=False)
     asked_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # 최근 N개 메시지 이전 대화의 누적 요약과, 요약에 반영된 마지막 message_order
+    history_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    summarized_until: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Gemini 컨텍스트 캐시 (다른 인스턴스/채점 워커가 재사용하고 스레드가 끝나면 삭제하도록 저장)
+    context_cache_name: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    context_cache_model: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    context_cache_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
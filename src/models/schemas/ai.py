@@ -0,0 +1,39 @@
+"""Gemini 구조화 출력 스키마.
+
+ai_service가 response_schema로 넘겨 디코딩을 강제하고, 응답은 TypeAdapter로 바로 검증한다.
+"""
+
+from pydantic import BaseModel
+
+from src.models.schemas.evaluation import AnalysisPoints, ScoreDetail
+
+
+class GeneratedTask(BaseModel):
+    title: str
+    description: str
+    category: str
+    difficulty: str
+    estimated_minutes: int
+    answer_type: str = "text"
+    key_points: list[str] = []
+    tech_stack: list[str] = []
+
+
+class GeneratedPersona(BaseModel):
+    persona_name: str
+    persona_department: str
+    topic_tag: str
+    total_questions: int
+
+
+class GeneratedPersonaWithQuestion(GeneratedPersona):
+    first_question: str
+
+
+class EvaluationResult(BaseModel):
+    total_score: int
+    score_label: str
+    scores_detail: list[ScoreDetail]
+    ai_summary: str
+    analysis_points: AnalysisPoints
+    feedback: str | None = None
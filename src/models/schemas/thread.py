@@ -2,7 +2,7 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
-from src.models.schemas.message import MessageResponse
+from src.models.schemas.message import EvaluationInline, MessageResponse
 
 
 class ThreadBrief(BaseModel):
@@ -63,3 +63,11 @@ class ThreadDetailResponse(BaseModel):
     submission: SubmissionInThread
     evaluation: EvaluationInThread | None = None
     messages: list[MessageResponse]
+
+
+class EvaluationStatusResponse(BaseModel):
+    thread_id: int
+    thread_status: str
+    job_status: str | None = None
+    attempts: int = 0
+    evaluation: EvaluationInline | None = None
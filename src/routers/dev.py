@@ -75,18 +75,19 @@ async def test_generate_tasks(body: DevAiTaskRequest):
         job_role_name=body.job_role_name,
         count=body.count,
     )
-    return success_response(result)
+    return success_response([t.model_dump() for t in result])
 
 
 @router.post("/ai/generate-persona", response_model=dict)
 async def test_generate_persona(body: DevAiPersonaRequest):
     """AI 페르소나 생성을 테스트한다."""
-    result = await ai_service.generate_persona(
-        company_name=body.company_name,
-        job_role_name=body.job_role_name,
-        task_title=body.task_title,
-    )
-    return success_response(result)
+    with ai_service.batch_priority():
+        result = await ai_service.generate_persona(
+            company_name=body.company_name,
+            job_role_name=body.job_role_name,
+            task_title=body.task_title,
+        )
+    return success_response(result.model_dump())
 
 
 @router.post("/ai/evaluate", response_model=dict)
@@ -101,4 +102,4 @@ async def test_evaluate(body: DevAiEvalRequest):
         submission_content=body.submission_content,
         conversation_history=body.conversation_history,
     )
-    return success_response(result)
+    return success_response(result.model_dump())
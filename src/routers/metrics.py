@@ -0,0 +1,31 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.core import metrics
+from src.core.auth import optional_security
+from src.core.config import get_settings
+
+router = APIRouter(tags=["모니터링"])
+
+
+def verify_metrics_access(credentials: HTTPAuthorizationCredentials | None = Depends(optional_security)):
+    """metrics_token이 있으면 같은 Bearer 토큰을 요구한다. 없으면 production이 아닐 때만 연다."""
+    settings = get_settings()
+    if not settings.metrics_token:
+        if settings.environment == "production":
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+        return
+    if credentials is None or not hmac.compare_digest(credentials.credentials, settings.metrics_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={"code": "INVALID_TOKEN", "message": "유효하지 않은 토큰입니다"},
+        )
+
+
+@router.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(verify_metrics_access)])
+async def get_metrics():
+    """프로세스 메트릭을 Prometheus 텍스트 포맷으로 반환한다."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
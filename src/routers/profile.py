@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.auth import get_current_user_id
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db
 from src.core.response import ApiResponse, success_response
 from src.models.schemas.auth import UserResponse
 from src.models.schemas.profile import ProfileResponse, ProfileUpdateRequest
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/profile", tags=["프로필"])
 @router.get("", response_model=ApiResponse[ProfileResponse])
 async def get_profile(
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """내 프로필을 조회한다."""
     data = await profile_service.get_profile(db, user_id)
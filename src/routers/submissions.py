@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.auth import get_current_user_id
+from src.core.config import get_settings
 from src.core.database import get_db
 from src.core.response import ApiResponse, success_response
 from src.models.schemas.message import MessageResponse
@@ -15,10 +16,14 @@ from src.models.schemas.thread import ThreadBrief
 from src.services import (
     ai_service,
     company_service,
+    persona_library_service,
+    persona_prefetch_service,
+    question_bank,
     submission_service,
     task_service,
     thread_service,
 )
+from src.services.ai_resilience import AiUnavailableError
 
 router = APIRouter(prefix="/submissions", tags=["제출"])
 
@@ -46,6 +51,15 @@ async def create_submission(
             detail={"code": "ALREADY_SUBMITTED", "message": "이미 제출한 과제입니다"},
         )
 
+    # AI 대기열이 가득 찼으면 제출물을 저장하기 전에 503으로 돌려보낸다
+    if not body.is_draft:
+        ai_service.check_admission()
+
+    # draft 저장 때 미리 만들어 둔 페르소나 (update_submission 커밋 시 컬럼도 함께 비워진다)
+    prefetched_persona = None
+    if existing and existing.is_draft and not body.is_draft:
+        prefetched_persona = persona_prefetch_service.take_persona(existing)
+
     # 기존 draft가 있으면 업데이트
     if existing and existing.is_draft:
         submission = await submission_service.update_submission(
@@ -68,6 +82,10 @@ async def create_submission(
     thread_brief = None
     first_message = None
 
+    if body.is_draft:
+        # 곧 정식 제출할 가능성이 높으므로 페르소나를 미리 생성해 둔다
+        persona_prefetch_service.schedule(submission)
+
     # 정식 제출이면 AI 질의응답 시작
     if not body.is_draft:
         # 기업, 직무 조회
@@ -81,35 +99,95 @@ async def create_submission(
         job_role = next((r for r in roles if r.id == task.job_role_id), None)
         job_role_name = job_role.name if job_role else "알 수 없는 직무"
 
-        # AI 페르소나 생성
-        persona = await ai_service.generate_persona(
-            company_name=company_name,
-            job_role_name=job_role_name,
-            task_title=task.title,
+        # draft 때 만든 페르소나가 없으면 라이브러리에서 고른다 (목표 개수만큼 채워지지 않은 조합은 즉석 생성)
+        ready_persona = prefetched_persona or await persona_library_service.sample_persona(
+            db, task.company_id, task.job_role_id, task.category
         )
 
-        # AI 첫 질문 생성
-        first_question = await ai_service.generate_first_question(
-            company_name=company_name,
-            job_role_name=job_role_name,
-            task_title=task.title,
-            task_description=task.description,
-            submission_content=body.content,
-            persona_name=persona["persona_name"],
-            persona_department=persona["persona_department"],
-        )
+        try:
+            if ready_persona is not None:
+                # 페르소나가 이미 있음 → 첫 질문만 생성
+                persona = ready_persona
+                first_question = await ai_service.generate_first_question(
+                    company_name=company_name,
+                    job_role_name=job_role_name,
+                    task_title=task.title,
+                    task_description=task.description,
+                    submission_content=body.content,
+                    persona_name=persona.persona_name,
+                    persona_department=persona.persona_department,
+                )
+            elif get_settings().ai_combined_persona_question:
+                # AI 페르소나 + 첫 질문을 한 번에 생성
+                persona = await ai_service.generate_persona_with_first_question(
+                    company_name=company_name,
+                    job_role_name=job_role_name,
+                    task_title=task.title,
+                    task_description=task.description,
+                    submission_content=body.content,
+                )
+                first_question = persona.first_question
+            else:
+                # AI 페르소나 생성
+                persona = await ai_service.generate_persona(
+                    company_name=company_name,
+                    job_role_name=job_role_name,
+                    task_title=task.title,
+                )
+
+                # AI 첫 질문 생성
+                first_question = await ai_service.generate_first_question(
+                    company_name=company_name,
+                    job_role_name=job_role_name,
+                    task_title=task.title,
+                    task_description=task.description,
+                    submission_content=body.content,
+                    persona_name=persona.persona_name,
+                    persona_department=persona.persona_department,
+                )
+        except AiUnavailableError:
+            # LLM 장애로 서킷이 열려 있으면 기본 면접관과 준비된 첫 질문으로 진행
+            persona = question_bank.default_persona(task.category)
+            first_question = persona.first_question
+        except Exception:
+            # 첫 질문 없이 끝나면(연결 끊김, 대기열 초과/deadline, 응답 검증 실패 등)
+            # 스레드 없이 제출 상태로 남지 않도록 draft로 되돌린다 (내용은 보존되어 다시 제출하면 이어서 진행)
+            await db.rollback()
+            await submission_service.revert_to_draft(db, submission)
+            raise
+        else:
+            if ready_persona is None:
+                # 즉석 생성한 페르소나는 라이브러리에 더해 같은 조합의 다음 제출부터 재사용 (스레드 생성 시 함께 커밋)
+                persona_library_service.add_personas(
+                    db,
+                    task.company_id,
+                    task.job_role_id,
+                    task.category,
+                    [persona],
+                    source="live",
+                )
 
         # 스레드 + 첫 메시지 생성
         thread, message = await thread_service.create_thread_with_first_message(
             db,
             submission_id=submission.id,
             user_id=user_id,
-            persona_name=persona["persona_name"],
-            persona_department=persona["persona_department"],
-            topic_tag=persona["topic_tag"],
-            total_questions=persona["total_questions"],
+            persona_name=persona.persona_name,
+            persona_department=persona.persona_department,
+            topic_tag=persona.topic_tag,
+            total_questions=persona.total_questions,
             first_message_content=first_question,
         )
+        # 첫 후속 질문이 캐시 생성을 기다리지 않도록 답변을 쓰는 동안 스레드 캐시를 만든다
+        ai_service.prepare_context_cache(
+            thread.id,
+            company_name=company_name,
+            job_role_name=job_role_name,
+            task_title=task.title,
+            task_description=task.description,
+            key_points=task.key_points,
+            submission_content=body.content,
+        )
 
         thread_brief = ThreadBrief.model_validate(thread).model_dump()
         first_message = MessageResponse.model_validate(message).model_dump()
@@ -154,6 +232,8 @@ async def update_submission(
         is_draft=body.is_draft,
         time_spent_seconds=body.time_spent_seconds,
     )
+    if updated.is_draft:
+        persona_prefetch_service.schedule(updated)
     return success_response(SubmissionResponse.model_validate(updated).model_dump())
 
 
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.auth import get_current_user_id
-from src.core.database import get_db
+from src.core.config import get_settings
+from src.core.database import get_db, get_read_db
 from src.core.response import ApiResponse, success_response
 from src.models.schemas.company import CompanyBrief
 from src.models.schemas.job_role import JobRoleBrief
@@ -13,7 +14,13 @@ from src.models.schemas.task import (
     TaskListItem,
     TaskListResponse,
 )
-from src.services import ai_service, company_service, submission_service, task_service
+from src.services import (
+    ai_service,
+    company_service,
+    submission_service,
+    task_pool_service,
+    task_service,
+)
 
 router = APIRouter(prefix="/tasks", tags=["과제"])
 
@@ -43,26 +50,31 @@ async def generate_tasks(
             detail={"code": "JOB_ROLE_NOT_FOUND", "message": "직무를 찾을 수 없습니다"},
         )
 
-    # AI로 과제 생성
-    generated = await ai_service.generate_tasks(
-        company_name=company.name,
-        job_role_name=job_role.name,
-        count=body.count,
-    )
+    settings = get_settings()
+    if settings.task_pool_enabled:
+        # 사전 생성 풀에서 먼저 꺼내고, 부족분만 즉시 생성
+        generated = task_pool_service.take_tasks(body.company_id, body.job_role_id, body.count)
+        if len(generated) < body.count:
+            generated += await ai_service.generate_tasks(
+                company_name=company.name,
+                job_role_name=job_role.name,
+                count=body.count - len(generated),
+            )
+        task_pool_service.ensure_refill(body.company_id, body.job_role_id, company.name, job_role.name)
+    else:
+        # AI로 과제 생성
+        generated = await ai_service.generate_tasks(
+            company_name=company.name,
+            job_role_name=job_role.name,
+            count=body.count,
+        )
 
     # DB에 저장
     tasks_data = [
         {
             "company_id": body.company_id,
             "job_role_id": body.job_role_id,
-            "title": t["title"],
-            "description": t["description"],
-            "category": t["category"],
-            "difficulty": t["difficulty"],
-            "estimated_minutes": t["estimated_minutes"],
-            "answer_type": t.get("answer_type", "text"),
-            "key_points": t.get("key_points"),
-            "tech_stack": t.get("tech_stack"),
+            **t.model_dump(),
         }
         for t in generated
     ]
@@ -93,7 +105,7 @@ async def get_tasks(
     category: str | None = Query(None),
     difficulty: str | None = Query(None),
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """과제 목록을 조회한다."""
     items, total = await task_service.get_tasks(
@@ -1,8 +1,17 @@
+import asyncio
+import contextvars
+import json
+import logging
+import time
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core import metrics
 from src.core.auth import get_current_user_id
-from src.core.database import get_db
+from src.core.database import get_db, get_read_db, open_session
+from src.core.request_context import ClientDisconnectedError
 from src.core.response import ApiResponse, success_response
 from src.models.schemas.message import (
     ChatResponse,
@@ -13,6 +22,7 @@ from src.models.schemas.message import (
 )
 from src.models.schemas.thread import (
     EvaluationInThread,
+    EvaluationStatusResponse,
     SubmissionInThread,
     ThreadDetailResponse,
     ThreadListItem,
@@ -21,21 +31,35 @@ from src.models.schemas.thread import (
 from src.services import (
     ai_service,
     company_service,
+    evaluation_job_service,
     evaluation_service,
+    history_service,
+    question_bank,
     submission_service,
     task_service,
     thread_service,
 )
+from src.services.ai_resilience import AiUnavailableError
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/threads", tags=["질의응답"])
 
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+_ttft_seconds = metrics.histogram(
+    "sse_time_to_first_token_seconds",
+    "요청 수신부터 첫 AI 토큰 전송까지 걸린 시간",
+    ("endpoint",),
+)
+
 
 @router.get("", response_model=ApiResponse[ThreadListResponse])
 async def get_threads(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """질의응답 스레드 목록을 조회한다."""
     items, total = await thread_service.get_threads(db, user_id, page=page, page_size=page_size)
@@ -136,14 +160,86 @@ async def get_thread_detail(
     return success_response(response.model_dump())
 
 
-@router.post("/{thread_id}/messages", response_model=ApiResponse[ChatResponse])
-async def add_message(
+@router.get("/{thread_id}/evaluation-status", response_model=ApiResponse[EvaluationStatusResponse])
+async def get_evaluation_status(
     thread_id: int,
-    body: MessageCreateRequest,
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    """스레드에 메시지를 추가하고 AI 응답을 받는다."""
+    """스레드의 채점 진행 상태를 조회한다. 완료되면 채점 결과를 함께 반환한다.
+
+    재시도를 모두 실패하면 thread_status가 evaluation_failed가 되고, POST /evaluation/retry로 다시 요청할 수 있다.
+    """
+    thread = await thread_service.get_thread_detail(db, thread_id)
+    if not thread:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "THREAD_NOT_FOUND", "message": "스레드를 찾을 수 없습니다"},
+        )
+    if thread.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "FORBIDDEN", "message": "권한이 없습니다"},
+        )
+
+    job = await evaluation_job_service.get_job_by_thread_id(db, thread_id)
+    evaluation = None
+    if thread.status == "completed":
+        evaluation = await evaluation_service.get_evaluation_by_submission_id(db, thread.submission_id)
+
+    response = EvaluationStatusResponse(
+        thread_id=thread.id,
+        thread_status=thread.status,
+        job_status=job.status if job else None,
+        attempts=job.attempts if job else 0,
+        evaluation=EvaluationInline(
+            id=evaluation.id,
+            total_score=evaluation.total_score,
+            score_label=evaluation.score_label,
+            scores_detail=evaluation.scores_detail,
+            ai_summary=evaluation.ai_summary,
+            analysis_points=evaluation.analysis_points,
+        ) if evaluation else None,
+    )
+    return success_response(response.model_dump())
+
+
+@router.post("/{thread_id}/evaluation/retry", response_model=ApiResponse[EvaluationStatusResponse])
+async def retry_evaluation(
+    thread_id: int,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """채점에 최종 실패한 스레드의 채점을 다시 요청한다."""
+    thread = await thread_service.get_thread_detail(db, thread_id)
+    if not thread:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "THREAD_NOT_FOUND", "message": "스레드를 찾을 수 없습니다"},
+        )
+    if thread.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "FORBIDDEN", "message": "권한이 없습니다"},
+        )
+    if thread.status != "evaluation_failed":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "EVALUATION_NOT_FAILED", "message": "채점에 실패한 스레드가 아닙니다"},
+        )
+
+    job = await evaluation_job_service.retry_job(db, thread)
+    response = EvaluationStatusResponse(
+        thread_id=thread.id,
+        thread_status=thread.status,
+        job_status=job.status,
+        attempts=job.attempts,
+    )
+    return success_response(response.model_dump())
+
+
+async def _get_open_thread(db: AsyncSession, thread_id: int, user_id: int):
+    """메시지를 받을 수 있는 본인 스레드를 조회한다."""
     thread = await thread_service.get_thread_detail(db, thread_id)
     if not thread:
         raise HTTPException(
@@ -160,6 +256,30 @@ async def add_message(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"code": "THREAD_COMPLETED", "message": "이미 완료된 스레드입니다"},
         )
+    if thread.status == "evaluating":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "THREAD_EVALUATING", "message": "채점이 진행 중인 스레드입니다"},
+        )
+    if thread.status == "evaluation_failed":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "THREAD_EVALUATION_FAILED", "message": "채점에 실패했습니다. 다시 요청해주세요"},
+        )
+    return thread
+
+
+@router.post("/{thread_id}/messages", response_model=ApiResponse[ChatResponse])
+async def add_message(
+    thread_id: int,
+    body: MessageCreateRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """스레드에 메시지를 추가하고 AI 응답을 받는다."""
+    thread = await _get_open_thread(db, thread_id, user_id)
+    # AI 대기열이 가득 찼으면 메시지를 저장하기 전에 503으로 돌려보낸다
+    ai_service.check_admission()
 
     # 현재 메시지 목록
     messages = await thread_service.get_thread_messages(db, thread_id)
@@ -168,97 +288,55 @@ async def add_message(
     # 유저 메시지 저장
     user_message = await thread_service.add_user_message(db, thread_id, body.content, next_order)
 
-    # 관련 데이터 조회
-    submission = await submission_service.get_submission(db, thread.submission_id)
-    task = await task_service.get_task_detail(db, submission.task_id) if submission else None
-
-    companies = await company_service.search_companies(db)
-    company = next((c for c in companies if c.id == task.company_id), None) if task else None
-    company_name = company.name if company else "알 수 없는 기업"
-
-    from src.services import job_role_service
-
-    roles = await job_role_service.search_job_roles(db)
-    job_role = next((r for r in roles if r.id == task.job_role_id), None) if task else None
-    job_role_name = job_role.name if job_role else "알 수 없는 직무"
-
-    conversation_history = [
-        {"role": m.role, "content": m.content} for m in messages
-    ] + [{"role": "user", "content": body.content}]
-
     ai_message = None
-    evaluation_data = None
 
     is_last_question = thread.asked_count >= thread.total_questions
 
     if is_last_question:
-        # 마지막 질문에 대한 답변 → 채점
-        eval_result = await ai_service.evaluate_submission(
-            company_name=company_name,
-            job_role_name=job_role_name,
-            task_title=task.title if task else "",
-            task_description=task.description if task else "",
-            key_points=task.key_points if task else None,
-            submission_content=submission.content if submission else "",
-            conversation_history=conversation_history,
-        )
-
-        evaluation = await evaluation_service.create_evaluation(
-            db,
-            submission_id=thread.submission_id,
-            thread_id=thread.id,
-            total_score=eval_result["total_score"],
-            score_label=eval_result["score_label"],
-            scores_detail=eval_result["scores_detail"],
-            ai_summary=eval_result["ai_summary"],
-            analysis_points=eval_result["analysis_points"],
-            feedback=eval_result.get("feedback"),
-        )
-
-        # submission 상태 업데이트
-        if submission:
-            submission.status = "evaluated"
-            await db.commit()
-
-        # 역량 업데이트
-        if task:
-            weak_tags = eval_result.get("analysis_points", {}).get("weaknesses", [])
-            await evaluation_service.update_user_competency(
-                db,
-                user_id=user_id,
-                company_id=task.company_id,
-                job_role_id=task.job_role_id,
-                new_score=eval_result["total_score"],
-                weak_tags=weak_tags,
+        # 마지막 질문에 대한 답변 → 채점 작업 등록 (결과는 evaluation-status로 조회)
+        await evaluation_job_service.enqueue_job(db, thread)
+    else:
+        try:
+            # 관련 데이터 조회
+            submission, task, company_name, job_role_name = await thread_service.get_interview_context(db, thread)
+            ai_service.register_context_cache(thread)
+            history_summary, conversation_history = history_service.get_bounded_history(
+                thread, messages + [user_message]
             )
 
-        await thread_service.complete_thread(db, thread)
-
-        evaluation_data = EvaluationInline(
-            id=evaluation.id,
-            total_score=evaluation.total_score,
-            score_label=evaluation.score_label,
-            scores_detail=evaluation.scores_detail,
-            ai_summary=evaluation.ai_summary,
-            analysis_points=evaluation.analysis_points,
-        ).model_dump()
-    else:
-        # 후속 질문 생성
-        follow_up = await ai_service.generate_follow_up(
-            company_name=company_name,
-            job_role_name=job_role_name,
-            task_title=task.title if task else "",
-            task_description=task.description if task else "",
-            submission_content=submission.content if submission else "",
-            persona_name=thread.persona_name,
-            persona_department=thread.persona_department,
-            conversation_history=conversation_history,
-            question_number=thread.asked_count + 1,
-            total_questions=thread.total_questions,
-        )
+            # 후속 질문 생성
+            try:
+                follow_up = await ai_service.generate_follow_up(
+                    company_name=company_name,
+                    job_role_name=job_role_name,
+                    task_title=task.title if task else "",
+                    task_description=task.description if task else "",
+                    submission_content=submission.content if submission else "",
+                    persona_name=thread.persona_name,
+                    persona_department=thread.persona_department,
+                    conversation_history=conversation_history,
+                    question_number=thread.asked_count + 1,
+                    total_questions=thread.total_questions,
+                    key_points=task.key_points if task else None,
+                    thread_id=thread.id,
+                    history_summary=history_summary,
+                )
+            except AiUnavailableError:
+                # LLM 장애로 서킷이 열려 있으면 준비된 질문으로 즉시 진행
+                follow_up = question_bank.pick_question(
+                    task.category if task else None, thread.topic_tag, thread.asked_count + 1
+                )
+        except Exception:
+            # 후속 질문 없이 턴이 끝나면(연결 끊김, 대기열 초과/deadline, 조회 실패 등)
+            # 유저 메시지를 지워 같은 답변을 다시 보낼 수 있게 한다
+            await db.rollback()
+            await thread_service.delete_message(db, user_message.id)
+            raise
 
         ai_message = await thread_service.add_ai_message(db, thread_id, follow_up, next_order + 1)
         await thread_service.increment_asked_count(db, thread)
+        # 창 밖으로 밀려난 메시지 요약은 응답 뒤에 갱신해 다음 턴이 쓴다
+        history_service.schedule_refresh(thread_id)
 
     response = ChatResponse(
         user_message=MessageResponse.model_validate(user_message),
@@ -268,6 +346,149 @@ async def add_message(
             asked_count=thread.asked_count,
             total_questions=thread.total_questions,
         ),
-        evaluation=EvaluationInline(**evaluation_data) if evaluation_data else None,
     )
     return success_response(response.model_dump())
+
+
+async def _discard_user_message(message_id: int):
+    """후속 질문 없이 끝난 스트리밍 턴의 유저 메시지를 지운다 (요청 세션과 분리된 세션 사용)."""
+    async with open_session() as session:
+        await thread_service.delete_message(session, message_id)
+
+
+_cleanup_tasks: set[asyncio.Task] = set()
+
+
+def _schedule_discard_user_message(message_id: int):
+    task = asyncio.create_task(_discard_user_message(message_id), context=contextvars.Context())
+    _cleanup_tasks.add(task)
+    task.add_done_callback(_cleanup_tasks.discard)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.post("/{thread_id}/messages/stream", response_class=StreamingResponse)
+async def add_message_stream(
+    thread_id: int,
+    body: MessageCreateRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """메시지를 추가하고 AI 후속 질문을 Server-Sent Events로 스트리밍한다.
+
+    이벤트 순서: user_message → token(반복) → done. 마지막 답변이면 token 없이 채점 작업만 등록된다.
+    """
+    started = time.perf_counter()
+    thread = await _get_open_thread(db, thread_id, user_id)
+    ai_service.check_admission()
+
+    messages = await thread_service.get_thread_messages(db, thread_id)
+    next_order = len(messages) + 1
+    user_message = await thread_service.add_user_message(db, thread_id, body.content, next_order)
+
+    user_message_data = MessageResponse.model_validate(user_message).model_dump(mode="json")
+    is_last_question = thread.asked_count >= thread.total_questions
+
+    if is_last_question:
+        await evaluation_job_service.enqueue_job(db, thread)
+        thread_data = ThreadStatus(
+            status=thread.status,
+            asked_count=thread.asked_count,
+            total_questions=thread.total_questions,
+        ).model_dump()
+
+        async def evaluating_events():
+            yield _sse("user_message", user_message_data)
+            yield _sse("done", {"ai_message": None, "thread": thread_data})
+
+        return StreamingResponse(evaluating_events(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+    try:
+        submission, task, company_name, job_role_name = await thread_service.get_interview_context(db, thread)
+        ai_service.register_context_cache(thread)
+        history_summary, conversation_history = history_service.get_bounded_history(thread, messages + [user_message])
+    except Exception:
+        # 스트림을 시작하기 전에 끝나면(연결 끊김, 조회 실패 등)
+        # 유저 메시지를 지워 같은 답변을 다시 보낼 수 있게 한다
+        await db.rollback()
+        await thread_service.delete_message(db, user_message.id)
+        raise
+    follow_up_kwargs = dict(
+        company_name=company_name,
+        job_role_name=job_role_name,
+        task_title=task.title if task else "",
+        task_description=task.description if task else "",
+        submission_content=submission.content if submission else "",
+        persona_name=thread.persona_name,
+        persona_department=thread.persona_department,
+        conversation_history=conversation_history,
+        question_number=thread.asked_count + 1,
+        total_questions=thread.total_questions,
+        key_points=task.key_points if task else None,
+        thread_id=thread.id,
+        history_summary=history_summary,
+    )
+
+    async def follow_up_events():
+        yield _sse("user_message", user_message_data)
+
+        chunks: list[str] = []
+        ttft = None
+        try:
+            async for text in ai_service.stream_follow_up(**follow_up_kwargs):
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                    _ttft_seconds.observe(ttft, endpoint="thread_message_stream")
+                chunks.append(text)
+                yield _sse("token", {"text": text})
+        except AiUnavailableError:
+            # 서킷이 열려 있으면 토큰이 나가기 전에 거절되므로 준비된 질문을 한 번에 보낸다
+            text = question_bank.pick_question(
+                task.category if task else None, thread.topic_tag, thread.asked_count + 1
+            )
+            chunks = [text]
+            yield _sse("token", {"text": text})
+        except ClientDisconnectedError:
+            await _discard_user_message(user_message.id)
+            return
+        except Exception:
+            logger.exception("후속 질문 스트리밍 실패 thread_id=%s", thread_id)
+            await _discard_user_message(user_message.id)
+            yield _sse("error", {"code": "AI_STREAM_FAILED", "message": "AI 응답 생성에 실패했습니다"})
+            return
+        except (asyncio.CancelledError, GeneratorExit):
+            # 서버가 스트림을 끊음 (연결 끊김). 이 태스크에서는 더 기다릴 수 없으므로 정리를 따로 띄운다
+            _schedule_discard_user_message(user_message.id)
+            raise
+
+        # 스트림이 끝난 뒤 완성된 질문을 저장 (요청 세션과 분리된 세션 사용)
+        async with open_session() as session:
+            stream_thread = await thread_service.get_thread_detail(session, thread_id)
+            ai_message = await thread_service.add_ai_message(session, thread_id, "".join(chunks), next_order + 1)
+            await thread_service.increment_asked_count(session, stream_thread)
+        history_service.schedule_refresh(thread_id)
+
+        total = time.perf_counter() - started
+        logger.info(
+            "thread_message_stream thread_id=%s ttft_ms=%.1f total_ms=%.1f",
+            thread_id,
+            (ttft or total) * 1000,
+            total * 1000,
+        )
+        yield _sse(
+            "done",
+            {
+                "ai_message": MessageResponse.model_validate(ai_message).model_dump(mode="json"),
+                "thread": ThreadStatus(
+                    status=stream_thread.status,
+                    asked_count=stream_thread.asked_count,
+                    total_questions=stream_thread.total_questions,
+                ).model_dump(),
+                "ttft_ms": round((ttft or total) * 1000, 1),
+                "total_ms": round(total * 1000, 1),
+            },
+        )
+
+    return StreamingResponse(follow_up_events(), media_type="text/event-stream", headers=_SSE_HEADERS)
@@ -0,0 +1,249 @@
+"""Gemini 호출 동시성/토큰 제한기.
+
+동시에 진행 중인 호출 수와 분당 토큰 수를 함께 제한한다. 여유가 없으면 호출을 우선순위 클래스별 FIFO 큐에 넣고
+deadline까지 기다리며, 큐가 가득 찼거나 deadline을 넘기면 AiOverloadedError를 던진다.
+main.py의 예외 핸들러가 이를 Retry-After 헤더가 있는 429/503 응답으로 바꾼다.
+
+슬롯이 나면 interactive 큐를 먼저 처리한다. batch는 동시 호출 수 상한(batch_max_concurrency)으로
+interactive 몫을 남겨두고, 큐에서 batch_max_wait를 넘긴 batch 호출은 interactive보다 먼저 받아 굶지 않게 한다.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from src.core import metrics
+
+
+class AiOverloadedError(Exception):
+    """AI 호출 용량 초과. reason: queue_full, timeout, upstream_quota, deadline"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"AI 호출 용량 초과 ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+# 우선순위 클래스. interactive: 사용자가 응답을 기다리는 질의응답 호출, batch: 과제 생성/채점 등 일괄 작업
+PRIORITIES = ("interactive", "batch")
+
+
+@dataclass
+class _Waiter:
+    tokens: int
+    priority: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+# 한국어 위주 프롬프트 기준 2자당 1토큰으로 잡는다
+CHARS_PER_TOKEN = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class AiLimiter:
+    def __init__(
+        self,
+        max_concurrency: int,
+        tokens_per_minute: int,
+        max_queue: int,
+        queue_timeout: float,
+        batch_max_concurrency: int | None = None,
+        batch_max_wait: float = 5.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.batch_max_concurrency = min(batch_max_concurrency or max_concurrency, max_concurrency)
+        self.batch_max_wait = batch_max_wait
+
+        self._in_flight = 0
+        self._in_flight_by: dict[str, int] = dict.fromkeys(PRIORITIES, 0)
+        self._tokens = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._queues: dict[str, deque[_Waiter]] = {priority: deque() for priority in PRIORITIES}
+        self._timer: asyncio.TimerHandle | None = None
+        # 최근 호출 시간의 지수 이동 평균 (Retry-After 추정용)
+        self._avg_duration = 2.0
+
+        _queue_depth.set_function(lambda: {(p,): float(len(q)) for p, q in self._queues.items()})
+        _in_flight.set_function(lambda: {(p,): float(n) for p, n in self._in_flight_by.items()})
+
+    # ── 토큰 버킷 ──
+
+    def _refill(self):
+        if self.tokens_per_minute <= 0:
+            return
+        now = time.monotonic()
+        rate = self.tokens_per_minute / 60
+        self._tokens = min(self.tokens_per_minute, self._tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+
+    def _seconds_until_tokens(self, tokens: int) -> float:
+        if self.tokens_per_minute <= 0:
+            return 0.0
+        needed = min(tokens, self.tokens_per_minute) - self._tokens
+        return max(0.0, needed / (self.tokens_per_minute / 60))
+
+    def _has_slot(self, priority: str) -> bool:
+        if self._in_flight >= self.max_concurrency:
+            return False
+        return priority != "batch" or self._in_flight_by["batch"] < self.batch_max_concurrency
+
+    def _can_grant(self, tokens: int, priority: str) -> bool:
+        if not self._has_slot(priority):
+            return False
+        if self.tokens_per_minute <= 0:
+            return True
+        # 버킷 용량보다 큰 요청도 버킷이 가득 차면 통과시킨다
+        return self._tokens >= min(tokens, self.tokens_per_minute)
+
+    def _grant(self, tokens: int, priority: str):
+        self._in_flight += 1
+        self._in_flight_by[priority] += 1
+        if self.tokens_per_minute > 0:
+            self._tokens -= tokens
+
+    # ── 대기열 ──
+
+    def _head(self, priority: str) -> _Waiter | None:
+        queue = self._queues[priority]
+        while queue and queue[0].future.done():
+            queue.popleft()
+        return queue[0] if queue else None
+
+    def _aged(self, waiter: _Waiter) -> bool:
+        return time.monotonic() - waiter.enqueued_at >= self.batch_max_wait
+
+    def _next_waiter(self) -> _Waiter | None:
+        """다음에 슬롯을 받을 대기자. interactive 우선, 오래 기다린 batch는 먼저."""
+        interactive = self._head("interactive")
+        batch = self._head("batch")
+        if batch is not None and not self._has_slot("batch"):
+            batch = None
+        if batch is not None and (interactive is None or self._aged(batch)):
+            return batch
+        return interactive
+
+    def _dispatch(self):
+        self._refill()
+        while (waiter := self._next_waiter()) is not None:
+            if not self._can_grant(waiter.tokens, waiter.priority):
+                break
+            if waiter.priority == "batch" and self._head("interactive") is not None:
+                _aged_grants_total.inc()
+            self._queues[waiter.priority].popleft()
+            self._grant(waiter.tokens, waiter.priority)
+            waiter.future.set_result(None)
+
+        # 토큰이 부족해 막힌 경우 보충 시점에 다시 깨운다
+        if waiter is not None and self._timer is None and self._in_flight < self.max_concurrency:
+            delay = self._seconds_until_tokens(waiter.tokens)
+            self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _ahead(self, priority: str) -> list[_Waiter]:
+        """priority로 지금 줄을 서면 앞에 있게 되는 대기자."""
+        if priority == "interactive":
+            return list(self._queues["interactive"])
+        return [*self._queues["interactive"], *self._queues["batch"]]
+
+    def retry_after(self, priority: str = "interactive") -> float:
+        """지금 대기열 뒤에 섰을 때 예상 대기 시간(초)."""
+        self._refill()
+        ahead = self._ahead(priority)
+        concurrency = self.max_concurrency if priority == "interactive" else self.batch_max_concurrency
+        by_concurrency = (len(ahead) + 1) / max(1, concurrency) * self._avg_duration
+        by_tokens = self._seconds_until_tokens(sum(w.tokens for w in ahead) + 1)
+        return max(1.0, math.ceil(max(by_concurrency, by_tokens)))
+
+    def check_admission(self, priority: str = "interactive"):
+        """클래스별 대기열이 가득 찼으면 즉시 거절한다. DB 쓰기 전에 호출해 중간 실패를 피한다."""
+        if len(self._queues[priority]) >= self.max_queue:
+            _rejections_total.inc(reason="queue_full", priority=priority)
+            raise AiOverloadedError("queue_full", self.retry_after(priority))
+
+    def _can_skip_queue(self, tokens: int, priority: str) -> bool:
+        if not self._can_grant(tokens, priority):
+            return False
+        waiter = self._next_waiter()
+        # 기다리는 batch보다는 interactive가 먼저다 (나이 제한을 넘긴 batch는 제외)
+        return waiter is None or (priority == "interactive" and waiter.priority == "batch" and not self._aged(waiter))
+
+    async def acquire(self, tokens: int, priority: str = "interactive"):
+        self._refill()
+        if self._can_skip_queue(tokens, priority):
+            self._grant(tokens, priority)
+            _wait_seconds.observe(0.0, priority=priority)
+            return
+
+        self.check_admission(priority)
+        waiter = _Waiter(tokens=tokens, priority=priority, future=asyncio.get_running_loop().create_future())
+        self._queues[priority].append(waiter)
+        self._dispatch()
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter.future
+        except (TimeoutError, asyncio.CancelledError) as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 허가와 취소가 겹친 경우 받은 슬롯과 예약 토큰을 모두 돌려준다 (호출하지 않았으므로 사용량 0)
+                self.release(tokens, 0, 0.0, priority)
+            else:
+                # 큐에 남겨 두면 머리에 닿을 때까지 max_queue, 대기열 지표, hedge 판단에 계속 잡힌다
+                waiter.future.cancel()
+                self._queues[priority].remove(waiter)
+                # 토큰 부족으로 막힌 머리가 빠졌으면 다음 대기자가 받을 수 있다
+                self._dispatch()
+            if isinstance(e, TimeoutError):
+                _rejections_total.inc(reason="timeout", priority=priority)
+                raise AiOverloadedError("timeout", self.retry_after(priority)) from e
+            raise
+        finally:
+            _wait_seconds.observe(time.monotonic() - waiter.enqueued_at, priority=priority)
+
+    def release(self, reserved_tokens: int, used_tokens: int | None, duration: float, priority: str = "interactive"):
+        """슬롯을 반납하고 예약 토큰과 실제 사용량의 차이를 정산한다."""
+        self._in_flight -= 1
+        self._in_flight_by[priority] -= 1
+        if self.tokens_per_minute > 0 and used_tokens is not None:
+            self._tokens -= used_tokens - reserved_tokens
+        if duration > 0:
+            self._avg_duration = self._avg_duration * 0.9 + duration * 0.1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, tokens: int, priority: str = "interactive"):
+        """호출 1회 동안 슬롯을 점유한다. yield된 dict에 used_tokens를 넣으면 정산에 반영된다."""
+        await self.acquire(tokens, priority)
+        usage = {"used_tokens": None}
+        started = time.monotonic()
+        try:
+            yield usage
+        finally:
+            self.release(tokens, usage["used_tokens"], time.monotonic() - started, priority)
+
+
+_queue_depth = metrics.gauge("ai_limiter_queue_depth", "우선순위 클래스별 Gemini 호출 대기열 길이", ("priority",))
+_in_flight = metrics.gauge("ai_limiter_in_flight", "우선순위 클래스별 진행 중인 Gemini 호출 수", ("priority",))
+_wait_seconds = metrics.histogram(
+    "ai_limiter_wait_seconds", "우선순위 클래스별 Gemini 호출 슬롯을 얻기까지 대기 시간", ("priority",)
+)
+_rejections_total = metrics.counter("ai_limiter_rejections_total", "용량 초과로 거절된 호출 수", ("reason", "priority"))
+_aged_grants_total = metrics.counter(
+    "ai_limiter_aged_grants_total", "batch_max_wait를 넘겨 interactive보다 먼저 슬롯을 받은 batch 호출 수"
+)
@@ -0,0 +1,206 @@
+"""LLM 호출의 꼬리 지연/장애 보호.
+
+- LatencyTracker: 함수별 최근 성공 호출 시간을 보관하고 hedge 시점(백분위)을 계산
+- hedged: 첫 시도가 hedge 시점까지 끝나지 않으면 같은 요청을 한 번 더 보내고 먼저 끝난 쪽을 쓴다
+- is_retryable: 재시도해도 되는 오류(서버 5xx, 쿼터 초과, 네트워크 오류)인지 판별
+- CircuitBreaker: 최근 호출의 실패/지연 비율이 임계치를 넘으면 호출을 즉시 거절하고, 일정 시간 후 probe로 복구를 확인
+"""
+
+import asyncio
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from contextlib import contextmanager
+from typing import TypeVar
+
+import httpx
+from google import genai
+
+from src.core import metrics
+from src.services.ai_limiter import AiOverloadedError
+
+T = TypeVar("T")
+
+_hedges_total = metrics.counter("ai_hedges_total", "hedge 요청을 추가로 보낸 호출 수", ("function",))
+_hedge_wins_total = metrics.counter(
+    "ai_hedge_wins_total",
+    "hedge가 발생한 호출에서 먼저 끝난 쪽 (primary 또는 hedge)",
+    ("function", "winner"),
+)
+
+
+class LatencyTracker:
+    """함수별 최근 호출 시간의 롤링 윈도우."""
+
+    def __init__(self, window: int = 200):
+        self._samples: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=window))
+
+    def observe(self, function: str, seconds: float):
+        self._samples[function].append(seconds)
+
+    def reset(self, function: str):
+        self._samples.pop(function, None)
+
+    def percentile(self, function: str, q: float, min_samples: int) -> float | None:
+        """샘플이 min_samples 미만이면 None."""
+        samples = self._samples.get(function)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def is_retryable(e: BaseException) -> bool:
+    if isinstance(e, genai.errors.ServerError | httpx.TransportError):
+        return True
+    # 우리 쪽 대기열 포화/대기 시간 초과는 재시도해도 나아지지 않는다
+    return isinstance(e, AiOverloadedError) and e.reason == "upstream_quota"
+
+
+async def hedged(function: str, call: Callable[[], Awaitable[T]], delay: float | None) -> T:
+    """delay초 안에 첫 시도가 끝나지 않으면 두 번째 시도를 보낸다. 진 쪽은 취소한다.
+
+    delay가 None이면 hedge 없이 한 번만 호출한다. 한쪽이 실패하면 남은 쪽의 결과를 기다린다.
+    """
+    if delay is None:
+        return await call()
+
+    primary = asyncio.create_task(call())
+    hedge = None
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        _hedges_total.inc(function=function)
+        hedge = asyncio.create_task(call())
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    _hedge_wins_total.inc(function=function, winner="primary" if task is primary else "hedge")
+                    return task.result()
+        # 둘 다 실패하면 첫 시도의 오류를 올린다
+        raise primary.exception()
+    finally:
+        for task in (primary, hedge):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+class AiUnavailableError(AiOverloadedError):
+    """서킷이 열려 있어 LLM을 호출하지 않음. 호출 측은 대체 응답을 쓰거나 작업을 미룬다."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("circuit_open", retry_after)
+
+
+_CIRCUIT_STATE_VALUES = {"closed": 0.0, "half_open": 1.0, "open": 2.0}
+
+_circuit_state = metrics.gauge("ai_circuit_state", "LLM 서킷 상태 (0: closed, 1: half_open, 2: open)")
+_circuit_transitions_total = metrics.counter("ai_circuit_transitions_total", "LLM 서킷 상태 전이 수", ("state",))
+_circuit_rejections_total = metrics.counter(
+    "ai_circuit_rejections_total", "서킷이 열려 있어 거절한 호출 수", ("function",)
+)
+
+
+class CircuitBreaker:
+    """최근 window개 호출 중 실패(재시도 가능한 오류 또는 호출별 slow_call_seconds 초과) 비율로 여닫는다.
+
+    closed -> (실패율 >= failure_rate) -> open -> (open_seconds 경과) -> half_open
+    half_open에서는 probe 호출 하나만 통과시키고, 성공하면 closed, 실패하면 다시 open.
+    """
+
+    def __init__(
+        self,
+        window: int,
+        min_calls: int,
+        failure_rate: float,
+        open_seconds: float,
+    ):
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+
+        self._results: deque[bool] = deque(maxlen=window)  # True: 실패
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        _circuit_state.set_function(lambda: {(): _CIRCUIT_STATE_VALUES[self.state]})
+
+    @property
+    def state(self) -> str:
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition("half_open")
+        return self._state
+
+    def retry_after(self) -> float:
+        return max(1.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def _transition(self, state: str):
+        self._state = state
+        _circuit_transitions_total.inc(state=state)
+        if state == "open":
+            self._opened_at = time.monotonic()
+            self._results.clear()
+        if state != "half_open":
+            self._probe_in_flight = False
+
+    def check(self, function: str):
+        """호출할 수 없는 상태면 AiUnavailableError. probe 자리를 차지하지 않는다."""
+        state = self.state
+        if state == "open" or (state == "half_open" and self._probe_in_flight):
+            _circuit_rejections_total.inc(function=function)
+            raise AiUnavailableError(self.retry_after())
+
+    def before_call(self, function: str) -> bool:
+        """호출 가능하면 probe 여부를 반환하고, 불가능하면 AiUnavailableError."""
+        self.check(function)
+        if self.state == "half_open":
+            self._probe_in_flight = True
+            return True
+        return False
+
+    @contextmanager
+    def guard(self, function: str, slow_call_seconds: float | None):
+        """upstream 호출 1회를 감싸 결과를 기록한다.
+
+        느린 호출 기준은 호출마다 정한다 (티어마다 정상 지연이 다르다). None이면 지연은 실패로 세지 않는다.
+        """
+        probe = self.before_call(function)
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.record(probe, e, time.monotonic() - started, slow_call_seconds)
+            raise
+        except BaseException:
+            self.record_cancelled(probe, time.monotonic() - started, slow_call_seconds)
+            raise
+        self.record(probe, None, time.monotonic() - started, slow_call_seconds)
+
+    def record(
+        self, probe: bool, error: BaseException | None, duration: float, slow_call_seconds: float | None
+    ):
+        slow = slow_call_seconds is not None and duration >= slow_call_seconds
+        failed = (error is not None and is_retryable(error)) or slow
+        if probe:
+            self._transition("open" if failed else "closed")
+            return
+        if self._state != "closed":
+            return
+        self._results.append(failed)
+        if len(self._results) >= self.min_calls and sum(self._results) / len(self._results) >= self.failure_rate:
+            self._transition("open")
+
+    def record_cancelled(self, probe: bool, duration: float, slow_call_seconds: float | None):
+        """결과 없이 취소된 호출 (hedge에서 진 쪽, deadline 초과 등).
+
+        이미 slow_call_seconds를 넘긴 호출은 실패로 센다. 그 전에 취소된 probe는 다음 호출이 다시 probe가 된다.
+        """
+        if slow_call_seconds is not None and duration >= slow_call_seconds:
+            self.record(probe, None, duration, slow_call_seconds)
+        elif probe:
+            self._probe_in_flight = False
@@ -0,0 +1,82 @@
+"""호출 종류별 모델 라우팅.
+
+Settings의 라우팅 테이블로 호출 함수 -> 티어(fast/standard/strong) -> 모델을 정한다.
+fast 티어의 최근 지연이 SLO를 넘으면 일정 시간 동안 fast 호출을 대체 티어로 보낸 뒤 다시 확인한다.
+"""
+
+import time
+from dataclasses import dataclass
+
+from src.core import metrics
+from src.services.ai_resilience import LatencyTracker
+
+_route_calls_total = metrics.counter(
+    "ai_route_calls_total",
+    "호출 함수별로 실제 응답한 티어/모델",
+    ("function", "tier", "model"),
+)
+_tier_downgrades_total = metrics.counter(
+    "ai_tier_downgrades_total",
+    "지연 SLO 위반으로 티어를 낮춘 횟수",
+    ("tier",),
+)
+_tier_degraded = metrics.gauge("ai_tier_degraded", "지연 SLO 위반으로 대체 티어를 쓰는 중이면 1", ("tier",))
+
+
+@dataclass(frozen=True)
+class Route:
+    tier: str
+    model: str
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        tiers: dict[str, str],
+        routes: dict[str, str],
+        default_tier: str,
+        slo_tier: str,
+        slo_seconds: float,
+        slo_percentile: float,
+        slo_min_samples: int,
+        fallback_tier: str,
+        recheck_seconds: float,
+    ):
+        self.tiers = tiers
+        self.routes = routes
+        self.default_tier = default_tier
+        self.slo_tier = slo_tier
+        self.slo_seconds = slo_seconds
+        self.slo_percentile = slo_percentile
+        self.slo_min_samples = slo_min_samples
+        self.fallback_tier = fallback_tier
+        self.recheck_seconds = recheck_seconds
+
+        self._latency = LatencyTracker(window=max(50, slo_min_samples * 2))
+        self._degraded_until = 0.0
+
+        _tier_degraded.set_function(lambda: {(self.slo_tier,): 1.0 if self.degraded else 0.0})
+
+    @property
+    def degraded(self) -> bool:
+        return time.monotonic() < self._degraded_until
+
+    def route(self, function: str) -> Route:
+        # 스키마 재요청은 원래 호출과 같은 티어를 쓴다
+        tier = self.routes.get(function.removesuffix("_repair"), self.default_tier)
+        if tier == self.slo_tier and self.degraded:
+            tier = self.fallback_tier
+        return Route(tier=tier, model=self.tiers[tier])
+
+    def observe(self, function: str, route: Route, seconds: float):
+        """성공한 호출의 지연을 기록하고 SLO 위반 여부를 판단한다."""
+        _route_calls_total.inc(function=function, tier=route.tier, model=route.model)
+        if route.tier != self.slo_tier:
+            return
+        self._latency.observe(route.tier, seconds)
+        p = self._latency.percentile(route.tier, self.slo_percentile, self.slo_min_samples)
+        if p is not None and p > self.slo_seconds:
+            _tier_downgrades_total.inc(tier=route.tier)
+            self._degraded_until = time.monotonic() + self.recheck_seconds
+            # 복구 확인은 새 샘플로만 판단한다
+            self._latency.reset(route.tier)
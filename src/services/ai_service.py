@@ -1,89 +1,646 @@
-import json
+import asyncio
+import contextvars
+import logging
+import random
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import TypeVar
 
 from google import genai
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import update
 
+from src.core import metrics
 from src.core.config import get_settings
+from src.core.database import open_session
+from src.core.request_context import (
+    ClientDisconnectedError,
+    LlmCallRecord,
+    RequestStats,
+    current_cancellation,
+    current_stats,
+    detached_context,
+)
+from src.models.database.thread import Thread
+from src.models.schemas.ai import (
+    EvaluationResult,
+    GeneratedPersona,
+    GeneratedPersonaWithQuestion,
+    GeneratedTask,
+)
+from src.services import prompt_builder
+from src.services.ai_limiter import AiLimiter, AiOverloadedError, estimate_tokens
+from src.services.ai_resilience import CircuitBreaker, LatencyTracker, hedged, is_retryable
+from src.services.ai_routing import ModelRouter, Route
+from src.services.llm_backend import FakeBackend, GeminiBackend, LlmBackend, LlmResponse
 
+logger = logging.getLogger(__name__)
 
-def _get_client() -> genai.Client:
+T = TypeVar("T")
+
+_calls_total = metrics.counter(
+    "ai_calls_total",
+    "Gemini 호출 수 (outcome: ok 또는 예외 클래스명)",
+    ("function", "model", "outcome"),
+)
+_call_seconds = metrics.histogram(
+    "ai_call_duration_seconds",
+    "Gemini 호출 전체 소요 시간",
+    ("function", "model"),
+)
+_ttfb_seconds = metrics.histogram(
+    "ai_call_ttfb_seconds",
+    "Gemini 호출의 첫 응답 바이트까지 걸린 시간",
+    ("function", "model"),
+)
+_parse_failures_total = metrics.counter(
+    "ai_parse_failures_total",
+    "Gemini 구조화 응답 스키마 검증 실패 수",
+    ("function",),
+)
+_response_tokens = metrics.histogram(
+    "ai_response_tokens",
+    "호출당 출력 토큰 수",
+    ("function",),
+    buckets=(16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192),
+)
+_prompt_tokens = metrics.histogram(
+    "ai_prompt_tokens",
+    "호출당 입력 토큰 수 (캐시된 토큰 포함)",
+    ("function",),
+    buckets=(256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536),
+)
+_cached_prompt_tokens = metrics.histogram(
+    "ai_cached_prompt_tokens",
+    "호출당 컨텍스트 캐시에서 읽은 입력 토큰 수",
+    ("function",),
+    buckets=(0, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536),
+)
+_retries_total = metrics.counter(
+    "ai_retries_total",
+    "재시도 가능한 오류로 다시 보낸 대화형 호출 수",
+    ("function", "error"),
+)
+_deadline_exceeded_total = metrics.counter(
+    "ai_deadline_exceeded_total",
+    "호출별 deadline을 넘겨 중단된 대화형 호출 수",
+    ("function",),
+)
+
+_cancelled_calls_total = metrics.counter(
+    "ai_cancelled_calls_total",
+    "연결 끊김(disconnect), 요청 deadline 초과(deadline), 서버 측 요청 취소(cancelled)로 중단한 호출 수",
+    ("function", "reason"),
+)
+_context_cache_lookups_total = metrics.counter(
+    "ai_context_cache_lookups_total",
+    "스레드 호출의 컨텍스트 캐시 사용 결과 (hit, miss, other_model: 다른 모델에만 캐시가 있어 못 씀)",
+    ("function", "result"),
+)
+_context_uncached_tokens_total = metrics.counter(
+    "ai_context_uncached_tokens_total",
+    "스레드 호출에서 캐시 없이 다시 보낸 공통 prefix의 추정 토큰 수",
+    ("function", "result"),
+)
+_single_flight_total = metrics.counter(
+    "ai_single_flight_total",
+    "동일 입력 생성 요청의 처리 방식 (leader: 실제 호출, coalesced: 진행 중 호출에 합류, cached: 결과 캐시)",
+    ("function", "result"),
+)
+
+# 함수별 최근 성공 호출 시간 (hedge 시점 계산용)
+_latency = LatencyTracker()
+
+# single-flight: 같은 입력으로 진행 중인 호출과 짧은 TTL 결과 캐시 (키: (함수, 정규화된 입력...))
+_in_flight: dict[tuple, asyncio.Task] = {}
+_result_cache: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+
+# 프로세스 전체에서 공유하는 LLM 백엔드 (lifespan에서 생성/정리)
+_backend: LlmBackend | None = None
+
+
+def init_backend() -> LlmBackend:
+    """Settings.llm_backend에 맞는 공유 백엔드를 생성한다. 앱 시작 시 한 번 호출한다."""
+    global _backend
+    if _backend is None:
+        settings = get_settings()
+        if settings.llm_backend == "fake":
+            _backend = FakeBackend(
+                latency_seconds=settings.fake_llm_latency_seconds,
+                tokens_per_second=settings.fake_llm_tokens_per_second,
+            )
+        else:
+            _backend = GeminiBackend(api_key=settings.gemini_api_key)
+    return _backend
+
+
+async def close_backend():
+    """앱 종료 시 공유 백엔드의 커넥션 풀을 정리한다."""
+    global _backend
+    creations = list(_cache_creations.values())
+    for task in creations:
+        task.cancel()
+    await asyncio.gather(*creations, return_exceptions=True)
+    if _backend is not None:
+        await _backend.aclose()
+        _backend = None
+
+
+def _get_backend() -> LlmBackend:
+    # lifespan 밖(스크립트 등)에서 호출되면 지연 생성
+    return _backend or init_backend()
+
+
+_router: ModelRouter | None = None
+
+
+def get_router() -> ModelRouter:
+    global _router
+    if _router is None:
+        settings = get_settings()
+        _router = ModelRouter(
+            tiers=settings.ai_model_tiers,
+            routes=settings.ai_routes,
+            default_tier=settings.ai_default_tier,
+            slo_tier="fast",
+            slo_seconds=settings.ai_fast_tier_slo_seconds,
+            slo_percentile=settings.ai_fast_tier_slo_percentile,
+            slo_min_samples=settings.ai_fast_tier_slo_min_samples,
+            fallback_tier=settings.ai_fast_tier_fallback,
+            recheck_seconds=settings.ai_fast_tier_recheck_seconds,
+        )
+    return _router
+
+
+# 출력 토큰 상한이 없는 호출의 예약 토큰 수
+_DEFAULT_OUTPUT_TOKENS = 1024
+
+_limiter: AiLimiter | None = None
+
+
+def get_limiter() -> AiLimiter:
+    global _limiter
+    if _limiter is None:
+        settings = get_settings()
+        _limiter = AiLimiter(
+            max_concurrency=settings.ai_max_concurrency,
+            tokens_per_minute=settings.ai_tokens_per_minute,
+            max_queue=settings.ai_queue_max,
+            queue_timeout=settings.ai_queue_timeout_seconds,
+            batch_max_concurrency=settings.ai_batch_max_concurrency,
+            batch_max_wait=settings.ai_batch_max_wait_seconds,
+        )
+    return _limiter
+
+
+# 사용자가 응답을 기다리는 호출. 나머지(과제/페르소나 일괄 생성, 채점)는 batch로 대기열에서 뒤로 밀린다
+_INTERACTIVE_FUNCTIONS = frozenset(
+    {
+        "generate_persona",
+        "generate_first_question",
+        "generate_persona_with_first_question",
+        "generate_follow_up",
+        "stream_follow_up",
+    }
+)
+_priority_override: contextvars.ContextVar[str | None] = contextvars.ContextVar("ai_priority", default=None)
+
+
+@contextmanager
+def batch_priority():
+    """블록 안의 호출을 모두 batch로 처리한다 (백그라운드 사전 생성, 개발용 API 등)."""
+    token = _priority_override.set("batch")
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+def _priority(function: str) -> str:
+    override = _priority_override.get()
+    if override is not None:
+        return override
+    return "interactive" if function.removesuffix("_repair") in _INTERACTIVE_FUNCTIONS else "batch"
+
+
+_breaker: CircuitBreaker | None = None
+
+
+def get_breaker() -> CircuitBreaker:
+    global _breaker
+    if _breaker is None:
+        settings = get_settings()
+        _breaker = CircuitBreaker(
+            window=settings.ai_breaker_window,
+            min_calls=settings.ai_breaker_min_calls,
+            failure_rate=settings.ai_breaker_failure_rate,
+            open_seconds=settings.ai_breaker_open_seconds,
+        )
+    return _breaker
+
+
+def _slow_call_seconds(function: str, route: Route) -> float | None:
+    """서킷이 느린 호출로 셀 기준. batch 호출은 지연을 세지 않는다 (오류는 센다)."""
+    if _priority(function) == "batch":
+        return None
     settings = get_settings()
-    return genai.Client(api_key=settings.gemini_api_key)
+    if route.tier == "strong":
+        return settings.ai_breaker_strong_slow_call_seconds
+    return settings.ai_breaker_slow_call_seconds
+
+
+def is_available() -> bool:
+    """서킷이 열려 있지 않으면 True (half_open 포함)."""
+    return get_breaker().state != "open"
+
+
+def check_admission(priority: str = "interactive"):
+    """AI 호출 대기열이 가득 찼으면 AiOverloadedError. 라우터가 DB 쓰기 전에 호출한다."""
+    get_limiter().check_admission(priority)
+
+
+def _reserve_tokens(function: str, contents, config: genai.types.GenerateContentConfig | None) -> int:
+    output = (config.max_output_tokens if config else None) or _DEFAULT_OUTPUT_TOKENS
+    return prompt_builder.record_prompt_size(function, contents) + output
+
+
+def _translate_quota_error(function: str, e: Exception):
+    """Gemini 쿼터 초과(429)를 서비스 예외로 바꿔 500 대신 429로 응답되게 한다."""
+    if isinstance(e, genai.errors.APIError) and e.code == 429:
+        raise AiOverloadedError("upstream_quota", get_limiter().retry_after(_priority(function))) from e
 
 
-MODEL = "gemini-3-flash-preview"
+def _record_call(
+    function: str,
+    route: Route,
+    started: float,
+    first_byte: float | None,
+    usage,
+    outcome: str,
+):
+    """LLM 호출 1회의 지연, 토큰 사용량, 결과를 메트릭과 요청 통계에 기록한다."""
+    duration = time.perf_counter() - started
+    prompt_tokens = (usage.prompt_token_count or 0) if usage else 0
+    cached_tokens = (usage.cached_content_token_count or 0) if usage else 0
+    response_tokens = (usage.candidates_token_count or 0) if usage else 0
+
+    _calls_total.inc(function=function, model=route.model, outcome=outcome)
+    if outcome == "ok":
+        _latency.observe(function, duration)
+        get_router().observe(function, route, duration)
+    _call_seconds.observe(duration, function=function, model=route.model)
+    if first_byte is not None:
+        _ttfb_seconds.observe(first_byte - started, function=function, model=route.model)
+    if usage is not None:
+        _prompt_tokens.observe(prompt_tokens, function=function)
+        _cached_prompt_tokens.observe(cached_tokens, function=function)
+        _response_tokens.observe(response_tokens, function=function)
+
+    stats = current_stats()
+    if stats is not None:
+        stats.llm_calls.append(
+            LlmCallRecord(
+                function=function,
+                model=route.model,
+                duration=duration,
+                prompt_tokens=prompt_tokens,
+                response_tokens=response_tokens,
+                outcome=outcome,
+            )
+        )
+    logger.debug(
+        "%s model=%s outcome=%s prompt_tokens=%d cached_tokens=%d response_tokens=%d latency_ms=%.1f",
+        function,
+        route.model,
+        outcome,
+        prompt_tokens,
+        cached_tokens,
+        response_tokens,
+        duration * 1000,
+    )
+
+
+async def _abort_on_cancel(function: str, awaitable: Awaitable[T]) -> T:
+    """요청의 연결이 끊기거나 요청 deadline을 넘기면 진행 중인 호출(대기열 대기 포함)을 취소한다.
+
+    연결 끊김은 ClientDisconnectedError, deadline 초과는 AiOverloadedError("deadline")로 알린다.
+    요청 밖(백그라운드 작업)에서는 그대로 기다린다.
+    """
+    cancellation = current_cancellation()
+    if cancellation is None:
+        return await awaitable
+
+    call = asyncio.ensure_future(awaitable)
+    disconnected = asyncio.ensure_future(cancellation.disconnected.wait())
+    timeout = None if cancellation.deadline is None else max(0.0, cancellation.deadline - time.monotonic())
+    try:
+        done, _ = await asyncio.wait({call, disconnected}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        # 서버가 요청 처리 자체를 취소함 (스트리밍 응답 중 연결 끊김 등)
+        call.cancel()
+        reason = "disconnect" if cancellation.disconnected.is_set() else "cancelled"
+        _cancelled_calls_total.inc(function=function, reason=reason)
+        raise
+    finally:
+        disconnected.cancel()
+    if call in done:
+        return call.result()
+
+    # 취소가 끝날 때까지 기다려 슬롯 반납/서킷 기록을 마친다
+    call.cancel()
+    await asyncio.gather(call, return_exceptions=True)
+    if disconnected in done:
+        _cancelled_calls_total.inc(function=function, reason="disconnect")
+        raise ClientDisconnectedError()
+    _cancelled_calls_total.inc(function=function, reason="deadline")
+    raise AiOverloadedError("deadline", get_limiter().retry_after(_priority(function)))
+
+
+async def _generate(
+    function: str,
+    contents,
+    config: genai.types.GenerateContentConfig | None = None,
+    route: Route | None = None,
+) -> LlmResponse:
+    """모든 비스트리밍 LLM 호출이 거치는 계측 지점. route가 없으면 라우팅 테이블로 모델을 정한다."""
+    return await _abort_on_cancel(function, _generate_call(function, contents, config, route))
+
+
+async def _generate_call(
+    function: str,
+    contents,
+    config: genai.types.GenerateContentConfig | None,
+    route: Route | None,
+) -> LlmResponse:
+    route = route or get_router().route(function)
+    backend = _get_backend()
+    breaker = get_breaker()
+    breaker.check(function)
+    async with get_limiter().slot(_reserve_tokens(function, contents, config), _priority(function)) as slot:
+        started = time.perf_counter()
+        try:
+            with breaker.guard(function, _slow_call_seconds(function, route)):
+                response = await backend.generate(function, route.model, contents, config)
+        except Exception as e:
+            _record_call(function, route, started, None, None, type(e).__name__)
+            _translate_quota_error(function, e)
+            raise
+        # 비스트리밍 호출은 응답 전체가 한 번에 도착하므로 첫 바이트 시각 = 완료 시각
+        _record_call(function, route, started, time.perf_counter(), response.usage_metadata, "ok")
+        if response.usage_metadata is not None:
+            slot["used_tokens"] = response.usage_metadata.total_token_count
+    return response
+
+
+def _hedge_delay(function: str) -> float | None:
+    settings = get_settings()
+    # 대기열이 쌓여 있으면 hedge가 부하만 늘리므로 보내지 않는다
+    if not settings.ai_hedge_enabled or get_limiter().waiting > 0:
+        return None
+    p = _latency.percentile(function, settings.ai_hedge_percentile, settings.ai_hedge_min_samples)
+    return None if p is None else max(p, settings.ai_hedge_min_delay_seconds)
+
+
+async def _generate_interactive(
+    function: str,
+    contents,
+    config: genai.types.GenerateContentConfig | None = None,
+    route: Route | None = None,
+) -> LlmResponse:
+    """사용자가 응답을 기다리는 호출. hedge, deadline, 재시도 가능한 오류에 한한 지수 백오프를 적용한다."""
+    settings = get_settings()
+    attempt = 0
+    try:
+        async with asyncio.timeout(settings.ai_interactive_deadline_seconds):
+            while True:
+                try:
+                    return await hedged(
+                        function, lambda: _generate(function, contents, config, route), _hedge_delay(function)
+                    )
+                except Exception as e:
+                    if not is_retryable(e) or attempt >= settings.ai_retry_max_attempts:
+                        raise
+                    _retries_total.inc(function=function, error=type(e).__name__)
+                    # full jitter
+                    await asyncio.sleep(random.uniform(0, settings.ai_retry_base_seconds * 2**attempt))
+                    attempt += 1
+    except TimeoutError as e:
+        _deadline_exceeded_total.inc(function=function)
+        raise AiOverloadedError("deadline", get_limiter().retry_after(_priority(function))) from e
+
+
+async def _generate_stream(
+    function: str,
+    contents,
+    config: genai.types.GenerateContentConfig | None = None,
+    route: Route | None = None,
+) -> AsyncIterator[str]:
+    """스트리밍 LLM 호출의 계측 지점. 텍스트 조각을 그대로 내보낸다."""
+    stream = _stream_call(function, contents, config, route)
+    try:
+        # 조각마다 연결 끊김/요청 deadline을 확인한다
+        while (text := await _abort_on_cancel(function, anext(stream, None))) is not None:
+            yield text
+    finally:
+        # 취소된 조각 태스크가 아직 제너레이터를 돌리는 중이면 그 태스크가 끝나면서 닫힌다
+        if not stream.ag_running:
+            await stream.aclose()
+
+
+async def _stream_call(
+    function: str,
+    contents,
+    config: genai.types.GenerateContentConfig | None,
+    route: Route | None,
+) -> AsyncIterator[str]:
+    route = route or get_router().route(function)
+    backend = _get_backend()
+    breaker = get_breaker()
+    breaker.check(function)
+    async with get_limiter().slot(_reserve_tokens(function, contents, config), _priority(function)) as slot:
+        started = time.perf_counter()
+        first_byte = None
+        usage = None
+        try:
+            with breaker.guard(function, _slow_call_seconds(function, route)):
+                async for chunk in backend.stream(function, route.model, contents, config):
+                    if first_byte is None:
+                        first_byte = time.perf_counter()
+                    if chunk.usage_metadata is not None:
+                        usage = chunk.usage_metadata
+                    if chunk.text:
+                        yield chunk.text
+        except Exception as e:
+            _record_call(function, route, started, first_byte, usage, type(e).__name__)
+            _translate_quota_error(function, e)
+            raise
+        _record_call(function, route, started, first_byte, usage, "ok")
+        if usage is not None:
+            slot["used_tokens"] = usage.total_token_count
+
+
+def _normalize(value):
+    # 대소문자/공백 차이만 있는 입력은 같은 요청으로 본다
+    return " ".join(value.split()).casefold() if isinstance(value, str) else value
+
+
+async def _single_flight(function: str, inputs: tuple, call: Callable[[], Awaitable[T]]) -> T:
+    """같은 입력의 동시 호출은 upstream 호출 하나를 공유하고, 성공한 결과는 잠시 캐시한다.
+
+    공유 호출은 별도 태스크로 실행하므로 먼저 들어온 요청이 취소돼도 합류한 요청은 결과를 받는다.
+    실패는 캐시하지 않는다. 결과 객체를 여러 요청이 공유하므로 호출 측은 결과를 수정하지 않는다.
+    호출 비용(LlmCallRecord)은 끝까지 기다린 첫 요청에만 기록하고, 합류/캐시로 받은 요청은 llm_shared로 센다.
+    """
+    stats = current_stats()
+    settings = get_settings()
+    if not settings.ai_single_flight_enabled:
+        return await call()
+
+    key = (function, *(_normalize(v) for v in inputs))
+    cached = _result_cache.get(key)
+    if cached is not None:
+        expires_at, result = cached
+        if time.monotonic() < expires_at:
+            _single_flight_total.inc(function=function, result="cached")
+            if stats is not None:
+                stats.llm_shared[function] += 1
+            return result
+        del _result_cache[key]
+
+    task = _in_flight.get(key)
+    if task is not None:
+        _single_flight_total.inc(function=function, result="coalesced")
+        if stats is not None:
+            stats.llm_shared[function] += 1
+        return await asyncio.shield(task)
+
+    _single_flight_total.inc(function=function, result="leader")
+    # 공유 호출은 특정 요청의 연결 끊김/deadline에 묶이지 않게 취소 신호 없이 실행하고, 기록은 따로 모은다
+    shared_stats = RequestStats(method="SHARED", path=function)
+    task = asyncio.create_task(call(), context=detached_context(shared_stats))
+    _in_flight[key] = task
+
+    def _done(t: asyncio.Task):
+        _in_flight.pop(key, None)
+        if t.cancelled() or t.exception() is not None or settings.ai_result_cache_ttl_seconds <= 0:
+            return
+        _result_cache[key] = (time.monotonic() + settings.ai_result_cache_ttl_seconds, t.result())
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > settings.ai_result_cache_max_entries:
+            _result_cache.popitem(last=False)
+
+    task.add_done_callback(_done)
+    try:
+        return await asyncio.shield(task)
+    finally:
+        # 끝까지 기다린 경우에만 호출 비용을 이 요청에 기록한다 (먼저 끝난 요청에 뒤늦게 매기지 않는다)
+        if stats is not None and task.done():
+            stats.llm_calls.extend(shared_stats.llm_calls)
+
+
+# 응답 검증기는 모듈 로드 시 한 번만 만든다
+_ADAPTERS: dict = {
+    schema: TypeAdapter(schema)
+    for schema in (
+        list[GeneratedTask],
+        GeneratedPersona,
+        list[GeneratedPersona],
+        GeneratedPersonaWithQuestion,
+        EvaluationResult,
+    )
+}
+
+
+async def _generate_structured(
+    function: str,
+    contents: str,
+    schema,
+    config: genai.types.GenerateContentConfig | None = None,
+    interactive: bool = False,
+    route: Route | None = None,
+):
+    """response_schema로 출력 형식을 강제하고 응답을 바로 검증한다.
+
+    검증에 실패하면 오류 내용을 붙여 한 번만 다시 요청한다.
+    """
+    generate = _generate_interactive if interactive else _generate
+    adapter = _ADAPTERS[schema]
+    config = config.model_copy() if config else genai.types.GenerateContentConfig()
+    config.response_mime_type = "application/json"
+    config.response_schema = schema
+
+    response = await generate(function, contents, config, route)
+    try:
+        return adapter.validate_json(response.text)
+    except ValidationError as e:
+        _parse_failures_total.inc(function=function)
+        logger.warning("%s 응답 스키마 검증 실패, 재요청: %s", function, e.errors(include_url=False))
+        error = e
+
+    repair = f"""{contents}
+
+이전 응답이 요구한 JSON 형식에 맞지 않았습니다.
+이전 응답: {response.text}
+오류: {error}
+형식에 맞는 JSON만 다시 응답해주세요."""
+    response = await generate(f"{function}_repair", repair, config, route)
+    try:
+        return adapter.validate_json(response.text)
+    except ValidationError:
+        _parse_failures_total.inc(function=f"{function}_repair")
+        raise
 
 
 async def generate_tasks(
     company_name: str,
     job_role_name: str,
     count: int = 5,
-) -> list[dict]:
-    """AI로 실무 과제를 생성한다."""
-    client = _get_client()
-
-    prompt = f"""당신은 기업 실무 과제를 만드는 전문가입니다.
-
-다음 조건에 맞는 실무 과제 {count}개를 생성해주세요:
-- 기업: {company_name}
-- 직무: {job_role_name}
-
-각 과제는 실제 해당 기업의 해당 직무에서 수행할 법한 실무 과제여야 합니다.
-
-JSON 배열로 응답해주세요. 각 항목:
-{{
-  "title": "과제 제목",
-  "description": "과제 상세 설명 (3-5문장)",
-  "category": "과제 카테고리 (예: 기획, 개발, 분석, 디자인)",
-  "difficulty": "상/중/하 중 하나",
-  "estimated_minutes": 예상 소요 시간(분, 정수),
-  "answer_type": "text",
-  "key_points": ["핵심 평가 포인트1", "핵심 평가 포인트2", "핵심 평가 포인트3"],
-  "tech_stack": ["관련 기술1", "관련 기술2"]
-}}"""
-
-    response = client.models.generate_content(
-        model=MODEL,
-        contents=prompt,
-        config=genai.types.GenerateContentConfig(
-            response_mime_type="application/json",
-        ),
-    )
-    return json.loads(response.text)
+    shared: bool = True,
+) -> list[GeneratedTask]:
+    """AI로 실무 과제를 생성한다.
+
+    shared면 같은 (기업, 직무, 개수)의 동시 요청이 호출 하나를 공유하고 결과 캐시를 쓴다.
+    매번 다른 과제가 필요한 경우(과제 풀 보충)에는 False로 호출한다.
+    """
+    prompt = prompt_builder.GENERATE_TASKS.render(count=count, company_name=company_name, job_role_name=job_role_name)
+
+    async def call() -> list[GeneratedTask]:
+        return await _generate_structured("generate_tasks", prompt, list[GeneratedTask])
+
+    if not shared:
+        return await call()
+    # 결과 리스트는 요청마다 복사해 넘긴다 (호출 측에서 extend 등으로 수정할 수 있으므로)
+    return list(await _single_flight("generate_tasks", (company_name, job_role_name, count), call))
 
 
 async def generate_persona(
     company_name: str,
     job_role_name: str,
     task_title: str,
-) -> dict:
+) -> GeneratedPersona:
     """AI 상사 페르소나를 생성한다."""
-    client = _get_client()
-
-    prompt = f"""당신은 면접관 페르소나를 만드는 전문가입니다.
-
-다음 상황에 맞는 면접관 페르소나를 생성해주세요:
-- 기업: {company_name}
-- 직무: {job_role_name}
-- 과제: {task_title}
-
-면접관은 해당 기업의 실무 담당자(팀장급)로, 제출된 과제에 대해 의도와 이해도를 파악하는 질의응답을 진행합니다.
-
-JSON으로 응답해주세요:
-{{
-  "persona_name": "면접관 이름 (한국어, 예: 김민수)",
-  "persona_department": "소속 부서 (예: 프론트엔드 개발팀)",
-  "topic_tag": "질의 주제 태그 (예: 기술 설계)",
-  "total_questions": 질문 수(3~5 사이 정수)
-}}"""
-
-    response = client.models.generate_content(
-        model=MODEL,
-        contents=prompt,
-        config=genai.types.GenerateContentConfig(
-            response_mime_type="application/json",
-        ),
+    prompt = prompt_builder.GENERATE_PERSONA.render(
+        company_name=company_name, job_role_name=job_role_name, task_title=task_title
+    )
+
+    return await _generate_structured("generate_persona", prompt, GeneratedPersona, interactive=True)
+
+
+async def generate_personas(
+    company_name: str,
+    job_role_name: str,
+    category: str,
+    count: int = 5,
+) -> list[GeneratedPersona]:
+    """페르소나 라이브러리용으로 서로 다른 면접관 페르소나 여러 개를 한 번에 생성한다."""
+    prompt = prompt_builder.GENERATE_PERSONAS.render(
+        count=count, company_name=company_name, job_role_name=job_role_name, category=category
     )
-    return json.loads(response.text)
+
+    return await _generate_structured("generate_personas", prompt, list[GeneratedPersona])
 
 
 async def generate_first_question(
@@ -96,63 +653,359 @@ async def generate_first_question(
     persona_department: str,
 ) -> str:
     """첫 번째 질문을 생성한다."""
-    client = _get_client()
+    settings = get_settings()
+    prompt = prompt_builder.FIRST_QUESTION.render(
+        company_name=company_name,
+        persona_department=persona_department,
+        persona_name=persona_name,
+        task_title=task_title,
+        task_description=prompt_builder.truncate(
+            task_description, settings.prompt_task_description_max_tokens, "task_description", head_ratio=1.0
+        ),
+        submission_content=prompt_builder.truncate(
+            submission_content, settings.prompt_submission_max_tokens, "submission"
+        ),
+    )
 
-    prompt = f"""당신은 {company_name}의 {persona_department} 소속 {persona_name}입니다.
+    response = await _generate_interactive("generate_first_question", prompt)
+    return response.text
 
-지원자가 다음 과제를 제출했습니다:
-- 과제: {task_title}
-- 과제 설명: {task_description}
-- 제출 내용: {submission_content}
 
-제출물을 검토한 후, 지원자의 의도와 이해도를 파악하기 위한 첫 번째 질문을 해주세요.
-질문은 구체적이고 실무적이어야 합니다. 질문만 작성해주세요."""
+async def generate_persona_with_first_question(
+    company_name: str,
+    job_role_name: str,
+    task_title: str,
+    task_description: str,
+    submission_content: str,
+) -> GeneratedPersonaWithQuestion:
+    """페르소나와 첫 번째 질문을 한 번의 호출로 생성한다."""
+    settings = get_settings()
+    prompt = prompt_builder.PERSONA_WITH_FIRST_QUESTION.render(
+        company_name=company_name,
+        job_role_name=job_role_name,
+        task_title=task_title,
+        task_description=prompt_builder.truncate(
+            task_description, settings.prompt_task_description_max_tokens, "task_description", head_ratio=1.0
+        ),
+        submission_content=prompt_builder.truncate(
+            submission_content, settings.prompt_submission_max_tokens, "submission"
+        ),
+    )
+
+    return await _generate_structured(
+        "generate_persona_with_first_question", prompt, GeneratedPersonaWithQuestion, interactive=True
+    )
+
+
+def _format_history(conversation_history: list[dict], history_summary: str | None = None) -> str:
+    history_text = "\n".join(
+        f"{'면접관' if m['role'] == 'ai' else '지원자'}: {m['content']}"
+        for m in conversation_history
+    )
+    if not history_summary:
+        return history_text
+    return f"(이전 대화 요약)\n{history_summary}\n\n(최근 대화)\n{history_text}"
 
-    response = client.models.generate_content(
-        model=MODEL,
-        contents=prompt,
+
+async def summarize_history(previous_summary: str | None, conversation_history: list[dict]) -> str:
+    """기존 요약에 새로 밀려난 대화를 합쳐 누적 요약을 갱신한다."""
+    settings = get_settings()
+
+    prompt = prompt_builder.SUMMARIZE_HISTORY.render(
+        previous_summary=previous_summary or "없음",
+        history=_format_history(prompt_builder.fit_history(conversation_history, settings.prompt_history_max_tokens)),
+    )
+
+    response = await _generate(
+        "summarize_history",
+        prompt,
+        genai.types.GenerateContentConfig(max_output_tokens=settings.history_summary_max_tokens),
     )
     return response.text
 
 
-async def generate_follow_up(
+def _build_interview_context(
+    company_name: str,
+    job_role_name: str,
+    task_title: str,
+    task_description: str,
+    key_points: list[str] | None,
+    submission_content: str,
+) -> str:
+    """스레드 동안 바뀌지 않는 공통 프롬프트 prefix. 후속 질문과 채점이 같은 캐시를 공유한다."""
+    settings = get_settings()
+    return prompt_builder.INTERVIEW_CONTEXT.render(
+        company_name=company_name,
+        job_role_name=job_role_name,
+        task_title=task_title,
+        task_description=prompt_builder.truncate(
+            task_description, settings.prompt_task_description_max_tokens, "task_description", head_ratio=1.0
+        ),
+        key_points=", ".join(key_points) if key_points else "없음",
+        submission_content=prompt_builder.truncate(
+            submission_content, settings.prompt_submission_max_tokens, "submission"
+        ),
+    )
+
+
+# (thread_id, 모델) -> (캐시 이름 또는 None, 만료 시각).
+# None은 캐시 생성 실패(최소 토큰 미달 등)를 기록해 재시도를 막는다. 캐시는 만든 모델에서만 쓸 수 있어 모델별로 둔다.
+# 만든 캐시는 스레드 행에도 저장해, 다른 인스턴스나 채점 워커가 register_context_cache로 올려 재사용/삭제한다.
+_context_caches: dict[tuple[int, str], tuple[str | None, float]] = {}
+# (thread_id, 모델) -> 진행 중인 캐시 생성. 같은 키는 하나만 만든다
+_cache_creations: dict[tuple[int, str], asyncio.Task] = {}
+
+
+def _get_context_cache(thread_id: int | None, model: str, context: str, create: bool = True) -> str | None:
+    """스레드의 공통 prefix 컨텍스트 캐시 이름을 반환한다.
+
+    없으면 create일 때 백그라운드 생성을 시작하고 None을 반환한다 (이번 호출은 캐시 없이 보낸다).
+    """
+    settings = get_settings()
+    # 서킷이 열려 있으면 캐시 생성도 upstream 호출이므로 건너뛴다
+    if thread_id is None or not settings.ai_context_cache_enabled or not is_available():
+        return None
+
+    key = (thread_id, model)
+    now = time.monotonic()
+    entry = _context_caches.get(key)
+    if entry is not None and entry[1] > now:
+        return entry[0]
+    if create and key not in _cache_creations:
+        # 요청의 연결 끊김/deadline에 묶이지 않게 요청 컨텍스트 없이 실행
+        task = asyncio.create_task(_create_context_cache(thread_id, model, context), context=detached_context())
+        _cache_creations[key] = task
+        task.add_done_callback(lambda _: _cache_creations.pop(key, None))
+    return None
+
+
+async def _create_context_cache(thread_id: int, model: str, context: str):
+    """캐시를 만들어 _context_caches에 기록한다. 다른 호출과 같이 대기열(batch)과 서킷을 거친다."""
+    settings = get_settings()
+    now = time.monotonic()
+    # 방치된 스레드의 만료 항목 정리
+    for key in [k for k, (_, expires_at) in _context_caches.items() if expires_at <= now]:
+        del _context_caches[key]
+
+    ttl = settings.ai_context_cache_ttl_seconds
+    breaker = get_breaker()
+    try:
+        breaker.check("create_context_cache")
+        async with get_limiter().slot(estimate_tokens(context), "batch"):
+            # batch 호출이므로 지연은 서킷 실패로 세지 않는다
+            with breaker.guard("create_context_cache", None):
+                name = await _get_backend().create_cache(model, [context], ttl, f"thread-{thread_id}")
+    except genai.errors.APIError as e:
+        logger.info("컨텍스트 캐시 생성 불가 thread_id=%s: %s", thread_id, e)
+        name = None
+    except AiOverloadedError as e:
+        # 대기열 포화/서킷 open이면 기록하지 않고 다음 호출에서 다시 시도한다
+        logger.info("컨텍스트 캐시 생성 보류 thread_id=%s: %s", thread_id, e.reason)
+        return
+
+    # 만료 직전 캐시를 참조하지 않도록 여유를 둔다
+    _context_caches[(thread_id, model)] = (name, now + ttl * 0.9)
+    if name is not None:
+        await _persist_context_cache(thread_id, model, name, ttl * 0.9)
+
+
+async def _persist_context_cache(thread_id: int, model: str, name: str, usable_seconds: float):
+    """다른 프로세스가 쓰고 지울 수 있도록 캐시 이름/모델/만료 시각을 스레드에 저장한다."""
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=usable_seconds)
+    try:
+        async with open_session() as db:
+            await db.execute(
+                update(Thread)
+                .where(Thread.id == thread_id)
+                .values(context_cache_name=name, context_cache_model=model, context_cache_expires_at=expires_at)
+            )
+            await db.commit()
+    except Exception:
+        # 저장하지 못해도 이 프로세스에서는 쓸 수 있다 (다른 프로세스에서는 TTL까지 남는다)
+        logger.exception("컨텍스트 캐시 저장 실패 thread_id=%s", thread_id)
+
+
+def register_context_cache(thread: Thread):
+    """스레드에 저장된(다른 프로세스가 만든) 캐시를 이 프로세스의 목록에 올린다."""
+    if thread.context_cache_name is None or thread.context_cache_expires_at is None:
+        return
+    remaining = (thread.context_cache_expires_at - datetime.now(timezone.utc)).total_seconds()
+    if remaining <= 0:
+        return
+    _context_caches.setdefault(
+        (thread.id, thread.context_cache_model), (thread.context_cache_name, time.monotonic() + remaining)
+    )
+
+
+def prepare_context_cache(
+    thread_id: int,
     company_name: str,
     job_role_name: str,
     task_title: str,
     task_description: str,
+    key_points: list[str] | None,
     submission_content: str,
+):
+    """첫 질문을 저장한 직후 호출해 첫 후속 질문 전에 스레드 캐시를 미리 만든다."""
+    context = _build_interview_context(
+        company_name, job_role_name, task_title, task_description, key_points, submission_content
+    )
+    _get_context_cache(thread_id, get_router().route("generate_follow_up").model, context)
+
+
+def _cached_models(thread_id: int) -> list[str]:
+    """스레드의 유효한 컨텍스트 캐시가 있는 모델 목록."""
+    now = time.monotonic()
+    return [
+        model
+        for (key_thread_id, model), (name, expires_at) in _context_caches.items()
+        if key_thread_id == thread_id and name is not None and expires_at > now
+    ]
+
+
+async def release_context_cache(thread_id: int):
+    """스레드가 끝나면 컨텍스트 캐시를 삭제한다."""
+    # 진행 중인 생성이 끝나야 그 캐시까지 지울 수 있다
+    creations = [task for (key_thread_id, _), task in _cache_creations.items() if key_thread_id == thread_id]
+    await asyncio.gather(*creations, return_exceptions=True)
+    for key in [k for k in _context_caches if k[0] == thread_id]:
+        name, _ = _context_caches.pop(key)
+        if name is None:
+            continue
+        try:
+            await _get_backend().delete_cache(name)
+        except genai.errors.APIError as e:
+            logger.info("컨텍스트 캐시 삭제 실패 thread_id=%s: %s", thread_id, e)
+
+
+async def _prepare_interview_call(
+    function: str,
+    thread_id: int | None,
+    context: str,
+    instruction: str,
+    config: genai.types.GenerateContentConfig | None = None,
+    create_cache: bool = True,
+    use_cached_model: bool = False,
+) -> tuple[str, genai.types.GenerateContentConfig | None, Route]:
+    """캐시가 있으면 지시문만 보내고, 없으면 prefix와 지시문을 합쳐 보낸다 (create_cache면 캐시는 뒤에서 만든다).
+
+    캐시는 모델에 묶이므로 모델을 먼저 정하고, 그 route로 호출하도록 함께 반환한다.
+    use_cached_model이면 라우팅한 모델에 캐시가 없을 때 캐시가 있는 다른 모델로 바꿔 호출한다.
+    """
+    router = get_router()
+    route = router.route(function)
+    cache_name = _get_context_cache(thread_id, route.model, context, create=create_cache)
+    if cache_name is None and thread_id is not None:
+        cached_models = [model for model in _cached_models(thread_id) if model != route.model]
+        if cached_models and use_cached_model:
+            model = cached_models[0]
+            tier = next((tier for tier, m in router.tiers.items() if m == model), route.tier)
+            route = Route(tier=tier, model=model)
+            cache_name = _get_context_cache(thread_id, model, context, create=False)
+        if cache_name is None:
+            result = "other_model" if cached_models else "miss"
+            _context_cache_lookups_total.inc(function=function, result=result)
+            _context_uncached_tokens_total.inc(estimate_tokens(context), function=function, result=result)
+    if cache_name is None:
+        return f"{context}\n\n{instruction}", config, route
+    _context_cache_lookups_total.inc(function=function, result="hit")
+
+    config = config.model_copy() if config else genai.types.GenerateContentConfig()
+    config.cached_content = cache_name
+    return instruction, config, route
+
+
+def _build_follow_up_instruction(
     persona_name: str,
     persona_department: str,
+    company_name: str,
     conversation_history: list[dict],
     question_number: int,
     total_questions: int,
+    history_summary: str | None,
 ) -> str:
-    """후속 질문을 생성한다."""
-    client = _get_client()
-
-    history_text = "\n".join(
-        f"{'면접관' if m['role'] == 'ai' else '지원자'}: {m['content']}"
-        for m in conversation_history
+    return prompt_builder.FOLLOW_UP.render(
+        company_name=company_name,
+        persona_department=persona_department,
+        persona_name=persona_name,
+        history=_format_history(
+            prompt_builder.fit_history(conversation_history, get_settings().prompt_history_max_tokens),
+            history_summary,
+        ),
+        total_questions=total_questions,
+        question_number=question_number,
     )
 
-    prompt = f"""당신은 {company_name}의 {persona_department} 소속 {persona_name}입니다.
 
-과제: {task_title}
-과제 설명: {task_description}
-지원자 제출물: {submission_content}
+async def generate_follow_up(
+    company_name: str,
+    job_role_name: str,
+    task_title: str,
+    task_description: str,
+    submission_content: str,
+    persona_name: str,
+    persona_department: str,
+    conversation_history: list[dict],
+    question_number: int,
+    total_questions: int,
+    key_points: list[str] | None = None,
+    thread_id: int | None = None,
+    history_summary: str | None = None,
+) -> str:
+    """후속 질문을 생성한다. thread_id가 있으면 스레드 컨텍스트 캐시를 사용한다.
+
+    conversation_history는 최근 메시지만, 그 이전 대화는 history_summary로 전달한다.
+    """
+    context = _build_interview_context(
+        company_name, job_role_name, task_title, task_description, key_points, submission_content
+    )
+    instruction = _build_follow_up_instruction(
+        persona_name,
+        persona_department,
+        company_name,
+        conversation_history,
+        question_number,
+        total_questions,
+        history_summary,
+    )
+    contents, config, route = await _prepare_interview_call("generate_follow_up", thread_id, context, instruction)
 
-지금까지의 대화:
-{history_text}
+    response = await _generate_interactive("generate_follow_up", contents, config, route)
+    return response.text
 
-이것은 {total_questions}개 질문 중 {question_number}번째 질문입니다.
-이전 대화를 바탕으로 지원자의 이해도를 더 깊이 파악할 수 있는 후속 질문을 해주세요.
-질문만 작성해주세요."""
 
-    response = client.models.generate_content(
-        model=MODEL,
-        contents=prompt,
+async def stream_follow_up(
+    company_name: str,
+    job_role_name: str,
+    task_title: str,
+    task_description: str,
+    submission_content: str,
+    persona_name: str,
+    persona_department: str,
+    conversation_history: list[dict],
+    question_number: int,
+    total_questions: int,
+    key_points: list[str] | None = None,
+    thread_id: int | None = None,
+    history_summary: str | None = None,
+) -> AsyncIterator[str]:
+    """후속 질문을 생성하면서 텍스트 조각을 도착하는 대로 내보낸다."""
+    context = _build_interview_context(
+        company_name, job_role_name, task_title, task_description, key_points, submission_content
     )
-    return response.text
+    instruction = _build_follow_up_instruction(
+        persona_name,
+        persona_department,
+        company_name,
+        conversation_history,
+        question_number,
+        total_questions,
+        history_summary,
+    )
+    contents, config, route = await _prepare_interview_call("stream_follow_up", thread_id, context, instruction)
+
+    async for text in _generate_stream("stream_follow_up", contents, config, route):
+        yield text
 
 
 async def evaluate_submission(
@@ -163,54 +1016,27 @@ async def evaluate_submission(
     key_points: list[str] | None,
     submission_content: str,
     conversation_history: list[dict],
-) -> dict:
+    thread_id: int | None = None,
+    history_summary: str | None = None,
+) -> EvaluationResult:
     """제출물과 질의응답을 기반으로 채점한다."""
-    client = _get_client()
-
-    history_text = "\n".join(
-        f"{'면접관' if m['role'] == 'ai' else '지원자'}: {m['content']}"
-        for m in conversation_history
+    context = _build_interview_context(
+        company_name, job_role_name, task_title, task_description, key_points, submission_content
     )
-
-    key_points_text = ", ".join(key_points) if key_points else "없음"
-
-    prompt = f"""당신은 채점 전문가입니다. 다음 과제 제출물과 질의응답을 기반으로 채점해주세요.
-
-기업: {company_name}
-직무: {job_role_name}
-과제: {task_title}
-과제 설명: {task_description}
-핵심 평가 포인트: {key_points_text}
-
-제출물:
-{submission_content}
-
-질의응답:
-{history_text}
-
-다음 JSON 형식으로 채점해주세요:
-{{
-  "total_score": 총점(0-100),
-  "score_label": "등급 (S/A/B/C/D 중 하나)",
-  "scores_detail": [
-    {{"name": "문제 이해도", "score": 점수(0-100)}},
-    {{"name": "실무 적합성", "score": 점수(0-100)}},
-    {{"name": "논리적 사고", "score": 점수(0-100)}},
-    {{"name": "커뮤니케이션", "score": 점수(0-100)}}
-  ],
-  "ai_summary": "전반적인 평가 요약 (2-3문장)",
-  "analysis_points": {{
-    "strengths": ["강점1", "강점2"],
-    "weaknesses": ["약점1", "약점2"]
-  }},
-  "feedback": "구체적인 피드백 및 개선 방향 (2-3문장)"
-}}"""
-
-    response = client.models.generate_content(
-        model=MODEL,
-        contents=prompt,
-        config=genai.types.GenerateContentConfig(
-            response_mime_type="application/json",
-        ),
+    instruction = prompt_builder.EVALUATE.render(
+        history=_format_history(
+            prompt_builder.fit_history(conversation_history, get_settings().prompt_history_max_tokens),
+            history_summary,
+        )
+    )
+    contents, config, route = await _prepare_interview_call(
+        "evaluate_submission",
+        thread_id,
+        context,
+        instruction,
+        # 마지막 호출이므로 캐시가 이미 있을 때만 사용한다
+        create_cache=False,
+        use_cached_model=get_settings().ai_evaluation_use_cached_model,
     )
-    return json.loads(response.text)
+
+    return await _generate_structured("evaluate_submission", contents, EvaluationResult, config, route=route)
@@ -0,0 +1,272 @@
+"""비동기 채점 작업 큐.
+
+마지막 답변이 도착하면 evaluation_jobs에 작업을 넣고 즉시 응답한다.
+워커(앱 내 백그라운드 태스크 또는 scripts/run_evaluation_worker.py)가
+SELECT ... FOR UPDATE SKIP LOCKED로 작업을 하나씩 가져가 채점을 수행한다.
+재시도를 모두 실패하면 스레드를 evaluation_failed로 바꾸고, 사용자가 retry_job으로 다시 요청할 수 있다.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import metrics
+from src.core.config import get_settings
+from src.core.database import open_session
+from src.models.database.evaluation_job import EvaluationJob
+from src.models.database.thread import Thread
+from src.services import ai_service, evaluation_service, history_service, thread_service
+from src.services.ai_resilience import AiUnavailableError
+
+logger = logging.getLogger(__name__)
+
+# 같은 프로세스의 워커를 즉시 깨우기 위한 이벤트 (별도 워커는 폴링으로 동작)
+_wakeup = asyncio.Event()
+
+_jobs_total = metrics.counter("evaluation_jobs_total", "채점 작업 상태 전이 수", ("result",))
+_job_seconds = metrics.histogram("evaluation_job_seconds", "채점 작업 1회 실행 시간")
+_queue_wait_seconds = metrics.histogram("evaluation_job_queue_wait_seconds", "작업 생성부터 첫 실행까지 대기 시간")
+
+
+async def enqueue_job(db: AsyncSession, thread: Thread) -> EvaluationJob:
+    """채점 작업을 등록하고 스레드를 evaluating 상태로 바꾼다 (한 트랜잭션).
+
+    마지막 답변이 동시에 두 번 도착해 이미 작업이 있으면 기존 작업을 반환한다.
+    """
+    thread_id = thread.id
+    job = EvaluationJob(thread_id=thread_id, user_id=thread.user_id)
+    db.add(job)
+    thread.status = "evaluating"
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        job = await get_job_by_thread_id(db, thread_id)
+        await db.refresh(thread)
+        return job
+    await db.refresh(job)
+    await db.refresh(thread)
+    _jobs_total.inc(result="queued")
+    _wakeup.set()
+    return job
+
+
+async def get_job_by_thread_id(db: AsyncSession, thread_id: int) -> EvaluationJob | None:
+    result = await db.execute(select(EvaluationJob).where(EvaluationJob.thread_id == thread_id))
+    return result.scalar_one_or_none()
+
+
+async def claim_next_job(db: AsyncSession) -> EvaluationJob | None:
+    """실행할 작업 하나를 잠그고 running으로 표시한다. lease가 만료된 running 작업도 다시 가져온다."""
+    settings = get_settings()
+    now = datetime.now(timezone.utc)
+    lease_expired = now - timedelta(seconds=settings.evaluation_job_lease_seconds)
+
+    stmt = (
+        select(EvaluationJob)
+        .where(
+            or_(
+                and_(EvaluationJob.status == "pending", EvaluationJob.run_after <= now),
+                and_(EvaluationJob.status == "running", EvaluationJob.locked_at < lease_expired),
+            )
+        )
+        .order_by(EvaluationJob.run_after)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = (await db.execute(stmt)).scalar_one_or_none()
+    if job is None:
+        await db.rollback()
+        return None
+
+    if job.attempts == 0 and job.last_error is None:
+        _queue_wait_seconds.observe((now - job.created_at).total_seconds())
+    job.status = "running"
+    job.locked_at = now
+    job.attempts += 1
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def run_job(db: AsyncSession, job: EvaluationJob):
+    """채점, 제출물 상태/역량 업데이트, 스레드 완료를 한 트랜잭션으로 수행한다.
+
+    중간에 실패하면 아무것도 남지 않으므로 재시도가 처음부터 다시 채점한다.
+    LLM 호출 동안은 트랜잭션을 열어 두지 않는다 (조회 → 트랜잭션 종료 → 채점 → 쓰기).
+    """
+    settings = get_settings()
+    thread = await thread_service.get_thread_detail(db, job.thread_id)
+    # 질의응답 중 API 인스턴스가 만든 캐시를 채점에 쓰고, 끝나면 이 워커에서 지운다
+    ai_service.register_context_cache(thread)
+    submission, task, company_name, job_role_name = await thread_service.get_interview_context(db, thread)
+
+    # 평가가 이미 있으면 이전 시도가 커밋까지 마친 것 (lease 만료로 다시 가져온 경우)
+    evaluation = await evaluation_service.get_evaluation_by_submission_id(db, thread.submission_id)
+    if evaluation is None:
+        messages = await thread_service.get_thread_messages(db, thread.id)
+        history_summary, conversation_history = history_service.get_bounded_history(thread, messages)
+        # 조회 트랜잭션을 끝내 LLM 호출 동안 커넥션을 풀에 돌려준다 (expire_on_commit=False라 객체는 그대로 쓴다)
+        await db.commit()
+        # batch 호출에는 deadline이 없으므로, 멈춘 호출이 lease 만료까지 워커를 붙잡지 않게 한다
+        eval_result = await asyncio.wait_for(
+            ai_service.evaluate_submission(
+                company_name=company_name,
+                job_role_name=job_role_name,
+                task_title=task.title if task else "",
+                task_description=task.description if task else "",
+                key_points=task.key_points if task else None,
+                submission_content=submission.content if submission else "",
+                conversation_history=conversation_history,
+                thread_id=thread.id,
+                history_summary=history_summary,
+            ),
+            settings.evaluation_job_lease_seconds,
+        )
+
+        await evaluation_service.create_evaluation(
+            db,
+            submission_id=thread.submission_id,
+            thread_id=thread.id,
+            total_score=eval_result.total_score,
+            score_label=eval_result.score_label,
+            scores_detail=[s.model_dump() for s in eval_result.scores_detail],
+            ai_summary=eval_result.ai_summary,
+            analysis_points=eval_result.analysis_points.model_dump(),
+            feedback=eval_result.feedback,
+        )
+
+        # 역량 업데이트
+        if task:
+            weak_tags = eval_result.analysis_points.weaknesses
+            await evaluation_service.update_user_competency(
+                db,
+                user_id=thread.user_id,
+                company_id=task.company_id,
+                job_role_id=task.job_role_id,
+                new_score=eval_result.total_score,
+                weak_tags=weak_tags,
+            )
+
+    # submission 상태 업데이트
+    if submission:
+        submission.status = "evaluated"
+
+    job.status = "completed"
+    job.last_error = None
+    thread_service.complete_thread(thread)
+    await db.commit()
+
+    # 채점은 이미 끝났으므로 캐시 삭제 실패가 작업 실패로 번지지 않게 한다
+    try:
+        await ai_service.release_context_cache(thread.id)
+    except Exception:
+        logger.exception("컨텍스트 캐시 정리 실패 thread_id=%s", thread.id)
+
+
+async def _mark_failed(db: AsyncSession, job: EvaluationJob, error: str):
+    settings = get_settings()
+    await db.refresh(job)
+    if job.attempts >= settings.evaluation_job_max_attempts:
+        job.status = "failed"
+        # 스레드가 evaluating에 묶이지 않도록 재요청 가능한 상태로 바꾼다
+        thread = await thread_service.get_thread_detail(db, job.thread_id)
+        if thread is not None:
+            thread.status = "evaluation_failed"
+        _jobs_total.inc(result="failed")
+    else:
+        # 지수 백오프 후 재시도
+        job.status = "pending"
+        job.run_after = datetime.now(timezone.utc) + timedelta(
+            seconds=settings.evaluation_job_retry_base_seconds * 2 ** (job.attempts - 1)
+        )
+        _jobs_total.inc(result="retried")
+    job.last_error = error[:1000]
+    job.locked_at = None
+    await db.commit()
+
+
+async def retry_job(db: AsyncSession, thread: Thread) -> EvaluationJob:
+    """최종 실패한 채점 작업을 처음부터 다시 등록하고 스레드를 evaluating으로 되돌린다 (한 트랜잭션)."""
+    job = await get_job_by_thread_id(db, thread.id)
+    if job is None:
+        return await enqueue_job(db, thread)
+    job.status = "pending"
+    job.attempts = 0
+    job.run_after = datetime.now(timezone.utc)
+    job.locked_at = None
+    thread.status = "evaluating"
+    await db.commit()
+    await db.refresh(job)
+    await db.refresh(thread)
+    _jobs_total.inc(result="requeued")
+    _wakeup.set()
+    return job
+
+
+async def _defer(db: AsyncSession, job: EvaluationJob, retry_after: float):
+    """LLM 장애로 채점을 미룬다. 시도 횟수는 늘리지 않는다."""
+    await db.refresh(job)
+    job.status = "pending"
+    job.attempts -= 1
+    job.run_after = datetime.now(timezone.utc) + timedelta(seconds=retry_after)
+    job.last_error = "LLM 서킷 open으로 채점 연기"
+    job.locked_at = None
+    await db.commit()
+    _jobs_total.inc(result="deferred")
+
+
+async def process_next_job() -> bool:
+    """작업 하나를 가져와 실행한다. 처리할 작업이 없으면 False."""
+    # 서킷이 열려 있으면 작업을 가져가지 않는다 (가져가도 연기만 된다)
+    if not ai_service.is_available():
+        return False
+
+    async with open_session() as db:
+        job = await claim_next_job(db)
+        if job is None:
+            return False
+
+        started = time.perf_counter()
+        try:
+            await run_job(db, job)
+            _jobs_total.inc(result="completed")
+        except asyncio.CancelledError:
+            # 종료 중 취소된 작업은 lease 만료 후 다른 워커가 다시 가져간다
+            raise
+        except AiUnavailableError as e:
+            logger.info("LLM 서킷 open, 채점 연기 job_id=%s retry_after=%.0fs", job.id, e.retry_after)
+            await db.rollback()
+            await _defer(db, job, e.retry_after)
+        except Exception as e:
+            logger.exception("채점 작업 실패 job_id=%s thread_id=%s", job.id, job.thread_id)
+            await db.rollback()
+            await _mark_failed(db, job, repr(e))
+        finally:
+            _job_seconds.observe(time.perf_counter() - started)
+        return True
+
+
+async def run_worker():
+    """작업이 없을 때는 폴링 간격 또는 같은 프로세스의 enqueue 알림까지 대기한다."""
+    settings = get_settings()
+    while True:
+        _wakeup.clear()
+        try:
+            processed = await process_next_job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("채점 워커 루프 오류")
+            processed = False
+
+        if not processed:
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=settings.evaluation_worker_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
@@ -17,6 +17,7 @@ async def create_evaluation(
     analysis_points: dict,
     feedback: str | None = None,
 ) -> Evaluation:
+    """평가를 추가한다 (커밋은 호출 측. 역량/상태 갱신과 한 트랜잭션으로 묶기 위해)."""
     evaluation = Evaluation(
         submission_id=submission_id,
         thread_id=thread_id,
@@ -28,8 +29,7 @@ async def create_evaluation(
         feedback=feedback,
     )
     db.add(evaluation)
-    await db.commit()
-    await db.refresh(evaluation)
+    await db.flush()
     return evaluation
 
 
@@ -60,6 +60,7 @@ async def update_user_competency(
     new_score: int,
     weak_tags: list[str] | None = None,
 ) -> UserCompetency:
+    """역량 평균을 갱신한다 (커밋은 호출 측)."""
     result = await db.execute(
         select(UserCompetency).where(
             UserCompetency.user_id == user_id,
@@ -86,6 +87,5 @@ async def update_user_competency(
         )
         db.add(competency)
 
-    await db.commit()
-    await db.refresh(competency)
+    await db.flush()
     return competency
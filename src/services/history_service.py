@@ -0,0 +1,96 @@
+"""질의응답 대화 기록 관리.
+
+최근 N개 메시지는 그대로 프롬프트에 넣고, 그 이전 메시지는 스레드에 저장된 누적 요약으로 접는다.
+요약은 새로 창 밖으로 밀려난 메시지만 기존 요약에 합쳐 갱신하므로 턴당 프롬프트 크기가 일정하게 유지된다.
+
+요약 갱신은 AI 응답을 저장한 뒤 백그라운드(batch 우선순위)에서 하고, 다음 턴은 저장된 요약을 쓴다.
+요약이 아직 따라오지 못한 메시지는 원문으로 넣으므로 대화가 빠지지는 않는다.
+"""
+
+import asyncio
+import contextvars
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import metrics
+from src.core.config import get_settings
+from src.core.database import open_session
+from src.models.database.message import Message
+from src.models.database.thread import Thread
+from src.services import ai_service, thread_service
+from src.services.ai_resilience import AiUnavailableError
+
+logger = logging.getLogger(__name__)
+
+_summary_tasks: dict[int, asyncio.Task] = {}
+
+_summary_failures_total = metrics.counter("history_summary_failures_total", "대화 요약 백그라운드 갱신 실패 수")
+
+
+def _split(thread: Thread, messages: list[Message]) -> tuple[list[Message], list[Message]]:
+    """(요약에 새로 접을 메시지, 원문으로 넣을 메시지)."""
+    keep = get_settings().history_recent_messages
+    recent = messages[-keep:] if keep > 0 else []
+    older = messages[: len(messages) - len(recent)]
+    # 아직 요약에 반영되지 않은, 창 밖으로 밀려난 메시지만 접는다
+    to_fold = [m for m in older if m.message_order > thread.summarized_until]
+    return to_fold, to_fold + recent
+
+
+def get_bounded_history(thread: Thread, messages: list[Message]) -> tuple[str | None, list[dict]]:
+    """(저장된 누적 요약, 원문으로 넣을 메시지 목록)을 반환한다. LLM을 호출하지 않는다."""
+    _, unsummarized = _split(thread, messages)
+    return thread.history_summary, [{"role": m.role, "content": m.content} for m in unsummarized]
+
+
+async def refresh_summary(db: AsyncSession, thread: Thread, messages: list[Message]):
+    """창 밖으로 밀려난 메시지를 누적 요약에 접어 저장한다."""
+    to_fold, _ = _split(thread, messages)
+    if not to_fold:
+        return
+    try:
+        thread.history_summary = await ai_service.summarize_history(
+            previous_summary=thread.history_summary,
+            conversation_history=[{"role": m.role, "content": m.content} for m in to_fold],
+        )
+    except AiUnavailableError:
+        # LLM 장애 중에는 요약을 미룬다 (다음 턴이 원문으로 넣고, 다음 갱신 때 다시 접는다)
+        return
+    thread.summarized_until = to_fold[-1].message_order
+    await db.commit()
+
+
+def schedule_refresh(thread_id: int):
+    """AI 응답을 저장한 직후 호출한다. 스레드당 하나만 실행한다."""
+    running = _summary_tasks.get(thread_id)
+    if running is not None and not running.done():
+        return
+    # 요청 컨텍스트를 물려받지 않도록 빈 컨텍스트에서 실행 (요청별 LLM 통계에 섞이지 않게)
+    _summary_tasks[thread_id] = asyncio.create_task(_refresh(thread_id), context=contextvars.Context())
+
+
+async def _refresh(thread_id: int):
+    try:
+        async with open_session() as db:
+            thread = await thread_service.get_thread_detail(db, thread_id)
+            if thread is None:
+                return
+            messages = await thread_service.get_thread_messages(db, thread_id)
+            # 사용자가 기다리는 호출이 아니므로 질의응답보다 뒤로 미룬다
+            with ai_service.batch_priority():
+                await refresh_summary(db, thread, messages)
+    except Exception:
+        _summary_failures_total.inc()
+        logger.exception("대화 요약 갱신 실패 thread_id=%s", thread_id)
+    finally:
+        _summary_tasks.pop(thread_id, None)
+
+
+async def shutdown():
+    """앱 종료 시 진행 중인 요약 갱신을 취소한다."""
+    tasks = [t for t in _summary_tasks.values() if not t.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _summary_tasks.clear()
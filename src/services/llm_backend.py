@@ -0,0 +1,213 @@
+"""ai_service가 사용하는 LLM 백엔드.
+
+- GeminiBackend: 실제 Gemini API (google-genai 비동기 클라이언트)
+- FakeBackend: 쿼터를 쓰지 않는 로컬 대역. 호출 함수별로 스키마에 맞는 고정 응답을 돌려주고,
+  설정한 지연/토큰 속도 프로필대로 응답(스트리밍 포함)을 늦춘다. 부하 테스트와 CI용.
+
+Settings.llm_backend로 선택한다 ("gemini" | "fake").
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from google import genai
+
+from src.services.ai_limiter import estimate_tokens
+
+
+@dataclass
+class LlmResponse:
+    text: str
+    # genai.types.GenerateContentResponseUsageMetadata (없을 수 있음)
+    usage_metadata: Any = None
+
+
+class LlmBackend(Protocol):
+    async def generate(
+        self, function: str, model: str, contents, config: genai.types.GenerateContentConfig | None
+    ) -> LlmResponse: ...
+
+    def stream(
+        self, function: str, model: str, contents, config: genai.types.GenerateContentConfig | None
+    ) -> AsyncIterator[LlmResponse]: ...
+
+    async def create_cache(self, model: str, contents: list[str], ttl_seconds: int, display_name: str) -> str: ...
+
+    async def delete_cache(self, name: str): ...
+
+    async def aclose(self): ...
+
+
+class GeminiBackend:
+    def __init__(self, api_key: str):
+        self._client = genai.Client(api_key=api_key)
+
+    async def generate(self, function, model, contents, config):
+        response = await self._client.aio.models.generate_content(model=model, contents=contents, config=config)
+        return LlmResponse(text=response.text, usage_metadata=response.usage_metadata)
+
+    async def stream(self, function, model, contents, config):
+        stream = await self._client.aio.models.generate_content_stream(model=model, contents=contents, config=config)
+        async for chunk in stream:
+            yield LlmResponse(text=chunk.text or "", usage_metadata=chunk.usage_metadata)
+
+    async def create_cache(self, model, contents, ttl_seconds, display_name):
+        cache = await self._client.aio.caches.create(
+            model=model,
+            config=genai.types.CreateCachedContentConfig(
+                contents=contents,
+                ttl=f"{ttl_seconds}s",
+                display_name=display_name,
+            ),
+        )
+        return cache.name
+
+    async def delete_cache(self, name):
+        await self._client.aio.caches.delete(name=name)
+
+    async def aclose(self):
+        await self._client.aio.aclose()
+        self._client.close()
+
+
+# ── 로컬 대역 ──
+
+_FAKE_NAMES = ["김민수", "이서연", "박지훈", "최유진", "정하늘"]
+_FAKE_DEPARTMENTS = ["백엔드 개발팀", "프론트엔드 개발팀", "데이터분석팀", "서비스기획팀", "UX디자인팀"]
+_FAKE_TAGS = ["기술 설계", "문제 정의", "데이터 분석", "사용자 경험", "협업 방식"]
+_FAKE_LABELS = [(90, "S"), (80, "A"), (70, "B"), (60, "C"), (0, "D")]
+
+_COUNT_PATTERN = re.compile(r"실무 과제 (\d+)개")
+_PERSONA_COUNT_PATTERN = re.compile(r"면접관 페르소나 (\d+)명")
+
+
+def _fake_tasks(seed: int, count: int) -> list[dict]:
+    return [
+        {
+            "title": f"샘플 실무 과제 {seed % 1000}-{i + 1}",
+            "description": "로컬 테스트용 과제입니다. 실제 서비스 상황을 가정해 문제를 정의하고 해결책을 제시하세요.",
+            "category": ["기획", "개발", "분석", "디자인"][(seed + i) % 4],
+            "difficulty": ["상", "중", "하"][(seed + i) % 3],
+            "estimated_minutes": 30 + (seed + i) % 4 * 15,
+            "answer_type": "text",
+            "key_points": ["문제 이해", "해결 방안의 타당성", "근거 제시"],
+            "tech_stack": ["Python", "SQL"],
+        }
+        for i in range(count)
+    ]
+
+
+def _fake_persona(seed: int) -> dict:
+    return {
+        "persona_name": _FAKE_NAMES[seed % len(_FAKE_NAMES)],
+        "persona_department": _FAKE_DEPARTMENTS[seed % len(_FAKE_DEPARTMENTS)],
+        "topic_tag": _FAKE_TAGS[seed % len(_FAKE_TAGS)],
+        "total_questions": 3 + seed % 3,
+    }
+
+
+def _fake_question(seed: int) -> str:
+    return f"제출하신 내용에서 가장 중요하다고 판단한 부분과 그 이유를 설명해주실 수 있나요? (질문 {seed % 100})"
+
+
+def _fake_evaluation(seed: int) -> dict:
+    scores = [60 + (seed >> (i * 4)) % 40 for i in range(4)]
+    total = sum(scores) // len(scores)
+    return {
+        "total_score": total,
+        "score_label": next(label for threshold, label in _FAKE_LABELS if total >= threshold),
+        "scores_detail": [
+            {"name": name, "score": score}
+            for name, score in zip(["문제 이해도", "실무 적합성", "논리적 사고", "커뮤니케이션"], scores)
+        ],
+        "ai_summary": "로컬 테스트용 채점 결과입니다. 과제 의도를 대체로 이해하고 있습니다.",
+        "analysis_points": {"strengths": ["문제 이해", "논리 전개"], "weaknesses": ["근거 부족", "대안 검토"]},
+        "feedback": "핵심 주장마다 근거를 보강하고 대안을 비교해보세요.",
+    }
+
+
+class FakeBackend:
+    """결정적인 로컬 LLM 대역. 같은 입력에는 항상 같은 응답을 돌려준다.
+
+    응답 시간 = latency_seconds(첫 토큰까지) + 출력 토큰 수 / tokens_per_second
+    """
+
+    def __init__(self, latency_seconds: float = 0.5, tokens_per_second: float = 200.0):
+        self.latency_seconds = latency_seconds
+        self.tokens_per_second = tokens_per_second
+        self._caches: dict[str, int] = {}  # 캐시 이름 -> 캐시된 토큰 수
+        self._cache_seq = 0
+
+    def _respond(self, function: str, contents) -> str:
+        prompt = contents if isinstance(contents, str) else str(contents)
+        seed = int.from_bytes(hashlib.sha256(prompt.encode()).digest()[:8], "big")
+        # 스키마 검증 실패 후 재요청은 원래 함수와 같은 형식으로 응답한다
+        function = function.removesuffix("_repair")
+
+        if function == "generate_tasks":
+            match = _COUNT_PATTERN.search(prompt)
+            return json.dumps(_fake_tasks(seed, int(match.group(1)) if match else 5), ensure_ascii=False)
+        if function == "generate_persona":
+            return json.dumps(_fake_persona(seed), ensure_ascii=False)
+        if function == "generate_personas":
+            match = _PERSONA_COUNT_PATTERN.search(prompt)
+            count = int(match.group(1)) if match else 5
+            return json.dumps([_fake_persona(seed + i) for i in range(count)], ensure_ascii=False)
+        if function == "generate_persona_with_first_question":
+            return json.dumps(
+                {**_fake_persona(seed), "first_question": _fake_question(seed)}, ensure_ascii=False
+            )
+        if function == "evaluate_submission":
+            return json.dumps(_fake_evaluation(seed), ensure_ascii=False)
+        if function == "summarize_history":
+            return "지원자는 제출물의 설계 의도를 설명했고, 근거 제시는 다소 부족했다."
+        return _fake_question(seed)
+
+    def _usage(self, contents, config, text: str):
+        prompt_tokens = estimate_tokens(contents if isinstance(contents, str) else str(contents))
+        cached_tokens = self._caches.get(config.cached_content, 0) if config and config.cached_content else 0
+        response_tokens = estimate_tokens(text)
+        return genai.types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt_tokens + cached_tokens,
+            cached_content_token_count=cached_tokens,
+            candidates_token_count=response_tokens,
+            total_token_count=prompt_tokens + cached_tokens + response_tokens,
+        )
+
+    def _output_seconds(self, text: str) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return estimate_tokens(text) / self.tokens_per_second
+
+    async def generate(self, function, model, contents, config):
+        text = self._respond(function, contents)
+        await asyncio.sleep(self.latency_seconds + self._output_seconds(text))
+        return LlmResponse(text=text, usage_metadata=self._usage(contents, config, text))
+
+    async def stream(self, function, model, contents, config):
+        text = self._respond(function, contents)
+        await asyncio.sleep(self.latency_seconds)
+        # 약 8자 단위 조각으로 나눠 토큰 속도에 맞춰 내보낸다
+        chunks = [text[i : i + 8] for i in range(0, len(text), 8)]
+        for i, chunk in enumerate(chunks):
+            if i > 0:
+                await asyncio.sleep(self._output_seconds(chunk))
+            last = i == len(chunks) - 1
+            yield LlmResponse(text=chunk, usage_metadata=self._usage(contents, config, text) if last else None)
+
+    async def create_cache(self, model, contents, ttl_seconds, display_name):
+        self._cache_seq += 1
+        name = f"cachedContents/fake-{self._cache_seq}"
+        self._caches[name] = sum(estimate_tokens(c) for c in contents)
+        return name
+
+    async def delete_cache(self, name):
+        self._caches.pop(name, None)
+
+    async def aclose(self):
+        self._caches.clear()
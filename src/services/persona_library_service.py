@@ -0,0 +1,152 @@
+"""(기업, 직무, 과제 카테고리)별 면접관 페르소나 라이브러리.
+
+페르소나는 기업/직무/과제 카테고리만으로 정해지므로 오프라인에서 미리 여러 개 만들어 두고
+(scripts/build_persona_library.py), 정식 제출 시 그중 하나를 무작위로 고른다.
+persona_library_target개가 채워지지 않은 조합은 즉석 생성하고, 그 페르소나도 라이브러리에 더해
+목표 개수에 이르면 다음 제출부터 라이브러리에서 고른다 (하나만으로 모든 제출에 같은 페르소나를 주지 않게).
+
+조합별 개수는 메모리에 두고 주기적으로 갱신한다. 덜 채워진 조합은 DB 조회 없이 바로 miss로 처리한다.
+"""
+
+import time
+
+from sqlalchemy import distinct, event, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.core import metrics
+from src.core.config import get_settings
+from src.models.database.persona import Persona
+from src.models.database.task import Task
+from src.models.schemas.ai import GeneratedPersona
+
+LibraryKey = tuple[int, int, str]
+
+# 커밋 전 추가분은 session.info에 조합별 개수로 모았다가 커밋이 끝난 뒤에만 반영한다
+_PENDING_KEY = "persona_library_pending"
+
+_counts: dict[LibraryKey, int] = {}  # 조합별 저장된 페르소나 수
+_covered: set[LibraryKey] = set()  # persona_library_target개 이상 채워진 조합
+_task_combinations = 0
+_refreshed_at: float | None = None
+
+_lookups_total = metrics.counter(
+    "persona_library_lookups_total",
+    "정식 제출 시 페르소나 라이브러리 조회 결과 (hit: 라이브러리 사용, miss: 즉석 생성 필요)",
+    ("result",),
+)
+_added_total = metrics.counter(
+    "persona_library_added_total",
+    "라이브러리에 추가한 페르소나 수 (build: 오프라인 생성, live: 즉석 생성분 저장)",
+    ("source",),
+)
+_combinations = metrics.gauge(
+    "persona_library_combinations",
+    "과제가 있는 (기업, 직무, 카테고리) 조합 수(total)와 그중 라이브러리가 채워진 조합 수(covered)",
+    ("state",),
+)
+_combinations.set_function(lambda: {("covered",): float(len(_covered)), ("total",): float(_task_combinations)})
+
+
+async def refresh_coverage(db: AsyncSession, force: bool = False):
+    """조합별 페르소나 수를 DB에서 다시 읽는다. force가 아니면 refresh 주기마다 한 번만."""
+    global _counts, _covered, _task_combinations, _refreshed_at
+    settings = get_settings()
+    now = time.monotonic()
+    if not force and _refreshed_at is not None and now - _refreshed_at < settings.persona_library_refresh_seconds:
+        return
+    _refreshed_at = now
+
+    _counts = await count_personas(db)
+    _covered = {key for key, n in _counts.items() if n >= settings.persona_library_target}
+    result = await db.execute(select(func.count(distinct(tuple_(Task.company_id, Task.job_role_id, Task.category)))))
+    _task_combinations = result.scalar_one()
+
+
+async def sample_persona(db: AsyncSession, company_id: int, job_role_id: int, category: str) -> GeneratedPersona | None:
+    """조합에 해당하는 페르소나 하나를 무작위로 고른다. 목표 개수만큼 채워지지 않았으면 None."""
+    if not get_settings().persona_library_enabled:
+        return None
+
+    await refresh_coverage(db)
+    persona = None
+    if (company_id, job_role_id, category) in _covered:
+        result = await db.execute(
+            select(Persona)
+            .where(
+                Persona.company_id == company_id,
+                Persona.job_role_id == job_role_id,
+                Persona.category == category,
+            )
+            .order_by(func.random())
+            .limit(1)
+        )
+        row = result.scalar_one_or_none()
+        if row is not None:
+            persona = GeneratedPersona.model_validate(row, from_attributes=True)
+
+    _lookups_total.inc(result="hit" if persona else "miss")
+    return persona
+
+
+async def is_covered(db: AsyncSession, company_id: int, job_role_id: int, category: str) -> bool:
+    if not get_settings().persona_library_enabled:
+        return False
+    await refresh_coverage(db)
+    return (company_id, job_role_id, category) in _covered
+
+
+async def count_personas(db: AsyncSession) -> dict[LibraryKey, int]:
+    """조합별 페르소나 수."""
+    result = await db.execute(
+        select(Persona.company_id, Persona.job_role_id, Persona.category, func.count()).group_by(
+            Persona.company_id, Persona.job_role_id, Persona.category
+        )
+    )
+    return {(company_id, job_role_id, category): n for company_id, job_role_id, category, n in result.all()}
+
+
+def add_personas(
+    db: AsyncSession,
+    company_id: int,
+    job_role_id: int,
+    category: str,
+    personas: list[GeneratedPersona],
+    source: str,
+):
+    """라이브러리에 페르소나를 추가한다 (커밋은 호출 측, 커밋이 끝나야 채워진 조합으로 표시한다)."""
+    if not get_settings().persona_library_enabled:
+        return
+    for persona in personas:
+        db.add(
+            Persona(
+                company_id=company_id,
+                job_role_id=job_role_id,
+                category=category,
+                persona_name=persona.persona_name,
+                persona_department=persona.persona_department,
+                topic_tag=persona.topic_tag,
+                total_questions=persona.total_questions,
+            )
+        )
+    if personas:
+        pending = db.sync_session.info.setdefault(_PENDING_KEY, {})
+        key = (company_id, job_role_id, category)
+        pending[key] = pending.get(key, 0) + len(personas)
+    _added_total.inc(len(personas), source=source)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_covered(session: Session):
+    target = get_settings().persona_library_target
+    for key, n in session.info.pop(_PENDING_KEY, {}).items():
+        _counts[key] = _counts.get(key, 0) + n
+        # 한두 개만으로 채워진 것으로 보면 모든 제출이 같은 페르소나를 받으므로 목표 개수까지는 계속 즉석 생성한다
+        if _counts[key] >= target:
+            _covered.add(key)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session: Session, previous_transaction):
+    # 롤백되면 페르소나가 저장되지 않았으므로 채워진 조합으로 표시하지 않는다
+    session.info.pop(_PENDING_KEY, None)
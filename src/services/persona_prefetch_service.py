@@ -0,0 +1,112 @@
+"""draft 저장 시 면접관 페르소나 사전 생성.
+
+draft 저장은 곧 정식 제출한다는 신호이므로, 그 시점에 백그라운드에서 페르소나를 만들어 제출물에 저장한다.
+정식 제출 시 만료되지 않은 페르소나가 있으면 첫 질문만 생성하면 된다.
+페르소나는 기업/직무/과제만으로 정해지므로 이후 draft 내용이 바뀌어도 그대로 쓸 수 있다.
+페르소나 라이브러리가 이미 채워진 조합이면 정식 제출 때 라이브러리에서 고르므로 사전 생성하지 않는다.
+"""
+
+import asyncio
+import contextvars
+import logging
+from datetime import datetime, timedelta, timezone
+
+from src.core import metrics
+from src.core.config import get_settings
+from src.core.database import open_session
+from src.models.database.submission import Submission
+from src.models.schemas.ai import GeneratedPersona
+from src.services import ai_service, persona_library_service, submission_service, task_service
+
+logger = logging.getLogger(__name__)
+
+_prefetch_tasks: dict[int, asyncio.Task] = {}
+
+_prefetch_total = metrics.counter(
+    "persona_prefetch_total",
+    "정식 제출 시 사전 생성 페르소나 사용 결과 (hit, miss, expired)",
+    ("result",),
+)
+_prefetch_failures_total = metrics.counter("persona_prefetch_failures_total", "페르소나 사전 생성 실패 수")
+
+
+def _is_fresh(submission: Submission) -> bool:
+    return (
+        submission.draft_persona is not None
+        and submission.draft_persona_expires_at is not None
+        and submission.draft_persona_expires_at > datetime.now(timezone.utc)
+    )
+
+
+def schedule(submission: Submission):
+    """draft 저장 직후 호출한다. 유효한 페르소나가 없으면 백그라운드 생성을 시작한다."""
+    if not get_settings().persona_prefetch_enabled or _is_fresh(submission):
+        return
+    running = _prefetch_tasks.get(submission.id)
+    if running is not None and not running.done():
+        return
+    # 요청 컨텍스트를 물려받지 않도록 빈 컨텍스트에서 실행 (요청별 LLM 통계에 섞이지 않게)
+    _prefetch_tasks[submission.id] = asyncio.create_task(_prefetch(submission.id), context=contextvars.Context())
+
+
+async def _prefetch(submission_id: int):
+    settings = get_settings()
+    try:
+        async with open_session() as db:
+            submission = await submission_service.get_submission(db, submission_id)
+            if submission is None or not submission.is_draft or _is_fresh(submission):
+                return
+            task = await task_service.get_task_detail(db, submission.task_id)
+            if task is None or await persona_library_service.is_covered(
+                db, task.company_id, task.job_role_id, task.category
+            ):
+                return
+            company_name, job_role_name = await task_service.get_company_and_job_role_names(db, task)
+
+            # 사용자가 기다리는 호출이 아니므로 질의응답보다 뒤로 미룬다
+            with ai_service.batch_priority():
+                persona = await ai_service.generate_persona(
+                    company_name=company_name,
+                    job_role_name=job_role_name,
+                    task_title=task.title,
+                )
+
+            # 생성하는 동안 정식 제출됐으면 저장하지 않는다
+            await db.refresh(submission)
+            if not submission.is_draft:
+                return
+            submission.draft_persona = persona.model_dump()
+            persona_library_service.add_personas(
+                db, task.company_id, task.job_role_id, task.category, [persona], source="live"
+            )
+            submission.draft_persona_expires_at = datetime.now(timezone.utc) + timedelta(
+                seconds=settings.persona_prefetch_ttl_seconds
+            )
+            await db.commit()
+    except Exception:
+        _prefetch_failures_total.inc()
+        logger.exception("페르소나 사전 생성 실패 submission_id=%s", submission_id)
+    finally:
+        _prefetch_tasks.pop(submission_id, None)
+
+
+def take_persona(submission: Submission) -> GeneratedPersona | None:
+    """정식 제출 시 사전 생성된 페르소나를 꺼낸다. 만료됐거나 없으면 None. 꺼낸 뒤 컬럼은 비운다 (커밋은 호출 측)."""
+    if submission.draft_persona is None:
+        _prefetch_total.inc(result="miss")
+        return None
+
+    persona = GeneratedPersona.model_validate(submission.draft_persona) if _is_fresh(submission) else None
+    _prefetch_total.inc(result="hit" if persona else "expired")
+    submission.draft_persona = None
+    submission.draft_persona_expires_at = None
+    return persona
+
+
+async def shutdown():
+    """앱 종료 시 진행 중인 사전 생성 작업을 취소한다."""
+    tasks = [t for t in _prefetch_tasks.values() if not t.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _prefetch_tasks.clear()
@@ -0,0 +1,248 @@
+"""ai_service가 쓰는 프롬프트 템플릿과 토큰 예산.
+
+- PromptTemplate: str.format 문법의 템플릿을 모듈 로드 시 한 번만 파싱해 두고, 호출 때는 조각만 이어붙인다
+- truncate / fit_history: 과제 설명, 제출물, 대화 기록을 섹션별 토큰 예산에 맞게 줄인다
+- record_prompt_size: 실제로 보내는 최종 프롬프트의 추정 토큰 수를 기록한다
+
+토큰 수는 ai_limiter.estimate_tokens와 같은 기준(2자당 1토큰)으로 추정한다.
+"""
+
+from string import Formatter
+
+from src.core import metrics
+from src.services.ai_limiter import CHARS_PER_TOKEN, estimate_tokens
+
+_prompt_estimated_tokens = metrics.histogram(
+    "ai_prompt_estimated_tokens",
+    "호출 직전 최종 프롬프트의 추정 토큰 수 (컨텍스트 캐시로 보낸 부분 제외)",
+    ("function",),
+    buckets=(256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536),
+)
+_truncations_total = metrics.counter(
+    "ai_prompt_truncations_total",
+    "토큰 예산을 넘어 잘라낸 프롬프트 섹션 수",
+    ("section",),
+)
+
+
+class PromptTemplate:
+    """미리 파싱해 둔 프롬프트 템플릿. 필드는 {name} 형식만 쓰고, 중괄호 문자는 {{ }}로 쓴다."""
+
+    def __init__(self, template: str):
+        self._parts: list[tuple[str, str | None]] = []
+        for literal, field, spec, conversion in Formatter().parse(template):
+            if spec or conversion:
+                raise ValueError(f"프롬프트 템플릿에는 서식 지정을 쓰지 않습니다: {field}")
+            self._parts.append((literal, field))
+        self.fields = frozenset(field for _, field in self._parts if field)
+
+    def render(self, **values) -> str:
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"프롬프트 템플릿 값 누락: {sorted(missing)}")
+        return "".join(literal + (str(values[field]) if field else "") for literal, field in self._parts)
+
+
+def truncate(text: str, max_tokens: int, section: str, head_ratio: float = 0.7) -> str:
+    """예산을 넘으면 앞부분(head_ratio)과 뒷부분을 남기고 가운데를 생략한다. max_tokens가 0 이하면 그대로.
+
+    제출물은 도입부와 결론이 모두 중요하므로 양쪽을 남기고, 가능하면 줄바꿈 위치에서 자른다.
+    """
+    if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+        return text
+    _truncations_total.inc(section=section)
+
+    budget = max_tokens * CHARS_PER_TOKEN
+    head_len = int(budget * head_ratio)
+    tail_len = budget - head_len
+
+    head = text[:head_len]
+    cut = head.rfind("\n", int(head_len * 0.8))
+    if cut > 0:
+        head = head[:cut]
+    tail = text[len(text) - tail_len :] if tail_len > 0 else ""
+    cut = tail.find("\n", 0, int(tail_len * 0.2))
+    if cut >= 0:
+        tail = tail[cut + 1 :]
+
+    omitted = len(text) - len(head) - len(tail)
+    return f"{head}\n...(중략: {omitted}자 생략)...\n{tail}".rstrip("\n")
+
+
+def fit_history(conversation_history: list[dict], max_tokens: int) -> list[dict]:
+    """오래된 메시지부터 빼서 예산에 맞춘다. 마지막 메시지는 남기되, 그것도 넘치면 내용을 자른다."""
+    if max_tokens <= 0 or not conversation_history:
+        return conversation_history
+
+    kept: list[dict] = []
+    used = 0
+    for message in reversed(conversation_history):
+        tokens = estimate_tokens(message["content"])
+        if kept and used + tokens > max_tokens:
+            break
+        kept.append(message)
+        used += tokens
+    if len(kept) < len(conversation_history):
+        _truncations_total.inc(section="history")
+
+    kept.reverse()
+    if used > max_tokens:
+        last = kept[-1]
+        kept[-1] = {**last, "content": truncate(last["content"], max_tokens, "history_message")}
+    return kept
+
+
+def record_prompt_size(function: str, contents) -> int:
+    """최종 프롬프트의 추정 토큰 수를 기록하고 반환한다."""
+    tokens = estimate_tokens(contents if isinstance(contents, str) else str(contents))
+    _prompt_estimated_tokens.observe(tokens, function=function)
+    return tokens
+
+
+# ── 템플릿 ──
+
+GENERATE_TASKS = PromptTemplate("""당신은 기업 실무 과제를 만드는 전문가입니다.
+
+다음 조건에 맞는 실무 과제 {count}개를 생성해주세요:
+- 기업: {company_name}
+- 직무: {job_role_name}
+
+각 과제는 실제 해당 기업의 해당 직무에서 수행할 법한 실무 과제여야 합니다.
+
+JSON 배열로 응답해주세요. 각 항목:
+{{
+  "title": "과제 제목",
+  "description": "과제 상세 설명 (3-5문장)",
+  "category": "과제 카테고리 (예: 기획, 개발, 분석, 디자인)",
+  "difficulty": "상/중/하 중 하나",
+  "estimated_minutes": 예상 소요 시간(분, 정수),
+  "answer_type": "text",
+  "key_points": ["핵심 평가 포인트1", "핵심 평가 포인트2", "핵심 평가 포인트3"],
+  "tech_stack": ["관련 기술1", "관련 기술2"]
+}}""")
+
+GENERATE_PERSONA = PromptTemplate("""당신은 면접관 페르소나를 만드는 전문가입니다.
+
+다음 상황에 맞는 면접관 페르소나를 생성해주세요:
+- 기업: {company_name}
+- 직무: {job_role_name}
+- 과제: {task_title}
+
+면접관은 해당 기업의 실무 담당자(팀장급)로, 제출된 과제에 대해 의도와 이해도를 파악하는 질의응답을 진행합니다.
+
+JSON으로 응답해주세요:
+{{
+  "persona_name": "면접관 이름 (한국어, 예: 김민수)",
+  "persona_department": "소속 부서 (예: 프론트엔드 개발팀)",
+  "topic_tag": "질의 주제 태그 (예: 기술 설계)",
+  "total_questions": 질문 수(3~5 사이 정수)
+}}""")
+
+GENERATE_PERSONAS = PromptTemplate("""당신은 면접관 페르소나를 만드는 전문가입니다.
+
+다음 상황에 맞는 서로 다른 면접관 페르소나 {count}명을 생성해주세요:
+- 기업: {company_name}
+- 직무: {job_role_name}
+- 과제 카테고리: {category}
+
+면접관은 해당 기업의 실무 담당자(팀장급)로, 제출된 과제에 대해 의도와 이해도를 파악하는 질의응답을 진행합니다.
+이름, 부서, 질의 주제가 서로 겹치지 않게 해주세요.
+
+JSON 배열로 응답해주세요. 각 항목:
+{{
+  "persona_name": "면접관 이름 (한국어, 예: 김민수)",
+  "persona_department": "소속 부서 (예: 프론트엔드 개발팀)",
+  "topic_tag": "질의 주제 태그 (예: 기술 설계)",
+  "total_questions": 질문 수(3~5 사이 정수)
+}}""")
+
+FIRST_QUESTION = PromptTemplate("""당신은 {company_name}의 {persona_department} 소속 {persona_name}입니다.
+
+지원자가 다음 과제를 제출했습니다:
+- 과제: {task_title}
+- 과제 설명: {task_description}
+- 제출 내용: {submission_content}
+
+제출물을 검토한 후, 지원자의 의도와 이해도를 파악하기 위한 첫 번째 질문을 해주세요.
+질문은 구체적이고 실무적이어야 합니다. 질문만 작성해주세요.""")
+
+PERSONA_WITH_FIRST_QUESTION = PromptTemplate(
+    """당신은 면접관 페르소나를 만들고, 그 면접관으로서 첫 질문을 하는 전문가입니다.
+
+다음 상황에 맞는 면접관 페르소나를 생성해주세요:
+- 기업: {company_name}
+- 직무: {job_role_name}
+- 과제: {task_title}
+
+면접관은 해당 기업의 실무 담당자(팀장급)로, 제출된 과제에 대해 의도와 이해도를 파악하는 질의응답을 진행합니다.
+
+지원자가 제출한 내용은 다음과 같습니다:
+- 과제 설명: {task_description}
+- 제출 내용: {submission_content}
+
+생성한 면접관의 입장에서 제출물을 검토한 후, 지원자의 의도와 이해도를 파악하기 위한 첫 번째 질문도 함께 작성해주세요.
+질문은 구체적이고 실무적이어야 합니다.
+
+JSON으로 응답해주세요:
+{{
+  "persona_name": "면접관 이름 (한국어, 예: 김민수)",
+  "persona_department": "소속 부서 (예: 프론트엔드 개발팀)",
+  "topic_tag": "질의 주제 태그 (예: 기술 설계)",
+  "total_questions": 질문 수(3~5 사이 정수),
+  "first_question": "첫 번째 질문 (질문 문장만)"
+}}"""
+)
+
+SUMMARIZE_HISTORY = PromptTemplate("""다음은 과제 질의응답 면접의 대화 요약과, 요약 이후 이어진 대화입니다.
+두 내용을 합쳐 하나의 요약으로 갱신해주세요.
+면접관이 물어본 핵심 질문과 지원자의 답변 요지, 드러난 강점/약점을 빠짐없이 간결하게 남겨주세요.
+요약만 작성해주세요.
+
+기존 요약:
+{previous_summary}
+
+이어진 대화:
+{history}""")
+
+INTERVIEW_CONTEXT = PromptTemplate("""[면접 컨텍스트]
+기업: {company_name}
+직무: {job_role_name}
+과제: {task_title}
+과제 설명: {task_description}
+핵심 평가 포인트: {key_points}
+
+지원자 제출물:
+{submission_content}""")
+
+FOLLOW_UP = PromptTemplate("""당신은 {company_name}의 {persona_department} 소속 {persona_name}입니다.
+위 과제와 지원자 제출물에 대해 질의응답을 진행하고 있습니다.
+
+지금까지의 대화:
+{history}
+
+이것은 {total_questions}개 질문 중 {question_number}번째 질문입니다.
+이전 대화를 바탕으로 지원자의 이해도를 더 깊이 파악할 수 있는 후속 질문을 해주세요.
+질문만 작성해주세요.""")
+
+EVALUATE = PromptTemplate("""당신은 채점 전문가입니다. 위 과제 제출물과 아래 질의응답을 기반으로 채점해주세요.
+
+질의응답:
+{history}
+
+다음 JSON 형식으로 채점해주세요:
+{{
+  "total_score": 총점(0-100),
+  "score_label": "등급 (S/A/B/C/D 중 하나)",
+  "scores_detail": [
+    {{"name": "문제 이해도", "score": 점수(0-100)}},
+    {{"name": "실무 적합성", "score": 점수(0-100)}},
+    {{"name": "논리적 사고", "score": 점수(0-100)}},
+    {{"name": "커뮤니케이션", "score": 점수(0-100)}}
+  ],
+  "ai_summary": "전반적인 평가 요약 (2-3문장)",
+  "analysis_points": {{
+    "strengths": ["강점1", "강점2"],
+    "weaknesses": ["약점1", "약점2"]
+  }},
+  "feedback": "구체적인 피드백 및 개선 방향 (2-3문장)"
+}}""")
@@ -0,0 +1,102 @@
+"""LLM 장애 시 사용하는 대체 질문/페르소나.
+
+서킷이 열려 있을 때 질의응답이 멈추지 않도록 과제 카테고리와 topic_tag로 미리 준비된 질문을 고른다.
+topic_tag는 AI가 자유롭게 만든 값이므로 키워드 포함 여부로 매칭한다.
+"""
+
+from src.core import metrics
+from src.models.schemas.ai import GeneratedPersonaWithQuestion
+
+_fallbacks_total = metrics.counter(
+    "interview_fallbacks_total",
+    "LLM 대신 대체 질문/페르소나를 사용한 횟수",
+    ("kind",),
+)
+
+# topic_tag 키워드 -> 질문
+_QUESTIONS_BY_TOPIC: dict[str, list[str]] = {
+    "설계": [
+        "현재 설계에서 가장 먼저 병목이 될 부분은 어디라고 보시나요? 그때 어떻게 확장하시겠어요?",
+        "이 구조를 선택하면서 검토했다가 버린 대안이 있다면, 버린 이유는 무엇인가요?",
+    ],
+    "성능": [
+        "성능 개선 효과를 어떤 지표로 측정하고 검증하실 계획인가요?",
+        "트래픽이 10배로 늘어난다면 제출하신 방식에서 무엇이 가장 먼저 문제가 될까요?",
+    ],
+    "데이터": [
+        "이 분석에서 데이터 품질 문제가 있다면 결론이 어떻게 달라질 수 있을까요?",
+        "제시한 지표 외에 함께 봐야 할 보조 지표가 있다면 무엇인가요?",
+    ],
+    "사용자": [
+        "이 결정이 가장 불리하게 작용하는 사용자 집단은 누구이고, 어떻게 보완하시겠어요?",
+        "사용자 반응을 검증하기 위해 출시 전에 어떤 실험을 해보시겠어요?",
+    ],
+    "협업": [
+        "이 작업을 다른 팀과 함께 진행한다면 어떤 합의가 먼저 필요할까요?",
+        "일정이 절반으로 줄어든다면 무엇을 남기고 무엇을 포기하시겠어요?",
+    ],
+}
+
+# 과제 카테고리 -> 질문
+_QUESTIONS_BY_CATEGORY: dict[str, list[str]] = {
+    "개발": [
+        "장애가 발생했을 때 이 구현에서 어떤 부분을 가장 먼저 확인하시겠어요?",
+        "이 코드를 테스트한다면 어떤 케이스부터 검증하시겠어요?",
+        "운영 환경에 배포할 때 추가로 고려해야 할 점은 무엇인가요?",
+    ],
+    "기획": [
+        "이 기획의 성공 여부를 판단할 핵심 지표는 무엇이고, 목표치는 어떻게 정하셨나요?",
+        "우선순위를 정할 때 가장 중요하게 본 기준은 무엇인가요?",
+        "이해관계자가 반대한다면 어떤 근거로 설득하시겠어요?",
+    ],
+    "분석": [
+        "분석 결과를 의사결정자에게 한 문장으로 전달한다면 어떻게 말씀하시겠어요?",
+        "상관관계와 인과관계를 구분하기 위해 어떤 점을 확인하셨나요?",
+        "추가 데이터를 하나만 더 얻을 수 있다면 무엇을 요청하시겠어요?",
+    ],
+    "디자인": [
+        "이 디자인에서 사용자가 가장 헷갈릴 수 있는 지점은 어디라고 보시나요?",
+        "접근성 측면에서 추가로 고려한 점이 있나요?",
+        "디자인 의도를 개발자에게 전달할 때 무엇을 가장 강조하시겠어요?",
+    ],
+}
+
+_GENERIC_QUESTIONS = [
+    "제출물에서 가장 중요하다고 생각하는 부분과 그 이유를 설명해주세요.",
+    "이 과제를 다시 한다면 가장 먼저 바꾸고 싶은 부분은 무엇인가요?",
+    "제출하신 방식의 가장 큰 한계나 리스크는 무엇이라고 보시나요?",
+    "이 결과물을 실제 업무에 적용한다면 어떤 추가 작업이 필요할까요?",
+]
+
+_DEPARTMENTS = {"개발": "개발팀", "기획": "서비스기획팀", "분석": "데이터분석팀", "디자인": "디자인팀"}
+_TOPICS = {"개발": "기술 설계", "기획": "문제 정의", "분석": "데이터 분석", "디자인": "사용자 경험"}
+
+
+def _candidates(category: str | None, topic_tag: str | None) -> list[str]:
+    questions = []
+    if topic_tag:
+        for keyword, items in _QUESTIONS_BY_TOPIC.items():
+            if keyword in topic_tag:
+                questions += items
+    questions += _QUESTIONS_BY_CATEGORY.get(category or "", [])
+    return questions + _GENERIC_QUESTIONS
+
+
+def pick_question(category: str | None, topic_tag: str | None, question_number: int) -> str:
+    """question_number(1부터)에 따라 후보를 차례로 골라 한 스레드 안에서 같은 질문이 반복되지 않게 한다."""
+    _fallbacks_total.inc(kind="question")
+    questions = _candidates(category, topic_tag)
+    return questions[(question_number - 1) % len(questions)]
+
+
+def default_persona(category: str | None) -> GeneratedPersonaWithQuestion:
+    """제출 시 LLM을 쓸 수 없을 때의 기본 면접관과 첫 질문."""
+    _fallbacks_total.inc(kind="persona")
+    topic_tag = _TOPICS.get(category or "", "과제 이해")
+    return GeneratedPersonaWithQuestion(
+        persona_name="김태스크",
+        persona_department=_DEPARTMENTS.get(category or "", "실무팀"),
+        topic_tag=topic_tag,
+        total_questions=3,
+        first_question=pick_question(category, topic_tag, 1),
+    )
@@ -46,6 +46,15 @@ async def update_submission(
     return submission
 
 
+async def revert_to_draft(db: AsyncSession, submission: Submission) -> Submission:
+    """질의응답 스레드를 만들기 전에 제출이 중단되면 draft로 되돌려 다시 제출할 수 있게 한다."""
+    submission.is_draft = True
+    submission.status = "draft"
+    await db.commit()
+    await db.refresh(submission)
+    return submission
+
+
 async def get_submission(db: AsyncSession, submission_id: int) -> Submission | None:
     result = await db.execute(
         select(Submission).where(Submission.id == submission_id)
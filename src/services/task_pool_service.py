@@ -0,0 +1,90 @@
+"""(기업, 직무)별 사전 생성 과제 풀.
+
+AI가 미리 생성한 과제를 메모리에 쌓아두고 POST /tasks/generate 요청 시 즉시 꺼내준다.
+풀이 low-water mark 아래로 내려가면 백그라운드에서 generate_tasks로 target까지 다시 채운다.
+꺼낸 과제의 DB 저장은 호출 측에서 task_service.create_tasks_batch로 처리한다.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections import deque
+
+from src.core import metrics
+from src.core.config import get_settings
+from src.models.schemas.ai import GeneratedTask
+from src.services import ai_service
+
+logger = logging.getLogger(__name__)
+
+PoolKey = tuple[int, int]
+
+_pools: dict[PoolKey, deque[GeneratedTask]] = {}
+_refill_tasks: dict[PoolKey, asyncio.Task] = {}
+
+_requests_total = metrics.counter(
+    "task_pool_requests_total",
+    "과제 풀 요청 수 (hit: 풀에서 모두 충족, miss: 즉시 생성 필요)",
+    ("result",),
+)
+_refill_seconds = metrics.histogram(
+    "task_pool_refill_seconds",
+    "과제 풀 보충을 위한 generate_tasks 1회 호출 시간",
+)
+_refill_failures_total = metrics.counter("task_pool_refill_failures_total", "과제 풀 보충 실패 수")
+_depth = metrics.gauge("task_pool_depth", "(기업, 직무)별 대기 중인 과제 수", ("company_id", "job_role_id"))
+_depth.set_function(lambda: {(str(k[0]), str(k[1])): float(len(v)) for k, v in _pools.items()})
+
+
+def take_tasks(company_id: int, job_role_id: int, count: int) -> list[GeneratedTask]:
+    """풀에서 최대 count개의 생성된 과제를 꺼낸다. 부족하면 있는 만큼만 반환한다."""
+    pool = _pools.setdefault((company_id, job_role_id), deque())
+    taken = [pool.popleft() for _ in range(min(count, len(pool)))]
+    _requests_total.inc(result="hit" if len(taken) == count else "miss")
+    return taken
+
+
+def ensure_refill(company_id: int, job_role_id: int, company_name: str, job_role_name: str):
+    """풀이 low-water mark 미만이면 백그라운드 보충 작업을 시작한다."""
+    settings = get_settings()
+    key = (company_id, job_role_id)
+    if len(_pools.get(key, ())) >= settings.task_pool_low_water:
+        return
+    running = _refill_tasks.get(key)
+    if running is not None and not running.done():
+        return
+    # 요청 컨텍스트를 물려받지 않도록 빈 컨텍스트에서 실행 (요청별 LLM 통계에 섞이지 않게)
+    _refill_tasks[key] = asyncio.create_task(
+        _refill(key, company_name, job_role_name), context=contextvars.Context()
+    )
+
+
+async def _refill(key: PoolKey, company_name: str, job_role_name: str):
+    settings = get_settings()
+    pool = _pools.setdefault(key, deque())
+    while len(pool) < settings.task_pool_target:
+        started = time.perf_counter()
+        try:
+            generated = await ai_service.generate_tasks(
+                company_name=company_name,
+                job_role_name=job_role_name,
+                count=settings.task_pool_refill_batch,
+                # 보충은 매번 새 과제가 필요하므로 동일 요청 공유/결과 캐시를 쓰지 않는다
+                shared=False,
+            )
+        except Exception:
+            _refill_failures_total.inc()
+            logger.exception("과제 풀 보충 실패 company_id=%s job_role_id=%s", *key)
+            return
+        _refill_seconds.observe(time.perf_counter() - started)
+        pool.extend(generated)
+
+
+async def shutdown():
+    """앱 종료 시 진행 중인 보충 작업을 취소한다."""
+    tasks = [t for t in _refill_tasks.values() if not t.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _refill_tasks.clear()
@@ -1,6 +1,8 @@
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.models.database.company import Company
+from src.models.database.job_role import JobRole
 from src.models.database.task import Task
 
 
@@ -45,6 +47,15 @@ async def get_task_detail(db: AsyncSession, task_id: int) -> Task | None:
     return result.scalar_one_or_none()
 
 
+async def get_company_and_job_role_names(db: AsyncSession, task: Task) -> tuple[str, str]:
+    """과제의 기업명, 직무명을 조회한다."""
+    company = (await db.execute(select(Company).where(Company.id == task.company_id))).scalar_one_or_none()
+    job_role = (await db.execute(select(JobRole).where(JobRole.id == task.job_role_id))).scalar_one_or_none()
+    company_name = company.name if company else "알 수 없는 기업"
+    job_role_name = job_role.name if job_role else "알 수 없는 직무"
+    return company_name, job_role_name
+
+
 async def create_tasks_batch(db: AsyncSession, tasks_data: list[dict]) -> list[Task]:
     tasks = [Task(**data) for data in tasks_data]
     db.add_all(tasks)
@@ -1,8 +1,11 @@
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.database.message import Message
+from src.models.database.submission import Submission
+from src.models.database.task import Task
 from src.models.database.thread import Thread
+from src.services import task_service
 
 
 async def create_thread_with_first_message(
@@ -108,10 +111,21 @@ async def add_ai_message(
     return message
 
 
-async def complete_thread(db: AsyncSession, thread: Thread) -> Thread:
-    thread.status = "completed"
+async def delete_message(db: AsyncSession, message_id: int):
+    """AI 응답 없이 남은 유저 메시지를 지운다 (연결 끊김 등으로 턴이 중단됐을 때, 재전송할 수 있게)."""
+    await db.execute(delete(Message).where(Message.id == message_id))
     await db.commit()
-    await db.refresh(thread)
+
+
+def complete_thread(thread: Thread) -> Thread:
+    """채점이 끝난 스레드를 완료 처리한다 (커밋은 호출 측).
+
+    컨텍스트 캐시는 호출 측이 커밋 뒤 ai_service.release_context_cache로 지우므로 저장된 이름도 비운다.
+    """
+    thread.status = "completed"
+    thread.context_cache_name = None
+    thread.context_cache_model = None
+    thread.context_cache_expires_at = None
     return thread
 
 
@@ -129,3 +143,20 @@ async def get_thread_by_submission_id(
         select(Thread).where(Thread.submission_id == submission_id)
     )
     return result.scalar_one_or_none()
+
+
+async def get_interview_context(
+    db: AsyncSession, thread: Thread
+) -> tuple[Submission | None, Task | None, str, str]:
+    """스레드의 제출물, 과제, 기업명, 직무명을 조회한다."""
+    submission = (
+        await db.execute(select(Submission).where(Submission.id == thread.submission_id))
+    ).scalar_one_or_none()
+    task = None
+    if submission:
+        task = (await db.execute(select(Task).where(Task.id == submission.task_id))).scalar_one_or_none()
+
+    if task is None:
+        return submission, task, "알 수 없는 기업", "알 수 없는 직무"
+    company_name, job_role_name = await task_service.get_company_and_job_role_names(db, task)
+    return submission, task, company_name, job_role_name
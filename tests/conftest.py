@@ -0,0 +1,121 @@
+"""테스트 공통 fixture.
+
+DB는 가짜 세션(FakeSession), LLM은 FakeBackend로 대신한다. 앱은 httpx.ASGITransport로 같은 태스크에서 호출하므로
+assert_max_queries가 요청 안에서 실행한 SQL까지 센다.
+"""
+
+import os
+
+os.environ.setdefault("USE_ENV_FILE", "true")
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+from collections import defaultdict  # noqa: E402
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.orm import InstrumentedAttribute  # noqa: E402
+
+from src.core.auth import get_current_user_id  # noqa: E402
+from src.core.database import get_db, get_read_db, record_query  # noqa: E402
+from src.main import app  # noqa: E402
+from src.services import ai_service  # noqa: E402
+from src.services.llm_backend import FakeBackend  # noqa: E402
+
+USER_ID = 1
+
+
+class FakeResult:
+    def __init__(self, rows: list):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self) -> list:
+        return list(self._rows)
+
+    def scalar(self):
+        return self._rows[0] if self._rows else None
+
+    def scalar_one_or_none(self):
+        return self.scalar()
+
+    def scalar_one(self):
+        return self._rows[0]
+
+
+class FakeSession:
+    """모델별 행 목록을 돌려주는 조회 전용 가짜 세션. WHERE 조건은 보지 않는다.
+
+    실행한 SQL은 엔진 이벤트와 같은 record_query로 기록하므로 쿼리 예산/요청 통계에 그대로 잡힌다.
+    """
+
+    def __init__(self):
+        self.rows: dict[type, list] = defaultdict(list)
+
+    def add_rows(self, *objects):
+        for obj in objects:
+            self.rows[type(obj)].append(obj)
+
+    async def execute(self, statement, params=None):
+        record_query(str(statement.compile(dialect=postgresql.dialect())), 0.0)
+        column = statement.column_descriptions[0]
+        rows = self.rows.get(column["entity"], [])
+        expr = column["expr"]
+        if isinstance(expr, type):
+            return FakeResult(rows)
+        if isinstance(expr, InstrumentedAttribute):
+            return FakeResult([getattr(row, column["name"]) for row in rows])
+        if column["name"] == "count":
+            return FakeResult([len(rows)])
+        return FakeResult([None])
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def user_id() -> int:
+    """client로 보낸 요청의 인증 사용자."""
+    return USER_ID
+
+
+@pytest.fixture
+def db() -> FakeSession:
+    return FakeSession()
+
+
+@pytest.fixture
+async def client(db: FakeSession):
+    async def _get_db():
+        yield db
+
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_read_db] = _get_db
+    app.dependency_overrides[get_current_user_id] = lambda: USER_ID
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture(autouse=True)
+def fake_llm():
+    """테스트마다 FakeBackend(지연 없음)와 새 제한기/서킷 브레이커/결과 캐시로 시작한다."""
+    ai_service._backend = FakeBackend(latency_seconds=0, tokens_per_second=0)
+    ai_service._limiter = None
+    ai_service._breaker = None
+    ai_service._result_cache.clear()
+    ai_service._in_flight.clear()
+    yield ai_service._backend
+    ai_service._backend = None
+    ai_service._limiter = None
+    ai_service._breaker = None
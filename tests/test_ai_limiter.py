@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from src.services import ai_service
+from src.services.ai_limiter import AiLimiter, AiOverloadedError
+
+
+def _limiter(**kwargs) -> AiLimiter:
+    options = {"max_concurrency": 1, "tokens_per_minute": 0, "max_queue": 2, "queue_timeout": 1.0}
+    return AiLimiter(**(options | kwargs))
+
+
+async def _queued(limiter: AiLimiter, priority: str, granted: list[str]) -> asyncio.Task:
+    async def acquire():
+        await limiter.acquire(1, priority)
+        granted.append(priority)
+
+    task = asyncio.create_task(acquire())
+    await asyncio.sleep(0)
+    return task
+
+
+async def test_grants_immediately_when_slot_free():
+    limiter = _limiter()
+
+    await limiter.acquire(1)
+
+    assert limiter.waiting == 0
+
+
+async def test_rejects_when_queue_full():
+    limiter = _limiter(max_queue=1)
+    await limiter.acquire(1)
+    waiter = await _queued(limiter, "interactive", [])
+
+    with pytest.raises(AiOverloadedError) as exc_info:
+        await limiter.acquire(1)
+
+    assert exc_info.value.reason == "queue_full"
+    assert exc_info.value.retry_after >= 1
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+
+async def test_interactive_before_batch():
+    limiter = _limiter()
+    await limiter.acquire(1)
+    granted: list[str] = []
+    batch = await _queued(limiter, "batch", granted)
+    interactive = await _queued(limiter, "interactive", granted)
+
+    limiter.release(1, None, 0.0)
+    await interactive
+    limiter.release(1, None, 0.0, "interactive")
+    await batch
+
+    assert granted == ["interactive", "batch"]
+
+
+async def test_aged_batch_goes_first():
+    limiter = _limiter(batch_max_wait=0.0)
+    await limiter.acquire(1)
+    granted: list[str] = []
+    batch = await _queued(limiter, "batch", granted)
+    interactive = await _queued(limiter, "interactive", granted)
+
+    limiter.release(1, None, 0.0)
+    await batch
+    limiter.release(1, None, 0.0, "batch")
+    await interactive
+
+    assert granted == ["batch", "interactive"]
+
+
+async def test_timed_out_waiter_leaves_queue():
+    limiter = _limiter(max_queue=1, queue_timeout=0.01)
+    await limiter.acquire(1)
+
+    with pytest.raises(AiOverloadedError) as exc_info:
+        await limiter.acquire(1)
+
+    assert exc_info.value.reason == "timeout"
+    assert limiter.waiting == 0
+    # 시간 초과된 대기자가 자리를 차지하지 않으므로 바로 다시 줄을 설 수 있다
+    limiter.check_admission()
+
+
+async def test_cancelled_waiter_leaves_queue():
+    limiter = _limiter()
+    await limiter.acquire(1)
+    waiter = await _queued(limiter, "interactive", [])
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    assert limiter.waiting == 0
+
+
+async def test_overloaded_request_gets_503_with_retry_after(client):
+    ai_service._limiter = _limiter(max_queue=0)
+    # 슬롯을 모두 차지해 다음 호출은 줄을 서야 한다
+    await ai_service._limiter.acquire(1, "batch")
+
+    response = await client.post("/dev/ai/generate-persona", json={})
+
+    assert response.status_code == 503
+    assert response.json()["detail"]["code"] == "AI_OVERLOADED"
+    assert int(response.headers["retry-after"]) >= 1
+
+
+async def test_persona_generated_through_fake_backend(client):
+    response = await client.post("/dev/ai/generate-persona", json={})
+
+    assert response.status_code == 200
+    assert response.json()["data"]["persona_name"]
@@ -0,0 +1,98 @@
+import httpx
+import pytest
+
+from src.services import ai_service
+from src.services.ai_resilience import AiUnavailableError, CircuitBreaker
+
+NETWORK_ERROR = httpx.ConnectError("connection refused")
+
+
+def _breaker(**kwargs) -> CircuitBreaker:
+    options = {"window": 4, "min_calls": 4, "failure_rate": 0.5, "open_seconds": 30.0}
+    return CircuitBreaker(**(options | kwargs))
+
+
+def test_opens_when_failure_rate_reached():
+    breaker = _breaker()
+    for error in (None, None, NETWORK_ERROR):
+        breaker.record(False, error, 0.1, 20.0)
+    assert breaker.state == "closed"
+
+    breaker.record(False, NETWORK_ERROR, 0.1, 20.0)
+
+    assert breaker.state == "open"
+    with pytest.raises(AiUnavailableError):
+        breaker.check("generate_follow_up")
+
+
+def test_non_retryable_errors_do_not_count():
+    breaker = _breaker()
+
+    for _ in range(4):
+        breaker.record(False, ValueError("schema"), 0.1, 20.0)
+
+    assert breaker.state == "closed"
+
+
+def test_slow_calls_count_only_with_threshold():
+    breaker = _breaker()
+
+    # batch 호출(기준 없음)은 오래 걸려도 실패가 아니다
+    for _ in range(4):
+        breaker.record(False, None, 100.0, None)
+    assert breaker.state == "closed"
+
+    for _ in range(4):
+        breaker.record(False, None, 25.0, 20.0)
+    assert breaker.state == "open"
+
+
+def test_half_open_probe_closes_on_success():
+    breaker = _breaker(open_seconds=0.0)
+    for _ in range(4):
+        breaker.record(False, NETWORK_ERROR, 0.1, 20.0)
+
+    assert breaker.state == "half_open"
+    assert breaker.before_call("generate_follow_up") is True
+    # probe가 진행 중이면 다른 호출은 거절한다
+    with pytest.raises(AiUnavailableError):
+        breaker.check("generate_follow_up")
+
+    breaker.record(True, None, 0.1, 20.0)
+
+    assert breaker.state == "closed"
+
+
+def test_half_open_probe_reopens_on_failure():
+    breaker = _breaker(open_seconds=0.0)
+    for _ in range(4):
+        breaker.record(False, NETWORK_ERROR, 0.1, 20.0)
+    probe = breaker.before_call("generate_follow_up")
+
+    breaker.open_seconds = 30.0
+    breaker.record(probe, NETWORK_ERROR, 0.1, 20.0)
+
+    assert breaker.state == "open"
+
+
+def test_cancelled_probe_frees_slot():
+    breaker = _breaker(open_seconds=0.0)
+    for _ in range(4):
+        breaker.record(False, NETWORK_ERROR, 0.1, 20.0)
+    probe = breaker.before_call("generate_follow_up")
+
+    breaker.record_cancelled(probe, 0.1, 20.0)
+
+    assert breaker.before_call("generate_follow_up") is True
+
+
+async def test_open_circuit_rejects_request(client):
+    breaker = ai_service.get_breaker()
+    breaker.open_seconds = 30.0
+    breaker._transition("open")
+
+    response = await client.post("/dev/ai/generate-persona", json={})
+
+    assert response.status_code == 503
+    assert response.json()["detail"]["code"] == "AI_OVERLOADED"
+    assert int(response.headers["retry-after"]) >= 1
@@ -0,0 +1,34 @@
+import pytest
+
+from src.core.config import get_settings
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "metrics_token", "")
+    monkeypatch.setattr(settings, "environment", "development")
+    return settings
+
+
+async def test_open_without_token_outside_production(client, settings):
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+
+
+async def test_hidden_in_production_without_token(client, settings):
+    settings.environment = "production"
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 404
+
+
+async def test_requires_token_when_configured(client, settings):
+    settings.metrics_token = "scrape-token"
+
+    assert (await client.get("/metrics")).status_code == 401
+    assert (await client.get("/metrics", headers={"Authorization": "Bearer wrong"})).status_code == 401
+    response = await client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
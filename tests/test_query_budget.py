@@ -0,0 +1,132 @@
+"""엔드포인트별 SQL 예산.
+
+목록/요약 엔드포인트는 항목마다 조회하는 부분(N+1)이 남아 있어 예산을 `고정 + 항목당 × 항목 수`로 둔다.
+새 조회가 끼어들면 실패하고, N+1을 고치면 항목당 값을 낮춰 고정한다.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.core.database import assert_max_queries
+from src.models.database.company import Company
+from src.models.database.evaluation import Evaluation
+from src.models.database.job_role import JobRole
+from src.models.database.message import Message
+from src.models.database.submission import Submission
+from src.models.database.task import Task
+from src.models.database.thread import Thread
+from src.models.database.user import User
+from src.models.database.user_competency import UserCompetency
+
+ITEMS = 3
+NOW = datetime.now(timezone.utc)
+
+
+def _task(i: int) -> Task:
+    return Task(
+        id=i,
+        company_id=1,
+        job_role_id=1,
+        title=f"과제 {i}",
+        description="설명",
+        category="backend",
+        difficulty="medium",
+        estimated_minutes=30,
+        answer_type="text",
+        created_at=NOW,
+    )
+
+
+def _submission(i: int, user_id: int) -> Submission:
+    return Submission(
+        id=i,
+        user_id=user_id,
+        task_id=i,
+        content="제출물",
+        is_draft=False,
+        status="evaluated",
+        time_spent_seconds=600,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def _evaluation(i: int) -> Evaluation:
+    return Evaluation(
+        id=i,
+        submission_id=i,
+        thread_id=i,
+        total_score=70,
+        score_label="양호",
+        scores_detail=[],
+        ai_summary="요약",
+        analysis_points={"strengths": [], "weaknesses": []},
+        created_at=NOW,
+    )
+
+
+@pytest.fixture
+def seeded(db, user_id):
+    db.add_rows(
+        User(id=user_id, google_id="g", email="user@example.com", name="유저", created_at=NOW, updated_at=NOW),
+        Company(id=1, name="토스", created_at=NOW),
+        JobRole(id=1, category="개발", name="백엔드 개발자", created_at=NOW),
+    )
+    for i in range(1, ITEMS + 1):
+        db.add_rows(
+            _task(i),
+            _submission(i, user_id),
+            _evaluation(i),
+            Thread(
+                id=i,
+                submission_id=i,
+                user_id=user_id,
+                persona_name="김민수",
+                persona_department="결제팀",
+                topic_tag="API",
+                status="questioning",
+                total_questions=3,
+                asked_count=1,
+                created_at=NOW,
+                updated_at=NOW,
+            ),
+            Message(id=i, thread_id=i, role="ai", content="질문", message_order=1, created_at=NOW),
+            UserCompetency(
+                id=i, user_id=user_id, company_id=1, job_role_id=1, avg_score=70.0, attempt_count=1, updated_at=NOW
+            ),
+        )
+    return db
+
+
+@pytest.mark.parametrize(
+    ("path", "fixed", "per_item"),
+    [
+        # 개수 + 목록, 스레드마다 메시지/제출물/과제/기업 목록/직무 목록
+        ("/threads", 2, 5),
+        # 개수 + 목록, 과제마다 내 제출물
+        ("/tasks", 2, 1),
+        # 주간 제출/평가/역량/최근 제출, 최근 제출마다 과제/평가, 역량마다 기업/직무
+        ("/dashboard/summary", 4, 4),
+        # 유저/풀이 수/평균 점수/최근 평가, 최근 평가마다 제출물/과제
+        ("/profile", 4, 2),
+    ],
+)
+async def test_query_budget(client, seeded, path, fixed, per_item):
+    with assert_max_queries(fixed + per_item * ITEMS) as statements:
+        response = await client.get(path)
+
+    assert response.status_code == 200, response.text
+    assert statements
+
+
+async def test_assert_max_queries_fails_over_budget(client, seeded):
+    with pytest.raises(AssertionError, match="예산 1개"):
+        with assert_max_queries(1):
+            await client.get("/tasks")
+
+
+async def test_request_stats_in_server_timing(client, seeded):
+    response = await client.get("/tasks")
+
+    assert f'desc="{2 + ITEMS} queries"' in response.headers["server-timing"]